@@ -56,6 +56,7 @@ export default function DashboardPage() {
     const [activeTab, setActiveTab] = useState<'new' | 'history'>('history')
     const [currentPage, setCurrentPage] = useState(1)
     const [mode, setMode] = useState<Mode>('general')
+    const [nextCursor, setNextCursor] = useState<string | null>(null)
     const router = useRouter()
     const supabase = createClient()
 
@@ -72,12 +73,18 @@ export default function DashboardPage() {
         getUser()
     }, [router, supabase])
 
-    const fetchSessions = async (userId: string) => {
+    const fetchSessions = async (userId: string, cursor?: string) => {
         try {
-            const response = await fetch(`/api/sessions?user_id=${userId}`)
+            let url = `/api/sessions?user_id=${userId}`
+            if (cursor) {
+                url += `&cursor=${encodeURIComponent(cursor)}`
+            }
+            const response = await fetch(url)
             if (response.ok) {
                 const data = await response.json()
-                setSessions(data)
+                // 다음 페이지 커서 (keyset 페이지네이션)
+                setNextCursor(response.headers.get('X-Next-Cursor'))
+                setSessions(prev => cursor ? [...prev, ...data] : data)
             }
         } catch (error) {
             console.error('Failed to fetch sessions:', error)
@@ -551,6 +558,18 @@ export default function DashboardPage() {
                                     </button>
                                 </div>
                             )}
+
+                            {/* 이전 회의 더 불러오기 (서버 keyset 페이지네이션) */}
+                            {nextCursor && user && (
+                                <div className={styles.pagination}>
+                                    <button
+                                        className={styles.pageBtn}
+                                        onClick={() => fetchSessions(user.id, nextCursor)}
+                                    >
+                                        이전 회의 더 불러오기
+                                    </button>
+                                </div>
+                            )}
                         </>
                     ) : (
                         /* New Session Form */
@@ -3,8 +3,9 @@
 import { useEffect, useState, useRef, Suspense } from 'react'
 import { useParams, useRouter } from 'next/navigation'
 import dynamic from 'next/dynamic'
-import { useRealtimeMessages, Message } from '@/lib/useRealtimeMessages'
-import { useSessionEvents } from '@/lib/useSessionEvents'
+import { Message } from '@/lib/useRealtimeMessages'
+import { useSessionFeed } from '@/lib/useSessionFeed'
+import { generateReportStream } from '@/lib/reportStream'
 import TypingMessage from '@/components/TypingMessage'
 import GateSummaryCard from '@/components/gate/GateSummaryCard'
 import SteeringPanel from '@/components/gate/SteeringPanel'
@@ -20,17 +21,6 @@ const AvatarPanel = dynamic(() => import('@/components/avatar/AvatarPanel'), {
     loading: () => <div className={styles.avatarPlaceholder}>캐릭터 로딩 중...</div>
 })
 
-interface SessionData {
-    id: string
-    status: string
-    category: string
-    topic: string
-    round_index: number
-    phase: string
-    case_type?: string  // 법무 시뮬레이션: 'criminal' | 'civil'
-    project_type?: 'general' | 'legal' | 'dev_project'
-}
-
 // 법무 Phase 상수
 const LEGAL_PHASES = [
     'FACTS_INTAKE', 'FACTS_STIPULATE', 'FACTS_GATE',
@@ -44,7 +34,6 @@ export default function SessionPage() {
     const router = useRouter()
     const sessionId = params.id as string
 
-    const [session, setSession] = useState<SessionData | null>(null)
     const [input, setInput] = useState('')
     const [activeSpeaker, setActiveSpeaker] = useState<string | null>(null)
     const [showStopConfirm, setShowStopConfirm] = useState(false)
@@ -55,31 +44,8 @@ export default function SessionPage() {
 
     const messagesEndRef = useRef<HTMLDivElement>(null)
 
-    // Supabase Realtime 훅 사용
-    const { messages, isLoading, isConnected } = useRealtimeMessages(sessionId)
-
-    // SSE 이벤트 훅 사용 (Gate 데이터)
-    const { gateData } = useSessionEvents(sessionId)
-
-    // 세션 정보 로드
-    useEffect(() => {
-        const fetchSession = async () => {
-            try {
-                const res = await fetch(`/api/sessions/${sessionId}`)
-                if (res.ok) {
-                    const data = await res.json()
-                    setSession(data)
-                }
-            } catch (error) {
-                console.error('Failed to fetch session:', error)
-            }
-        }
-        fetchSession()
-
-        // 주기적으로 세션 상태 확인 (폴링) - 라운드 변경 등 감지용
-        const interval = setInterval(fetchSession, 3000)
-        return () => clearInterval(interval)
-    }, [sessionId])
+    // 세션 피드 훅 (세션 상태 + 메시지 + 스트리밍 초안 + Gate 데이터를 SSE 하나로)
+    const { session, messages, gateData, isLoading, isConnected } = useSessionFeed(sessionId)
 
     // Active Speaker 자동 설정 (마지막 메시지 기준)
     useEffect(() => {
@@ -151,25 +117,24 @@ export default function SessionPage() {
         setReportLoading(true)
 
         try {
-            // 먼저 리포트 조회 시도
-            let res = await fetch(`/api/sessions/${sessionId}/report`)
-
-            if (!res.ok) {
-                // 없으면 생성 요청
-                res = await fetch(`/api/sessions/${sessionId}/report/generate`, {
-                    method: 'POST'
-                })
-            }
-
+            // 먼저 리포트 조회 시도 (완료된 리포트만 사용)
+            const res = await fetch(`/api/sessions/${sessionId}/report`)
             if (res.ok) {
                 const data = await res.json()
-                setReportContent(data.report_md)
-            } else {
-                setReportContent('리포트를 불러오는데 실패했습니다.')
+                if (data.report_json?.status !== 'streaming') {
+                    setReportContent(data.report_md)
+                    return
+                }
             }
+
+            // 없거나 생성 중이면 스트리밍 생성 (생성되는 대로 표시)
+            await generateReportStream(sessionId, (text) => {
+                setReportContent(text)
+                setReportLoading(false)
+            })
         } catch (error) {
             console.error('Failed to load report:', error)
-            setReportContent('오류가 발생했습니다.')
+            setReportContent('리포트를 불러오는데 실패했습니다.')
         } finally {
             setReportLoading(false)
         }
@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react'
 import { useParams, useRouter } from 'next/navigation'
 import ReactMarkdown from 'react-markdown'
+import { generateReportStream } from '@/lib/reportStream'
 import styles from './page.module.css'
 
 export default function ReportPage() {
@@ -18,30 +19,26 @@ export default function ReportPage() {
 
         const fetchReport = async () => {
             try {
-                // 1. 먼저 리포트 조회 시도
+                // 1. 먼저 리포트 조회 시도 (완료된 리포트만 사용)
                 const res = await fetch(`/api/sessions/${sessionId}/report`)
                 if (res.ok) {
                     const data = await res.json()
-                    setReport(data.report_md)
-                    setLoading(false)
-                    return
+                    if (data.report_json?.status !== 'streaming') {
+                        setReport(data.report_md)
+                        return
+                    }
                 }
 
-                // 2. 없으면 생성 요청 (On-Demand)
+                // 2. 없거나 생성 중이면 스트리밍 생성 (On-Demand)
                 // 사용자가 명시적으로 버튼을 눌러서 들어온 것이므로 자동 생성 트리거
-                const genRes = await fetch(`/api/sessions/${sessionId}/report/generate`, {
-                    method: 'POST'
+                // 첫 토큰이 오면 로딩 화면을 걷고 생성되는 대로 표시
+                await generateReportStream(sessionId, (text) => {
+                    setReport(text)
+                    setLoading(false)
                 })
-
-                if (genRes.ok) {
-                    const data = await genRes.json()
-                    setReport(data.report_md)
-                } else {
-                    setError('리포트 생성에 실패했습니다.')
-                }
             } catch (err) {
                 console.error(err)
-                setError('오류가 발생했습니다.')
+                setError('리포트 생성에 실패했습니다.')
             } finally {
                 setLoading(false)
             }
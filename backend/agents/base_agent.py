@@ -147,7 +147,8 @@ class GeminiClient:
             return {"error": "Gemini API 클라이언트가 초기화되지 않았습니다"}
         
         try:
-            response = await self.client.models.generate_content_async(
+            # 비동기 API (google-genai에는 models.generate_content_async가 없음)
+            response = await self.client.aio.models.generate_content(
                 model=GEMINI_MODEL,
                 contents=prompt,
                 config={
@@ -157,6 +158,7 @@ class GeminiClient:
             )
             return json.loads(response.text)
         except Exception as e:
+            logger.error(f"[GeminiClient] generate_json 오류: {e}")
             return {"error": str(e)}
     
     @retry(
@@ -179,7 +181,8 @@ class GeminiClient:
         try:
             logger.info(f"[GeminiClient] generate_text 요청 시작 - model={GEMINI_MODEL}")
             
-            response = self.client.models.generate_content(
+            # 비동기 API: 요청 중에도 이벤트 루프(SSE, 병렬 요약)가 멈추지 않음
+            response = await self.client.aio.models.generate_content(
                 model=GEMINI_MODEL,
                 contents=prompt
             )
@@ -190,6 +193,29 @@ class GeminiClient:
         except Exception as e:
             logger.error(f"[GeminiClient] generate_text 오류: {e}")
             return f"[오류 발생: {str(e)}]"
+    
+    async def stream_text(
+        self, prompt: str, max_output_tokens: Optional[int] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        단일 프롬프트 스트리밍 응답 (리포트 작업 등)
+
+        generate_text와 달리 오류를 본문에 섞지 않고 예외로 전파합니다 (작업 실패로 기록).
+        max_output_tokens를 주면 출력 토큰 상한으로 적용합니다 (리포트 섹션별 예산).
+        """
+        if not self.client:
+            raise RuntimeError("Gemini API 클라이언트가 초기화되지 않았습니다")
+        
+        logger.info(f"[GeminiClient] stream_text 요청 시작 - model={GEMINI_MODEL}")
+        response = await self.client.aio.models.generate_content_stream(
+            model=GEMINI_MODEL,
+            contents=prompt,
+            config={"max_output_tokens": max_output_tokens} if max_output_tokens else None
+        )
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+        logger.info(f"[GeminiClient] stream_text 완료")
 
 
 class BaseAgent(ABC):
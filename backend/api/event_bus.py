@@ -0,0 +1,250 @@
+"""
+SSE 이벤트 버스
+
+SSEEventManager.emit이 발생시킨 이벤트를 구독자가 붙어 있는 모든 프로세스로
+전달하는 계층입니다. 라운드를 실행하는 워커와 SSE 연결을 받은 워커가 달라도
+이벤트가 도착합니다.
+
+- InMemoryEventBus: 단일 프로세스 (기본값). 이벤트 로그가 있으면 id는 로그의 전역 시퀀스에서
+  블록 단위로 예약 (재시작해도 기록된 id를 다시 쓰지 않음)
+- SQLiteEventBus: 여러 워커가 같은 SQLite 파일(WAL)을 공유하는 cross-process 버스.
+  publish는 행 insert, 다른 프로세스는 EVENT_BUS_POLL_MS 간격으로 새 행을 읽음
+  (LISTEN/NOTIFY stand-in. Postgres 환경이면 같은 계약으로 LISTEN/NOTIFY 구현 가능)
+
+이벤트는 dict {id, type, data, timestamp, data_json}으로 주고받으며, 이벤트 id는 버스가
+발급합니다. SQLiteEventBus는 워커가 여러 개여도 Last-Event-ID가 전역적으로 단조 증가하지만,
+InMemoryEventBus는 워커마다 다른 id 블록을 쓰므로 여러 워커에서 재전송하려면 sqlite 버스가 필요합니다.
+data_json은 data를 직렬화한 bytes로, 발행 시 한 번 만든 것을 버스/로그/SSE 전송이 공유합니다.
+"""
+import asyncio
+import itertools
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Callable, Optional
+
+from config import (
+    EVENT_BUS_BACKEND, EVENT_BUS_SQLITE_PATH, EVENT_BUS_POLL_MS, EVENT_BUS_RETENTION, EVENT_ID_BLOCK_SIZE,
+)
+from storage.sqlite_file import LazySQLite
+from .sse_wire import json_bytes
+
+logger = logging.getLogger(__name__)
+
+# (session_id, event dict) -> None
+DeliverCallback = Callable[[str, dict], None]
+# 예약할 id 수 -> 예약된 첫 id (EventLog.reserve_ids)
+IdSource = Callable[[int], int]
+# 로그에 이미 기록된 가장 큰 id (EventLog.max_event_id)
+MaxIdSource = Callable[[], int]
+
+
+class EventBus(ABC):
+    """이벤트 버스 인터페이스"""
+
+    def __init__(self):
+        self._deliver: Optional[DeliverCallback] = None
+
+    def attach(self, deliver: DeliverCallback):
+        """이 프로세스로 들어온 이벤트를 받을 콜백 등록 (SSEEventManager)"""
+        self._deliver = deliver
+
+    def _dispatch(self, session_id: str, event: dict):
+        if self._deliver:
+            self._deliver(session_id, event)
+
+    @abstractmethod
+    async def publish(
+        self, session_id: str, event_type: str, data: dict, data_json: Optional[bytes] = None
+    ) -> dict:
+        """이벤트 발행 (id 발급 후 모든 프로세스에 전달). 발급된 이벤트 dict 반환"""
+
+    def bind_id_source(self, reserve: IdSource, max_event_id: MaxIdSource):
+        """
+        이벤트 로그와 id 공간 맞추기 (SSEEventManager 생성 시)
+
+        reserve는 로그의 전역 id 시퀀스, max_event_id는 로그에 이미 기록된 가장 큰 id입니다.
+        둘 다 첫 발행 때 호출합니다 (임포트 시점에 로그 파일을 열지 않음).
+        """
+
+    async def start(self):
+        """백그라운드 수신 시작 (앱 startup)"""
+
+    async def stop(self):
+        """백그라운드 수신 종료 (앱 shutdown)"""
+
+
+class InMemoryEventBus(EventBus):
+    """단일 프로세스 버스"""
+
+    def __init__(self, block_size: int = EVENT_ID_BLOCK_SIZE):
+        super().__init__()
+        self._counter = itertools.count(1)
+        self._reserve: Optional[IdSource] = None
+        self._block_size = block_size
+        self._next_id = self._block_end = 0
+
+    def bind_id_source(self, reserve: IdSource, max_event_id: MaxIdSource):
+        # 워커마다 서로 다른 블록을 받으므로 id가 겹치지 않음 (순서는 워커 안에서만 단조 증가)
+        self._reserve = reserve
+        self._next_id = self._block_end = 0
+
+    def _issue_id(self) -> int:
+        if self._reserve is None:
+            return next(self._counter)
+        if self._next_id >= self._block_end:
+            self._next_id = self._reserve(self._block_size)
+            self._block_end = self._next_id + self._block_size
+        event_id = self._next_id
+        self._next_id += 1
+        return event_id
+
+    async def publish(
+        self, session_id: str, event_type: str, data: dict, data_json: Optional[bytes] = None
+    ) -> dict:
+        event = {
+            "id": self._issue_id(),
+            "type": event_type,
+            "data": data,
+            "timestamp": datetime.utcnow().isoformat(),
+            "data_json": data_json if data_json is not None else json_bytes(data),
+        }
+        self._dispatch(session_id, event)
+        return event
+
+
+class SQLiteEventBus(EventBus):
+    """
+    SQLite 공유 파일 기반 cross-process 버스
+
+    - publish: insert 후 로컬 구독자에게는 즉시 전달
+    - 다른 프로세스의 이벤트: poll 루프가 마지막으로 읽은 seq 이후 행을 읽어 전달
+    - 오래된 행은 최근 EVENT_BUS_RETENTION건만 남기고 정리
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sse_bus (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        session_id TEXT NOT NULL,
+        type TEXT NOT NULL,
+        data TEXT NOT NULL,
+        timestamp TEXT NOT NULL,
+        origin TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path: str, poll_ms: int = EVENT_BUS_POLL_MS, retention: int = EVENT_BUS_RETENTION):
+        super().__init__()
+        self.path = path
+        self._poll_interval = poll_ms / 1000
+        self._retention = retention
+        self._origin = str(uuid.uuid4())
+        self._lock = threading.Lock()
+        self._db = LazySQLite(path, self.SCHEMA)
+        # 첫 poll 이전 이벤트는 재생하지 않음 (재연결 재전송은 링 버퍼/이벤트 로그 담당)
+        self._last_seq: Optional[int] = None
+        # 첫 insert 전에 맞춰야 하는 이벤트 로그의 마지막 id (bind_id_source)
+        self._max_event_id: Optional[MaxIdSource] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._polls = 0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def bind_id_source(self, reserve: IdSource, max_event_id: MaxIdSource):
+        self._max_event_id = max_event_id
+
+    def _sync_sequence(self, max_event_id: int):
+        """버스 파일만 새로 만들어졌으면 seq가 1부터 다시 시작하므로 로그의 마지막 id 위로 올림 (락 보유)"""
+        current = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sse_bus'").fetchone()
+        if (current[0] if current else 0) >= max_event_id:
+            return
+        if current is None:
+            self._conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('sse_bus', ?)", (max_event_id,))
+        else:
+            self._conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'sse_bus'", (max_event_id,))
+        logger.warning(f"[EventBus] Bus sequence was behind the event log, advanced to {max_event_id}")
+
+    def _insert(self, session_id: str, event_type: str, payload: str, timestamp: str) -> int:
+        with self._lock:
+            if self._max_event_id is not None:
+                self._sync_sequence(self._max_event_id())
+                self._max_event_id = None
+            cursor = self._conn.execute(
+                "INSERT INTO sse_bus (session_id, type, data, timestamp, origin) VALUES (?, ?, ?, ?, ?)",
+                (session_id, event_type, payload, timestamp, self._origin),
+            )
+            return cursor.lastrowid
+
+    async def publish(
+        self, session_id: str, event_type: str, data: dict, data_json: Optional[bytes] = None
+    ) -> dict:
+        timestamp = datetime.utcnow().isoformat()
+        if data_json is None:
+            data_json = json_bytes(data)
+        seq = await asyncio.to_thread(self._insert, session_id, event_type, data_json.decode(), timestamp)
+        event = {"id": seq, "type": event_type, "data": data, "timestamp": timestamp, "data_json": data_json}
+        self._dispatch(session_id, event)
+        return event
+
+    def _fetch_new(self) -> list:
+        with self._lock:
+            if self._last_seq is None:
+                self._last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM sse_bus").fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT seq, session_id, type, data, timestamp, origin FROM sse_bus "
+                "WHERE seq > ? ORDER BY seq LIMIT 1000",
+                (self._last_seq,),
+            ).fetchall()
+            self._polls += 1
+            if self._polls % 200 == 0:
+                self._conn.execute("DELETE FROM sse_bus WHERE seq <= ?", (self._last_seq - self._retention,))
+        return rows
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                rows = await asyncio.to_thread(self._fetch_new)
+                for seq, session_id, event_type, payload, timestamp, origin in rows:
+                    self._last_seq = seq
+                    if origin == self._origin:
+                        continue
+                    self._dispatch(session_id, {
+                        "id": seq, "type": event_type, "data": json.loads(payload), "timestamp": timestamp,
+                        "data_json": payload.encode(),
+                    })
+                if len(rows) < 1000:
+                    await asyncio.sleep(self._poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[EventBus] Poll failed: {e}", exc_info=True)
+                await asyncio.sleep(self._poll_interval)
+
+    async def start(self):
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+            logger.info(f"[EventBus] SQLite bus polling {self.path} every {self._poll_interval * 1000:.0f}ms")
+
+    async def stop(self):
+        if self._poll_task:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+
+def create_event_bus() -> EventBus:
+    """설정(EVENT_BUS_BACKEND)에 맞는 이벤트 버스 생성"""
+    if EVENT_BUS_BACKEND == "memory":
+        return InMemoryEventBus()
+    if EVENT_BUS_BACKEND == "sqlite":
+        return SQLiteEventBus(EVENT_BUS_SQLITE_PATH)
+    raise ValueError(f"Unknown EVENT_BUS_BACKEND: {EVENT_BUS_BACKEND}")
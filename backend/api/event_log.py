@@ -0,0 +1,237 @@
+"""
+SSE 이벤트 로그 (durable, append-only)
+
+메모리 링 버퍼(SSE_BUFFER_SIZE)는 스트리밍 중 1분만 끊겨도 넘칩니다.
+발행된 모든 이벤트를 세션별로 SQLite 테이블에 남겨, 재연결 시 어떤 위치에서든
+(session_id, event_id) 인덱스 범위 스캔으로 재전송합니다.
+
+- 쓰기: 발행한 프로세스만 append (여러 워커가 같은 파일을 공유해도 중복 없음).
+  append는 메모리 대기열에 넣기만 하고, flush()가 쌓인 이벤트를 한 트랜잭션으로 기록
+  (SSEEventManager가 스레드에서 호출 → chunk마다 이벤트 루프에서 INSERT/commit 하지 않음).
+  대기 중인 이벤트도 read_since/latest_event_id에 보임
+- id 발급: memory 버스는 reserve_ids()로 로그 파일의 전역 시퀀스에서 id 블록을 예약
+  (재시작/여러 워커에서도 이미 기록된 id를 다시 쓰지 않음).
+  단 워커마다 다른 블록을 쓰므로 한 세션의 id가 워커 간에는 단조 증가하지 않습니다.
+  여러 워커에서 Last-Event-ID 재개가 정확하려면 EVENT_BUS_BACKEND=sqlite (id = 공유 버스의 seq)
+- 재전송: read_since(session_id, last_event_id)
+- 압축: 세션 종료 후 연속된 MESSAGE_STREAM_CHUNK를 메시지당 하나로 병합하고,
+  EVENT_LOG_RETENTION_DAYS가 지난 종료 세션의 로그는 삭제
+"""
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from config import EVENT_LOG_RETENTION_DAYS
+from storage.sqlite_file import LazySQLite
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = "message_stream_chunk"
+_SESSION_END = "session_end"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS event_log (
+    session_id TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    data TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (session_id, event_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS event_id_seq (
+    name TEXT PRIMARY KEY,
+    next_id INTEGER NOT NULL
+);
+"""
+
+
+_INSERT = "INSERT INTO event_log (session_id, event_id, type, data, timestamp) VALUES (?, ?, ?, ?, ?)"
+
+
+class EventLog:
+    """세션별 SSE 이벤트 로그"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        # 파일은 첫 사용 때 엶 (임포트 시점에 작업 디렉터리에 쓰지 않음)
+        self._db = LazySQLite(path, SCHEMA, cached_statements=32)
+        # 아직 기록하지 않은 이벤트 (session_id, event_id, type, data, timestamp)
+        self._pending: List[tuple] = []
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def append(self, session_id: str, event: dict):
+        """이벤트를 기록 대기열에 추가 (event: {id, type, data, timestamp[, data_json]}, I/O 없음)"""
+        data_json = event.get("data_json")
+        if data_json is not None:
+            data = data_json.decode()
+        else:
+            data = json.dumps(event["data"], ensure_ascii=False, default=str)
+        with self._lock:
+            self._pending.append((session_id, event["id"], event["type"], data, event["timestamp"]))
+
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def flush(self) -> int:
+        """
+        대기 중인 이벤트를 한 트랜잭션으로 기록 (스레드에서 호출). Returns: 기록한 수
+
+        같은 (session_id, event_id)가 이미 있으면 덮어쓰거나 무시하지 않고 그 이벤트만 오류로 남깁니다.
+        """
+        with self._lock:
+            batch = list(self._pending)
+            if not batch:
+                return 0
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_INSERT, batch)
+                self._conn.execute("COMMIT")
+                written = len(batch)
+            except sqlite3.Error:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                written = self._insert_each(batch)
+            # 기록(또는 실패)한 뒤에 대기열에서 빼야 읽는 쪽이 이벤트를 놓치지 않음
+            del self._pending[:len(batch)]
+        return written
+
+    def _insert_each(self, batch: List[tuple]) -> int:
+        """배치가 실패하면 한 건씩 기록 (실패한 이벤트는 로그만 남김). 호출자가 락 보유"""
+        written = 0
+        for row in batch:
+            try:
+                self._conn.execute(_INSERT, row)
+                written += 1
+            except Exception as e:
+                logger.error(f"[EventLog] Append failed for {row[0]} event {row[1]}: {e}")
+        return written
+
+    def _pending_since(self, session_id: str, last_event_id: int) -> List[tuple]:
+        """대기 중인 세션 이벤트 (호출자가 락 보유)"""
+        return [row for row in self._pending if row[0] == session_id and row[1] > last_event_id]
+
+    def reserve_ids(self, count: int) -> int:
+        """
+        이벤트 id count개 예약 → 첫 id (예약된 범위는 [첫 id, 첫 id + count))
+
+        처음 호출하면 기존 로그의 MAX(event_id) 다음부터 시작합니다.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT next_id FROM event_id_seq WHERE name = 'event'").fetchone()
+                if row:
+                    first = row[0]
+                else:
+                    first = self._conn.execute("SELECT COALESCE(MAX(event_id), 0) + 1 FROM event_log").fetchone()[0]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO event_id_seq (name, next_id) VALUES ('event', ?)", (first + count,)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return first
+
+    def max_event_id(self) -> int:
+        """로그 전체에서 가장 큰 이벤트 id (없으면 0)"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(event_id), 0) FROM event_log").fetchone()[0]
+
+    def read_since(self, session_id: str, last_event_id: int, limit: int = 10000) -> List[dict]:
+        """last_event_id 이후 이벤트 (id 오름차순, 저장된 JSON은 data_json으로 그대로 전달)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT event_id, type, data, timestamp FROM event_log "
+                "WHERE session_id = ? AND event_id > ? ORDER BY event_id LIMIT ?",
+                (session_id, last_event_id, limit),
+            ).fetchall()
+            pending = self._pending_since(session_id, last_event_id)
+        if pending:
+            rows = sorted(rows + [row[1:] for row in pending])
+            if limit >= 0:
+                rows = rows[:limit]
+        return [
+            {
+                "id": event_id, "type": event_type, "data": json.loads(data), "timestamp": timestamp,
+                "data_json": data.encode(),
+            }
+            for event_id, event_type, data, timestamp in rows
+        ]
+
+    def compact(self, session_id: str) -> int:
+        """
+        종료된 세션의 로그 압축
+
+        연속된 chunk 이벤트를 마지막 id 하나로 병합합니다 (텍스트는 이어 붙임).
+        병합 구간 중간에서 재개하면 일부 텍스트가 중복될 수 있지만 유실되지는 않습니다.
+        Returns: 제거된 이벤트 수
+        """
+        events = self.read_since(session_id, 0, limit=-1)
+        merged: List[dict] = []
+        removed_ids: List[int] = []
+        run: List[dict] = []
+
+        def close_run():
+            if len(run) > 1:
+                last = dict(run[-1])
+                last["data"] = {**last["data"], "text": "".join(e["data"].get("text", "") for e in run)}
+                merged.append(last)
+                removed_ids.extend(e["id"] for e in run[:-1])
+            run.clear()
+
+        for event in events:
+            if event["type"] == _CHUNK:
+                run.append(event)
+            else:
+                close_run()
+        close_run()
+
+        if not removed_ids:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "DELETE FROM event_log WHERE session_id = ? AND event_id = ?",
+                    [(session_id, event_id) for event_id in removed_ids],
+                )
+                self._conn.executemany(
+                    "UPDATE event_log SET data = ? WHERE session_id = ? AND event_id = ?",
+                    [(json.dumps(e["data"], ensure_ascii=False), session_id, e["id"]) for e in merged],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info(f"[EventLog] Compacted {session_id}: removed {len(removed_ids)} chunk events")
+        return len(removed_ids)
+
+    def purge_finished(self, older_than_days: int = EVENT_LOG_RETENTION_DAYS) -> int:
+        """종료 후 older_than_days가 지난 세션의 로그 삭제. Returns: 삭제된 이벤트 수"""
+        cutoff = (datetime.utcnow() - timedelta(days=older_than_days)).isoformat()
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM event_log WHERE session_id IN ("
+                "  SELECT session_id FROM event_log WHERE type = ? AND timestamp < ?"
+                ")",
+                (_SESSION_END, cutoff),
+            )
+            return cursor.rowcount
+
+    def latest_event_id(self, session_id: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(event_id) FROM event_log WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            pending = [event_id for sid, event_id, *_ in self._pending if sid == session_id]
+        if row and row[0] is not None:
+            pending.append(row[0])
+        return max(pending, default=None)
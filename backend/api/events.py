@@ -4,15 +4,30 @@ SSE 이벤트 관리자
 핵심 보완사항 반영:
 - Last-Event-ID 지원으로 이벤트 유실 방지
 - 이벤트 버퍼링으로 재전송 가능
+- 구독자(탭/기기)별 큐로 fan-out: 모든 구독자가 모든 이벤트를 받음
+- 세션별 재전송 버퍼는 deque(maxlen) 링 버퍼
+- 느린 구독자는 큐를 비우고 RESYNC 이벤트로 전환 (메모리 상한 유지)
+- 이벤트 전달은 EventBus 경유 (EVENT_BUS_BACKEND=sqlite면 여러 워커 간 공유)
+- 발행된 이벤트는 EventLog에 append → 링 버퍼를 넘는 재연결도 재전송 가능
+- 전달/버퍼/재전송은 WireEvent (emit 시 한 번 직렬화한 bytes를 모든 구독자가 공유)
 """
 import asyncio
-import itertools
+import logging
+from collections import deque
 from enum import Enum
-from typing import Dict, List, Optional, AsyncGenerator
+from typing import Deque, Dict, List, Optional, AsyncGenerator, Set
 from pydantic import BaseModel
 from datetime import datetime
 
-from config import SSE_BUFFER_SIZE
+from config import (
+    SSE_BUFFER_SIZE, SSE_SUBSCRIBER_QUEUE_SIZE, STORAGE_BACKEND, EVENT_LOG_ENABLED, EVENT_LOG_PATH,
+    EVENT_BUS_BACKEND, WEB_CONCURRENCY,
+)
+from .event_bus import EventBus, InMemoryEventBus, create_event_bus
+from .event_log import EventLog
+from .sse_wire import KEEPALIVE, WireEvent, json_bytes
+
+logger = logging.getLogger(__name__)
 
 
 class EventType(str, Enum):
@@ -27,11 +42,22 @@ class EventType(str, Enum):
     FINALIZE_DONE = "finalize_done"
     SESSION_END = "session_end"
     STOP_CONFIRM = "stop_confirm"  # 키워드 종료 확인 요청
+    RESYNC = "resync"  # 구독자가 밀려 이벤트를 버림 → 세션 피드로 다시 연결 (id 없음)
+    MESSAGE_CREATED = "message_created"  # 스트리밍 없이 저장된 메시지 (사용자 입력 등)
+    SNAPSHOT = "snapshot"  # 세션 피드 첫 프레임 (버스로 발행되지 않음)
+    SESSION_STATE = "session_state"  # 세션 피드 보조 프레임 (id 없음)
+    REPORT_START = "report_start"  # 리포트 생성 작업 시작 {job_id}
+    REPORT_CHUNK = "report_chunk"  # 리포트 생성 토큰 {job_id, text}
+    REPORT_END = "report_end"  # 리포트 생성 작업 종료 {job_id, status, chars, error}
     ERROR = "error"
 
 
 class SSEEvent(BaseModel):
-    """SSE 이벤트"""
+    """
+    SSE 이벤트 (pydantic 모델)
+
+    스트리밍 경로는 WireEvent를 사용합니다. 스키마 문서화/비교 벤치마크용으로 남겨 둡니다.
+    """
     id: int
     type: EventType
     data: dict
@@ -48,29 +74,91 @@ class SSEEvent(BaseModel):
         return f"id: {self.id}\nevent: {self.type.value}\ndata: {json.dumps(self.data, ensure_ascii=False)}\n\n"
 
 
+class _Subscriber:
+    """SSE 연결 하나의 전용 큐"""
+
+    __slots__ = ("queue", "dropped")
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0  # 큐가 넘쳐 버린 이벤트 수 (누적)
+
+    def offer(self, event: WireEvent, session_id: str):
+        """
+        이벤트 전달 (블로킹 없음)
+
+        큐가 가득 차면 밀린 이벤트를 모두 버리고 RESYNC 하나로 대체합니다.
+        이후 이벤트는 다시 정상적으로 쌓입니다.
+
+        RESYNC는 id 없이 보내므로 클라이언트의 Last-Event-ID는 실제로 받은 마지막 이벤트에 머뭅니다.
+        클라이언트는 그 Last-Event-ID로 세션 피드(snapshot_url)에 다시 연결해 버려진 이벤트를
+        재전송받거나, 없으면 스냅샷(최근 메시지 + 초안)부터 받습니다.
+        """
+        try:
+            self.queue.put_nowait(event)
+            return
+        except asyncio.QueueFull:
+            pass
+
+        while not self.queue.empty():
+            if self.queue.get_nowait().type != EventType.RESYNC:
+                self.dropped += 1
+        self.dropped += 1
+        self.queue.put_nowait(WireEvent(None, EventType.RESYNC.value, {
+            "reason": "slow_consumer",
+            "dropped": self.dropped,
+            "snapshot_url": f"/api/sessions/{session_id}/feed",
+        }))
+
+
 class SSEEventManager:
     """
     SSE 이벤트 관리자
     
-    - 이벤트 생성 및 버퍼링
+    - 이벤트 생성 및 버퍼링 (세션별 링 버퍼)
     - Last-Event-ID 기반 재전송
-    - 세션별 이벤트 큐 관리
+    - 구독자별 bounded 큐로 fan-out
+    - 이벤트 id 발급과 프로세스 간 전달은 EventBus가 담당
+    - event_log가 있으면 재전송은 로그에서 (없으면 링 버퍼에서)
     """
     
-    def __init__(self):
-        self._event_counter = itertools.count(1)
-        self._event_buffers: Dict[str, List[SSEEvent]] = {}
-        self._event_queues: Dict[str, asyncio.Queue] = {}
+    def __init__(self, bus: Optional[EventBus] = None, event_log: Optional[EventLog] = None):
+        self._bus = bus or InMemoryEventBus()
+        self._bus.attach(self._deliver)
+        self._log = event_log
+        self._log_flush_task: Optional[asyncio.Task] = None
+        if event_log:
+            # 이벤트 id는 로그에 이미 기록된 id와 겹치면 안 됨 (재시작 후 Last-Event-ID 재전송)
+            self._bus.bind_id_source(event_log.reserve_ids, event_log.max_event_id)
+        self._event_buffers: Dict[str, Deque[WireEvent]] = {}
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
         self._buffer_size = SSE_BUFFER_SIZE
+        self._subscriber_queue_size = SSE_SUBSCRIBER_QUEUE_SIZE
+    
+    def _get_buffer(self, session_id: str) -> Deque[WireEvent]:
+        if session_id not in self._event_buffers:
+            self._event_buffers[session_id] = deque(maxlen=self._buffer_size)
+        return self._event_buffers[session_id]
+    
+    def subscribe(self, session_id: str) -> _Subscriber:
+        """구독자 등록 (연결마다 하나)"""
+        subscriber = _Subscriber(self._subscriber_queue_size)
+        self._subscribers.setdefault(session_id, set()).add(subscriber)
+        return subscriber
     
-    def get_or_create_queue(self, session_id: str) -> asyncio.Queue:
-        """세션 이벤트 큐 생성 또는 반환"""
-        if session_id not in self._event_queues:
-            self._event_queues[session_id] = asyncio.Queue()
-            self._event_buffers[session_id] = []
-        return self._event_queues[session_id]
+    def unsubscribe(self, session_id: str, subscriber: _Subscriber):
+        """구독자 해제"""
+        subscribers = self._subscribers.get(session_id)
+        if subscribers is None:
+            return
+        subscribers.discard(subscriber)
+        if not subscribers:
+            del self._subscribers[session_id]
     
-    async def emit(self, session_id: str, event_type: EventType, data: dict) -> SSEEvent:
+    def subscriber_count(self, session_id: str) -> int:
+        return len(self._subscribers.get(session_id, ()))
+    
+    async def emit(self, session_id: str, event_type: EventType, data: dict) -> WireEvent:
         """
         이벤트 발생
         
@@ -80,32 +168,77 @@ class SSEEventManager:
             data: 이벤트 데이터
             
         Returns:
-            생성된 SSEEvent
+            생성된 WireEvent
         """
-        event = SSEEvent(
-            id=next(self._event_counter),
-            type=event_type,
-            data=data
-        )
+        # 직렬화는 여기서 한 번만 (버스/로그/SSE 전송이 같은 bytes를 사용)
+        published = await self._bus.publish(session_id, event_type.value, data, json_bytes(data))
         
-        # 버퍼에 저장
-        if session_id not in self._event_buffers:
-            self._event_buffers[session_id] = []
-        
-        buffer = self._event_buffers[session_id]
-        buffer.append(event)
+        if self._log:
+            try:
+                # 대기열에만 넣고 기록은 스레드에서 모아서 (이벤트 루프에서 INSERT/commit 하지 않음)
+                self._log.append(session_id, published)
+                self._schedule_log_flush()
+            except Exception as e:
+                logger.error(f"[SSE] Event log append failed for {session_id} event {published['id']}: {e}")
+            if event_type == EventType.SESSION_END:
+                asyncio.create_task(self._compact_log(session_id))
         
-        # 버퍼 크기 제한
-        if len(buffer) > self._buffer_size:
-            buffer.pop(0)
+        return published.get("wire") or WireEvent.from_published(published)
+    
+    def _schedule_log_flush(self):
+        """기록 작업이 없으면 하나 시작 (도는 동안 쌓인 이벤트는 다음 배치로)"""
+        if self._log_flush_task is None or self._log_flush_task.done():
+            self._log_flush_task = asyncio.create_task(self._flush_log())
+    
+    async def _flush_log(self):
+        """대기 중인 이벤트 로그를 스레드에서 기록 (대기열 확인은 루프에서 → append와 경합 없음)"""
+        while self._log.has_pending():
+            try:
+                await asyncio.to_thread(self._log.flush)
+            except Exception as e:
+                logger.error(f"[SSE] Event log flush failed: {e}", exc_info=True)
+                return
+    
+    async def _compact_log(self, session_id: str):
+        """종료된 세션 로그 압축 + 보관 기간이 지난 로그 정리"""
+        try:
+            await asyncio.to_thread(self._log.flush)
+            await asyncio.to_thread(self._log.compact, session_id)
+            await asyncio.to_thread(self._log.purge_finished)
+        except Exception as e:
+            logger.error(f"[SSE] Event log compaction failed for {session_id}: {e}", exc_info=True)
+    
+    def _deliver(self, session_id: str, published: dict):
+        """버스에서 이 프로세스로 들어온 이벤트를 링 버퍼와 로컬 구독자에게 전달"""
+        event = WireEvent.from_published(published)
+        # emit이 같은 객체를 반환하도록 (로컬 발행이면 published는 emit이 받는 dict와 동일)
+        published["wire"] = event
         
-        # 큐에 추가
-        queue = self.get_or_create_queue(session_id)
-        await queue.put(event)
+        # 링 버퍼에 저장 (maxlen 초과 시 가장 오래된 이벤트가 O(1)로 밀려남)
+        self._get_buffer(session_id).append(event)
         
-        return event
+        # 모든 구독자에게 전달
+        for subscriber in self._subscribers.get(session_id, ()):
+            subscriber.offer(event, session_id)
+    
+    async def start(self):
+        """이벤트 버스 수신 시작 (앱 startup)"""
+        await self._bus.start()
+    
+    async def stop(self):
+        """이벤트 버스 수신 종료 (앱 shutdown)"""
+        await self._bus.stop()
+        if self._log:
+            await asyncio.to_thread(self._log.flush)
+    
+    def latest_event_id(self, session_id: str) -> Optional[int]:
+        """세션의 마지막 이벤트 id (이벤트 로그가 없으면 이 프로세스의 링 버퍼 기준)"""
+        if self._log:
+            return self._log.latest_event_id(session_id)
+        event = self.last_event(session_id)
+        return event.id if event else None
     
-    def get_missed_events(self, session_id: str, last_event_id: int) -> List[SSEEvent]:
+    async def get_missed_events(self, session_id: str, last_event_id: int) -> List[WireEvent]:
         """
         Last-Event-ID 이후 미수신 이벤트 반환
         
@@ -116,14 +249,62 @@ class SSEEventManager:
         Returns:
             미수신 이벤트 목록
         """
-        buffer = self._event_buffers.get(session_id, [])
-        return [e for e in buffer if e.id > last_event_id]
+        if self._log:
+            events = await asyncio.to_thread(self._log.read_since, session_id, last_event_id)
+            return [WireEvent.from_published(e) for e in events]
+        
+        # 여러 워커가 발행하면 도착 순서가 id 순서와 다를 수 있어 전체 확인 (버퍼 크기 상한)
+        buffer = self._event_buffers.get(session_id, ())
+        return sorted((e for e in buffer if e.id > last_event_id), key=lambda e: e.id)
+    
+    async def follow(
+        self,
+        session_id: str,
+        subscriber: _Subscriber,
+        last_event_id: Optional[int] = None
+    ) -> AsyncGenerator[Optional[WireEvent], None]:
+        """
+        구독자 기준 이벤트 흐름 (재전송 → 실시간)
+        
+        last_event_id가 있으면 그 이후 미수신 이벤트를 먼저 재전송하고 구독자 큐를 따라갑니다.
+        30초 동안 이벤트가 없으면 None(keepalive)을 yield하고, SESSION_END에서 끝납니다.
+        구독(subscribe)은 호출자가 먼저 해 두어야 재전송 중 발생한 이벤트를 놓치지 않습니다.
+        """
+        # 재연결 시 미수신 이벤트 재전송
+        if last_event_id is not None:
+            for event in await self.get_missed_events(session_id, last_event_id):
+                last_event_id = event.id
+                yield event
+                # 이미 끝난 세션이면 재전송만 하고 종료
+                if event.type == EventType.SESSION_END:
+                    return
+        
+        # 새 이벤트 스트리밍
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), timeout=30)
+            except asyncio.TimeoutError:
+                # 타임아웃 시 keepalive
+                yield None
+                continue
+            
+            # 재전송으로 이미 보낸 이벤트는 건너뜀
+            if last_event_id is not None and event.id is not None and event.id <= last_event_id:
+                continue
+            yield event
+            
+            if event.type == EventType.RESYNC:
+                logger.warning(f"[SSE] Slow subscriber on {session_id}, dropped={subscriber.dropped}")
+            
+            # SESSION_END 이벤트 시 종료
+            if event.type == EventType.SESSION_END:
+                return
     
     async def stream_events(
         self, 
         session_id: str, 
         last_event_id: Optional[int] = None
-    ) -> AsyncGenerator[str, None]:
+    ) -> AsyncGenerator[bytes, None]:
         """
         SSE 이벤트 스트림 생성기
         
@@ -132,35 +313,50 @@ class SSEEventManager:
             last_event_id: 마지막 수신 이벤트 ID (재연결 시)
             
         Yields:
-            SSE 포맷 문자열
+            SSE 포맷 bytes
         """
-        # 재연결 시 미수신 이벤트 재전송
-        if last_event_id:
-            missed = self.get_missed_events(session_id, last_event_id)
-            for event in missed:
-                yield event.to_sse_format()
+        # 재전송 중 발생한 이벤트를 놓치지 않도록 먼저 구독
+        subscriber = self.subscribe(session_id)
+        try:
+            async for event in self.follow(session_id, subscriber, last_event_id):
+                yield KEEPALIVE if event is None else event.to_sse_format()
+        finally:
+            self.unsubscribe(session_id, subscriber)
+    
+    def last_event(self, session_id: str) -> Optional[WireEvent]:
+        """이 프로세스에 전달된 마지막 이벤트 (유휴 판단용)"""
+        buffer = self._event_buffers.get(session_id)
+        return buffer[-1] if buffer else None
+    
+    def cleanup_session(self, session_id: str) -> bool:
+        """
+        세션 링 버퍼 정리
         
-        # 새 이벤트 스트리밍
-        queue = self.get_or_create_queue(session_id)
-        while True:
-            try:
-                event = await asyncio.wait_for(queue.get(), timeout=30)
-                yield event.to_sse_format()
-                
-                # SESSION_END 이벤트 시 종료
-                if event.type == EventType.SESSION_END:
-                    break
-            except asyncio.TimeoutError:
-                # 타임아웃 시 keepalive 전송
-                yield ": keepalive\n\n"
+        연결된 구독자가 있으면 정리하지 않습니다. 재연결 재전송은 이벤트 로그가 담당합니다.
+        Returns: 정리했으면 True
+        """
+        if self._subscribers.get(session_id):
+            return False
+        self._event_buffers.pop(session_id, None)
+        self._subscribers.pop(session_id, None)
+        return True
     
-    def cleanup_session(self, session_id: str):
-        """세션 정리"""
-        if session_id in self._event_buffers:
-            del self._event_buffers[session_id]
-        if session_id in self._event_queues:
-            del self._event_queues[session_id]
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용)"""
+        return {"event_buffers": self._event_buffers, "subscribers": self._subscribers}
+
+
+def create_event_log() -> Optional[EventLog]:
+    """설정에 맞는 이벤트 로그 (memory 저장소면 로그도 메모리)"""
+    if not EVENT_LOG_ENABLED:
+        return None
+    if EVENT_BUS_BACKEND != "sqlite" and WEB_CONCURRENCY > 1:
+        logger.warning(
+            "[SSE] EVENT_BUS_BACKEND=memory with multiple workers: event ids are not monotonic per session "
+            "across workers, so Last-Event-ID resume may skip events (use EVENT_BUS_BACKEND=sqlite)"
+        )
+    return EventLog(":memory:" if STORAGE_BACKEND == "memory" else EVENT_LOG_PATH)
 
 
 # 싱글톤 인스턴스
-sse_event_manager = SSEEventManager()
+sse_event_manager = SSEEventManager(create_event_bus(), create_event_log())
@@ -0,0 +1,283 @@
+"""
+세션 일괄 내보내기 (리포트 + 대화 기록 + CaseFile)
+
+분석가가 세션마다 GET /report를 호출하던 것을 요청 하나로 묶습니다.
+선택한 세션들을 zip 또는 NDJSON으로 스트리밍하며, 메모리 사용량은 세션 수와 무관합니다.
+
+- 대화 기록은 get_messages_since 커서로 EXPORT_PAGE_SIZE개씩 읽어 바로 내보냄
+- zip은 seek 없는 출력 버퍼에 쓰고(data descriptor) 쓴 만큼 꺼내 전송
+- 리포트 HTML/PDF 렌더링은 프로세스 풀(EXPORT_RENDER_WORKERS)에서 수행하고
+  그동안 같은 세션의 대화 기록을 내보냄 (프로세스 풀을 만들 수 없는 환경이면 스레드에서 렌더링)
+
+zip 구성: {session_id}/session.json, case_file.json, report.md, report.json, report.{html,pdf},
+messages.jsonl + manifest.json
+NDJSON 구성: {"type": "session" | "case_file" | "report" | "rendered" | "message", "session_id", ...} 줄 +
+마지막 줄 {"type": "manifest", ...}
+"""
+import asyncio
+import io
+import json
+import logging
+import multiprocessing
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from typing import AsyncGenerator, Dict, List, Optional, Sequence
+
+from config import EXPORT_PAGE_SIZE, EXPORT_RENDER_WORKERS
+from rendering.report import RENDERERS
+from storage import get_storage
+from storage.base import MESSAGE_ALL_COLUMNS, message_cursor
+from storage.write_batcher import WriteBatcher, write_batcher
+from .sse_wire import json_bytes
+
+logger = logging.getLogger(__name__)
+
+# 내보낼 수 있는 항목
+EXPORT_PARTS = ("report", "messages", "case_file")
+
+
+def _pretty_json(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, indent=2, default=str).encode()
+
+
+def _line(data) -> bytes:
+    return json_bytes(data) + b"\n"
+
+
+class RenderPool:
+    """
+    리포트 렌더링 프로세스 풀
+
+    처음 렌더링할 때 spawn 방식으로 만듭니다 (작업자는 rendering 패키지만 임포트).
+    서버리스 환경처럼 프로세스 풀을 쓸 수 없으면 스레드에서 렌더링합니다.
+    """
+
+    def __init__(self, workers: int = EXPORT_RENDER_WORKERS):
+        self._workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._disabled = workers <= 0
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self._pool is None and not self._disabled:
+            try:
+                self._pool = ProcessPoolExecutor(self._workers, mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"[Export] Process pool unavailable, rendering in threads: {e}")
+                self._disabled = True
+        return self._pool
+
+    async def render(self, fmt: str, markdown_text: str, title: str):
+        renderer = RENDERERS[fmt]
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, renderer, markdown_text, title)
+            except (OSError, BrokenProcessPool) as e:
+                logger.warning(f"[Export] Process pool failed, rendering in threads: {e}")
+                self.shutdown()
+                self._disabled = True
+        return await asyncio.to_thread(renderer, markdown_text, title)
+
+    async def render_all(self, formats: Sequence[str], markdown_text: str, title: str) -> Dict[str, object]:
+        """여러 형식을 동시에 렌더링 → {형식: 결과}"""
+        results = await asyncio.gather(*(self.render(fmt, markdown_text, title) for fmt in formats))
+        return dict(zip(formats, results))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+class _ZipSink(io.RawIOBase):
+    """zipfile 출력 버퍼 (seek 불가 → data descriptor 사용, 쓴 만큼 drain()으로 꺼냄)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class SessionExporter:
+    """
+    세션 일괄 내보내기
+
+    backend는 StorageBackend 구현체, batcher는 내보내기 전에 미반영 쓰기를 반영할 WriteBatcher입니다.
+    """
+
+    def __init__(self, backend, batcher: WriteBatcher, pool: RenderPool, page_size: int = EXPORT_PAGE_SIZE):
+        self._backend = backend
+        self._batcher = batcher
+        self._pool = pool
+        self._page_size = page_size
+
+    async def _message_pages(self, session_id: str) -> AsyncGenerator[List[dict], None]:
+        """대화 기록을 page_size개씩 (created_at, id 순)"""
+        cursor = None
+        while True:
+            page = await self._backend.get_messages_since(session_id, cursor, self._page_size, MESSAGE_ALL_COLUMNS)
+            if page:
+                yield page
+            if len(page) < self._page_size:
+                return
+            cursor = message_cursor(page[-1])
+
+    def _start_render(
+        self, report: Optional[dict], formats: Sequence[str], title: str
+    ) -> Optional[asyncio.Task]:
+        """리포트 렌더링 시작 (대화 기록을 내보내는 동안 진행)"""
+        if not report or not formats:
+            return None
+        markdown_text = report.get("report_md") or (report.get("report_json") or {}).get("content") or ""
+        return asyncio.create_task(self._pool.render_all(formats, markdown_text, title))
+
+    async def _load(self, session_id: str) -> Optional[dict]:
+        await self._batcher.flush(session_id)
+        return await self._backend.get_session(session_id)
+
+    def stream(
+        self, session_ids: Sequence[str], fmt: str, include: Sequence[str], render: Sequence[str]
+    ) -> AsyncGenerator[bytes, None]:
+        """내보내기 스트림 (fmt: "zip" | "ndjson")"""
+        if fmt == "zip":
+            return self._stream_zip(session_ids, include, render)
+        return self._stream_ndjson(session_ids, include, render)
+
+    async def _stream_zip(
+        self, session_ids: Sequence[str], include: Sequence[str], render: Sequence[str]
+    ) -> AsyncGenerator[bytes, None]:
+        sink = _ZipSink()
+        manifest = _Manifest(include, render)
+        with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for session_id in session_ids:
+                session = await self._load(session_id)
+                if not session:
+                    manifest.missing.append(session_id)
+                    continue
+                prefix = f"{session_id}/"
+                archive.writestr(prefix + "session.json", _pretty_json(session))
+
+                if "case_file" in include:
+                    case_file = await self._backend.get_case_file(session_id)
+                    if case_file:
+                        archive.writestr(prefix + "case_file.json", _pretty_json(case_file))
+
+                report = await self._backend.get_final_report(session_id) if "report" in include else None
+                if report:
+                    archive.writestr(prefix + "report.md", report.get("report_md") or "")
+                    archive.writestr(prefix + "report.json", _pretty_json(report.get("report_json")))
+                yield sink.drain()
+
+                render_task = self._start_render(report, render, session.get("topic") or "")
+                try:
+                    count = 0
+                    if "messages" in include:
+                        with archive.open(prefix + "messages.jsonl", "w", force_zip64=True) as entry:
+                            async for page in self._message_pages(session_id):
+                                count += len(page)
+                                entry.write(b"".join(_line(message) for message in page))
+                                yield sink.drain()
+
+                    rendered = await render_task if render_task else {}
+                finally:
+                    if render_task and not render_task.done():
+                        render_task.cancel()
+                for ext, data in rendered.items():
+                    archive.writestr(f"{prefix}report.{ext}", data)
+                manifest.add(session, count, bool(report), list(rendered))
+                yield sink.drain()
+
+            archive.writestr("manifest.json", _pretty_json(manifest.to_dict()))
+        # 닫을 때 central directory 기록
+        yield sink.drain()
+
+    async def _stream_ndjson(
+        self, session_ids: Sequence[str], include: Sequence[str], render: Sequence[str]
+    ) -> AsyncGenerator[bytes, None]:
+        manifest = _Manifest(include, render)
+        for session_id in session_ids:
+            session = await self._load(session_id)
+            if not session:
+                manifest.missing.append(session_id)
+                continue
+            yield _line({"type": "session", "session_id": session_id, "data": session})
+
+            if "case_file" in include:
+                case_file = await self._backend.get_case_file(session_id)
+                if case_file:
+                    yield _line({"type": "case_file", "session_id": session_id, "data": case_file})
+
+            report = await self._backend.get_final_report(session_id) if "report" in include else None
+            if report:
+                yield _line({"type": "report", "session_id": session_id, **report})
+
+            render_task = self._start_render(report, render, session.get("topic") or "")
+            try:
+                count = 0
+                if "messages" in include:
+                    async for page in self._message_pages(session_id):
+                        count += len(page)
+                        yield b"".join(
+                            _line({"type": "message", "session_id": session_id, "data": message}) for message in page
+                        )
+
+                rendered = await render_task if render_task else {}
+            finally:
+                if render_task and not render_task.done():
+                    render_task.cancel()
+            for fmt, content in rendered.items():
+                yield _line({"type": "rendered", "session_id": session_id, "format": fmt, "content": content})
+            manifest.add(session, count, bool(report), list(rendered))
+
+        yield _line({"type": "manifest", **manifest.to_dict()})
+
+
+class _Manifest:
+    """내보낸 세션 목록 (zip의 manifest.json / NDJSON 마지막 줄)"""
+
+    def __init__(self, include: Sequence[str], render: Sequence[str]):
+        self.include = list(include)
+        self.render = list(render)
+        self.sessions: List[dict] = []
+        self.missing: List[str] = []
+
+    def add(self, session: dict, messages: int, report: bool, rendered: List[str]):
+        self.sessions.append({
+            "session_id": session.get("id"),
+            "topic": session.get("topic"),
+            "project_type": session.get("project_type"),
+            "messages": messages,
+            "report": report,
+            "rendered": rendered,
+        })
+
+    def to_dict(self) -> dict:
+        return {
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "include": self.include,
+            "render": self.render,
+            "sessions": self.sessions,
+            "missing": self.missing,
+        }
+
+
+# 싱글톤 인스턴스
+render_pool = RenderPool()
+session_exporter = SessionExporter(get_storage(), write_batcher, render_pool)
@@ -0,0 +1,143 @@
+"""
+세션 피드 (스냅샷 + 실시간 델타 단일 스트림)
+
+프론트엔드가 GET /sessions/{id} 폴링, Supabase realtime(messages), SSE를 함께 쓰던 것을
+SSE 연결 하나로 합칩니다.
+
+1. 첫 프레임 snapshot (id = cursor)
+   {cursor, session, case_file_summary, messages(최근 N개), draft(생성 중인 메시지)}
+2. 이후 cursor보다 큰 이벤트를 그대로 전달 (events 스트림과 같은 프레임)
+3. 세션 상태가 바뀌는 이벤트 뒤에는 id 없는 session_state 프레임을 덧붙임
+
+feed_items()는 전송 방식과 무관한 항목을 내고, SSE(stream_feed)와 WebSocket(routes)이 각자 프레임으로 바꿉니다.
+재접속 시 Last-Event-ID(또는 cursor 쿼리)가 있으면 스냅샷 없이 그 이후 이벤트만 보냅니다.
+스냅샷은 구독 후 cursor를 먼저 정하고 읽으므로 cursor 이후 이벤트가 스냅샷에 이미 반영되어
+있을 수 있습니다 (메시지는 message_id 기준으로 멱등하게 반영).
+"""
+import logging
+from contextlib import aclosing
+from typing import AsyncGenerator, Optional, Tuple, Union
+
+from config import FEED_MESSAGE_LIMIT
+from models.case_file import CaseFile
+from storage.draft_writer import draft_writer, is_orphaned_draft
+from storage.write_batcher import write_batcher
+from .events import EventType, sse_event_manager
+from .sse_wire import KEEPALIVE, WireEvent, sse_frame
+
+logger = logging.getLogger(__name__)
+
+FEED_MESSAGE_COLUMNS = ("id", "role", "content_text", "round_index", "phase", "event_id", "status", "created_at")
+
+FEED_SESSION_FIELDS = (
+    "id", "status", "category", "topic", "round_index", "phase", "case_type", "project_type", "created_at",
+)
+
+# 뒤에 session_state 프레임을 붙이는 이벤트 (phase/round/status가 바뀌는 시점)
+_SESSION_CHANGING_EVENTS = {
+    event_type.value for event_type in (
+        EventType.SPEAKER_CHANGE, EventType.ROUND_START, EventType.ROUND_END,
+        EventType.FINALIZE_START, EventType.FINALIZE_DONE, EventType.SESSION_END,
+    )
+}
+
+
+def _session_state(session: dict) -> dict:
+    return {field: session.get(field) for field in FEED_SESSION_FIELDS}
+
+
+def _case_file_summary(session_id: str, case_file: Optional[dict]) -> str:
+    if not case_file:
+        return ""
+    try:
+        return CaseFile(**{**case_file, "session_id": session_id}).get_summary()
+    except Exception as e:
+        logger.warning(f"[Feed] CaseFile summary failed for {session_id}: {e}")
+        return ""
+
+
+async def build_snapshot(session_id: str, message_limit: int = FEED_MESSAGE_LIMIT) -> Optional[dict]:
+    """
+    세션 스냅샷
+
+    cursor는 스냅샷이 반영하고 있다고 보장하는 마지막 이벤트 id입니다.
+    생성 중인 초안이 있으면 초안 본문에 반영된 마지막 chunk id로 낮춰서
+    이후 chunk가 델타로 이어지게 합니다.
+    """
+    # 데이터를 읽기 전에 cursor를 정해야 그 사이 이벤트가 유실되지 않음
+    cursor = sse_event_manager.latest_event_id(session_id) or 0
+
+    session = await write_batcher.get_session(session_id)
+    if not session:
+        return None
+    case_file = await write_batcher.get_case_file(session_id)
+    messages = await write_batcher.get_recent_messages(session_id, message_limit, FEED_MESSAGE_COLUMNS)
+
+    # 이 프로세스에서 생성 중이면 메모리 초안이 DB 초안보다 최신
+    draft = draft_writer.active(session_id)
+    if draft:
+        messages = [m for m in messages if m["id"] != draft["id"]]
+    elif messages and messages[-1].get("status") == "streaming" and not is_orphaned_draft(messages[-1]):
+        draft = messages.pop()
+    if draft and draft.get("event_id") is not None:
+        cursor = min(cursor, draft["event_id"])
+
+    return {
+        "cursor": cursor,
+        "session": _session_state(session),
+        "case_file_summary": _case_file_summary(session_id, case_file),
+        "messages": messages,
+        "draft": draft,
+    }
+
+
+async def feed_items(
+    session_id: str,
+    cursor: Optional[int] = None,
+    message_limit: int = FEED_MESSAGE_LIMIT
+) -> AsyncGenerator[Union[WireEvent, Tuple[str, dict], None], None]:
+    """
+    세션 피드 항목 (전송 방식과 무관)
+
+    - WireEvent: id가 있는 이벤트 (snapshot 포함)
+    - (event_type, data): id 없는 보조 프레임 (session_state, error)
+    - None: keepalive
+
+    cursor가 None이면 스냅샷부터, 있으면 그 이후 이벤트부터 보냅니다.
+    """
+    # 스냅샷을 읽는 동안 발생한 이벤트를 놓치지 않도록 먼저 구독
+    subscriber = sse_event_manager.subscribe(session_id)
+    try:
+        if cursor is None:
+            snapshot = await build_snapshot(session_id, message_limit)
+            if snapshot is None:
+                yield EventType.ERROR.value, {"detail": "Session not found"}
+                return
+            cursor = snapshot["cursor"]
+            yield WireEvent(cursor, EventType.SNAPSHOT.value, snapshot)
+
+        async for event in sse_event_manager.follow(session_id, subscriber, cursor):
+            yield event
+            if event is not None and event.type in _SESSION_CHANGING_EVENTS:
+                session = await write_batcher.get_session(session_id)
+                if session:
+                    yield EventType.SESSION_STATE.value, _session_state(session)
+    finally:
+        sse_event_manager.unsubscribe(session_id, subscriber)
+
+
+async def stream_feed(
+    session_id: str,
+    cursor: Optional[int] = None,
+    message_limit: int = FEED_MESSAGE_LIMIT
+) -> AsyncGenerator[bytes, None]:
+    """세션 피드 SSE 스트림"""
+    # 연결이 끊기면 내부 제너레이터도 바로 닫아 구독 해제
+    async with aclosing(feed_items(session_id, cursor, message_limit)) as items:
+        async for item in items:
+            if item is None:
+                yield KEEPALIVE
+            elif isinstance(item, WireEvent):
+                yield item.to_sse_format()
+            else:
+                yield sse_frame(*item)
@@ -0,0 +1,315 @@
+"""
+최종 리포트 생성 작업 (스트리밍)
+
+POST /report/generate가 2000~4000자 리포트를 비스트리밍 generate_text로 다 만들 때까지
+요청을 붙잡고 있어 30~60초 스피너와 서버리스 타임아웃이 발생하던 문제를 해결합니다.
+
+- start(): 작업 id를 바로 반환하고 백그라운드에서 생성 (세션당 실행 중인 작업은 하나)
+- 생성 토큰은 세션 이벤트 스트림으로 전송: REPORT_START → REPORT_CHUNK* → REPORT_END
+  REPORT_CHUNK의 seq는 chunk 순번. 실행 중인 작업에 붙는 클라이언트는 start() 시점의
+  content/chunks를 받고 seq >= chunks인 chunk만 이어 붙임
+- 본문은 REPORT_FLUSH_INTERVAL_MS마다 final_reports에 status='streaming'으로 저장하고
+  완료 시 status='complete'로 저장 (실패하면 이전 리포트로 되돌림)
+- 작업 상태는 이 프로세스 메모리 + final_reports.report_json(job_id, status)로 조회
+- 완료된 리포트는 report_json에 content_key(메시지 id/버전 + CaseFile 버전 해시)와
+  format_version(양식/프롬프트 해시)을 함께 저장. ensure()가 이를 현재 값과 비교해
+  fresh(그대로 반환) / stale(양식만 바뀜: 이전 리포트를 반환하고 백그라운드 재생성) / miss(생성)를 결정
+  재생성(revalidate) 작업은 완료 전까지 부분 본문을 저장하지 않아 stale 리포트가 계속 조회됨
+- 완료된 리포트는 섹션별 본문과 입력 해시(report_json.sections)도 저장. 다음 작업은 입력이 같은
+  섹션을 다시 생성하지 않음. 마지막 라운드가 끝나면(END_GATE) schedule_refresh()가 백그라운드로
+  리포트를 만들어 두므로 finalize 시점에는 마지막 라운드를 읽는 섹션만(입력이 그대로면 없음) 생성됨
+- 백그라운드 작업의 REPORT_CHUNK는 클라이언트가 합류한 뒤에만 발행 (REPORT_START/END는 항상)
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Optional, Set, Tuple
+
+from config import REPORT_FLUSH_INTERVAL_MS, REPORT_JOB_RETENTION_SECONDS, REPORT_INCREMENTAL_ENABLED
+from orchestrator.report_pipeline import (
+    REPORT_KEY_COLUMNS, REPORT_MESSAGE_COLUMNS, ReportPipeline, content_key, report_pipeline,
+)
+from storage import get_storage
+from storage.write_batcher import WriteBatcher, write_batcher
+from .events import EventType, SSEEventManager, sse_event_manager
+
+logger = logging.getLogger(__name__)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class ReportJob:
+    """리포트 생성 작업 하나"""
+
+    def __init__(self, session_id: str, revalidate: bool = False):
+        self.id = str(uuid.uuid4())
+        self.session_id = session_id
+        self.revalidate = revalidate  # 백그라운드 재생성 (stale/라운드 종료 갱신, 부분 본문 저장 안 함)
+        self.watched = not revalidate  # 클라이언트가 받고 있음 (REPORT_CHUNK 발행)
+        self.content_key: Optional[str] = None  # 생성에 쓴 입력 해시 (입력을 읽은 뒤 설정)
+        self.status = "running"  # running | complete | failed
+        self.content = ""  # 지금까지 생성된 본문
+        self.chunks = 0  # 지금까지 생성된 chunk 수 (다음 REPORT_CHUNK의 seq)
+        self.error: Optional[str] = None
+        self.started_at = _now()
+        self.finished_at: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self._finished_mono: Optional[float] = None
+
+    def finish(self, status: str, error: Optional[str] = None):
+        self.status = status
+        self.error = error
+        self.finished_at = _now()
+        self._finished_mono = time.monotonic()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "session_id": self.session_id,
+            "status": self.status,
+            "chars": len(self.content),
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class ReportJobManager:
+    """
+    리포트 생성 작업 관리자
+
+    backend는 StorageBackend 구현체, batcher는 생성 전에 미반영 쓰기를 반영할 WriteBatcher입니다.
+    """
+
+    def __init__(
+        self,
+        pipeline: ReportPipeline,
+        events: SSEEventManager,
+        backend,
+        batcher: WriteBatcher,
+        flush_interval_ms: int = REPORT_FLUSH_INTERVAL_MS,
+    ):
+        self._pipeline = pipeline
+        self._events = events
+        self._backend = backend
+        self._batcher = batcher
+        self._flush_interval = flush_interval_ms / 1000
+        self._jobs: Dict[str, ReportJob] = {}
+        self._running: Dict[str, ReportJob] = {}  # session_id → 실행 중인 작업
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    def start(self, session_id: str, project_type: str, revalidate: bool = False) -> ReportJob:
+        """리포트 생성 시작 (이미 실행 중이면 그 작업 반환)"""
+        running = self._running.get(session_id)
+        if running:
+            return running
+        self._prune()
+
+        job = ReportJob(session_id, revalidate)
+        self._jobs[job.id] = job
+        self._running[session_id] = job
+        job.task = asyncio.create_task(self._run(job, project_type))
+        return job
+
+    async def ensure(
+        self, session_id: str, project_type: str, background: bool = False
+    ) -> Tuple[str, Optional[dict], Optional[ReportJob]]:
+        """
+        저장된 리포트를 재사용하거나 생성 시작 → (state, 리포트 행, 작업)
+
+        - "fresh": 입력과 양식이 그대로 → 저장된 리포트 (작업 없음)
+        - "stale": 양식만 바뀜 → 저장된 리포트 + 백그라운드 재생성 작업
+        - "running": 생성 중인 작업에 합류 (같은 입력으로 백그라운드 갱신 중인 작업 포함)
+        - "miss": 새 생성 작업 (background면 백그라운드 재생성 작업)
+        - "empty": 메시지가 없음
+        """
+        running = self._running.get(session_id)
+        if running and not running.revalidate:
+            return "running", None, running
+
+        await self._batcher.flush(session_id)
+        rows = await self._backend.get_messages(session_id, REPORT_KEY_COLUMNS)
+        if not rows:
+            return "empty", None, None
+        case_file = await self._backend.get_case_file(session_id)
+        report = await self._backend.get_final_report(session_id)
+        report_json = (report or {}).get("report_json") or {}
+
+        key = content_key(rows, case_file)
+        if report_json.get("status", "complete") == "complete" and report_json.get("content_key") == key:
+            if report_json.get("format_version") == self._pipeline.format_version(project_type):
+                return "fresh", report, None
+            job = self.start(session_id, project_type, revalidate=True)
+            logger.info(f"[ReportJob] Serving stale report for {session_id}, revalidating in {job.id}")
+            return "stale", report, job
+
+        if running:
+            if running.content_key == key:
+                # 합류한 클라이언트는 job.content 이후를 REPORT_CHUNK로 받음
+                running.watched = True
+                return "running", None, running
+            # 이전 입력으로 갱신 중인 작업은 기다리지 않고 새로 생성 (끝난 섹션은 파이프라인 캐시로 재사용)
+            running.task.cancel()
+            await asyncio.gather(running.task, return_exceptions=True)
+        return "miss", None, self.start(session_id, project_type, revalidate=background)
+
+    def schedule_refresh(self, session_id: str, project_type: str):
+        """
+        마지막 라운드 종료(END_GATE) 후 백그라운드 리포트 생성 (입력이 바뀐 섹션만 다시 생성)
+
+        중간 라운드에서는 호출하지 않습니다. 마지막 라운드를 읽는 섹션은 라운드마다 바뀌어 토큰만 쓰고,
+        나머지 섹션도 다음 라운드의 입력이 들어오기 전에는 확정되지 않기 때문입니다.
+        """
+        if not REPORT_INCREMENTAL_ENABLED:
+            return
+        task = asyncio.create_task(self._refresh(session_id, project_type))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, session_id: str, project_type: str):
+        try:
+            state, _, job = await self.ensure(session_id, project_type, background=True)
+            if job:
+                logger.info(f"[ReportJob] Refreshing report for {session_id} in {job.id} ({state})")
+        except Exception as e:
+            logger.warning(f"[ReportJob] Refresh failed for {session_id}: {e}")
+
+    async def get(self, session_id: str, job_id: str) -> Optional[dict]:
+        """작업 상태 (이 프로세스가 모르는 작업이면 final_reports에 기록된 상태)"""
+        job = self._jobs.get(job_id)
+        if job and job.session_id == session_id:
+            return job.to_dict()
+
+        report = await self._backend.get_final_report(session_id)
+        report_json = (report or {}).get("report_json") or {}
+        if report_json.get("job_id") != job_id:
+            return None
+        return {
+            "job_id": job_id,
+            "session_id": session_id,
+            "status": report_json.get("status", "complete"),
+            "chars": len(report_json.get("content") or ""),
+            "error": None,
+            "started_at": None,
+            "finished_at": None,
+        }
+
+    async def _save(self, job: ReportJob, content: str, status: str, cache_fields: Optional[dict] = None):
+        report_json = {"content": content, "status": status, "job_id": job.id, **(cache_fields or {})}
+        await self._backend.save_final_report(job.session_id, report_json, content)
+
+    async def _run(self, job: ReportJob, project_type: str):
+        session_id = job.session_id
+        previous = None
+        flushed = False
+        try:
+            await self._events.emit(session_id, EventType.REPORT_START, {"job_id": job.id})
+            await self._batcher.flush(session_id)
+            previous = await self._backend.get_final_report(session_id)
+            messages = await self._backend.get_messages(session_id, REPORT_MESSAGE_COLUMNS)
+            if not messages:
+                raise ValueError("No messages to summarize")
+            case_file = await self._backend.get_case_file(session_id)
+            job.content_key = content_key(messages, case_file)
+
+            # 이전 리포트의 섹션 본문 (입력 해시가 같은 섹션은 다시 생성하지 않음)
+            reuse = {
+                section["key"]: section["content"]
+                for section in ((previous or {}).get("report_json") or {}).get("sections") or []
+            }
+            plan = await self._pipeline.plan(project_type, messages, case_file)
+
+            last_flush = time.monotonic()
+            async for chunk in self._pipeline.stream_plan(project_type, plan, reuse):
+                # 이벤트보다 본문을 먼저 갱신: 이벤트가 나간 chunk는 항상 job.content에 포함
+                seq = job.chunks
+                job.content += chunk
+                job.chunks += 1
+                if job.watched:
+                    await self._events.emit(session_id, EventType.REPORT_CHUNK, {
+                        "job_id": job.id, "seq": seq, "text": chunk,
+                    })
+                if not job.revalidate and time.monotonic() - last_flush >= self._flush_interval:
+                    last_flush = time.monotonic()
+                    await self._save(job, job.content, "streaming")
+                    flushed = True
+
+            await self._save(job, job.content, "complete", {
+                "content_key": job.content_key,
+                "format_version": self._pipeline.format_version(project_type),
+                "project_type": project_type,
+                "sections": [
+                    {"title": section.title, "key": section.key, "content": reuse.get(section.key, "")}
+                    for section in plan
+                ],
+            })
+            job.finish("complete")
+        except asyncio.CancelledError:
+            job.finish("failed", "cancelled")
+            if flushed:
+                await self._restore(job, previous)
+            raise
+        except Exception as e:
+            logger.error(f"[ReportJob] {job.id} failed for {session_id}: {e}", exc_info=True)
+            job.finish("failed", str(e))
+            if flushed:
+                await self._restore(job, previous)
+        finally:
+            self._running.pop(session_id, None)
+            if job.status != "running":
+                await self._events.emit(session_id, EventType.REPORT_END, {
+                    "job_id": job.id, "status": job.status, "chars": len(job.content), "error": job.error,
+                })
+
+    async def _restore(self, job: ReportJob, previous: Optional[dict]):
+        """실패한 작업이 남긴 부분 리포트를 이전 리포트로 되돌림 (없으면 failed로 표시)"""
+        try:
+            if previous:
+                await self._backend.save_final_report(
+                    job.session_id, previous["report_json"], previous.get("report_md")
+                )
+            else:
+                await self._save(job, job.content, "failed")
+        except Exception as e:
+            logger.error(f"[ReportJob] Restore failed for {job.session_id}: {e}")
+
+    def _prune(self):
+        """보관 기간이 지난 끝난 작업 제거"""
+        cutoff = time.monotonic() - REPORT_JOB_RETENTION_SECONDS
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job._finished_mono is not None and job._finished_mono < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def is_busy(self, session_id: str) -> bool:
+        return session_id in self._running
+
+    def forget_session(self, session_id: str):
+        """세션의 끝난 작업 제거 (실행 중인 작업은 그대로 둠)"""
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.session_id == session_id]:
+            if self._jobs[job_id] is not self._running.get(session_id):
+                del self._jobs[job_id]
+
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용, 작업은 세션별로 묶어서)"""
+        jobs: Dict[str, list] = {}
+        for job in self._jobs.values():
+            jobs.setdefault(job.session_id, []).append(job)
+        return {"jobs": jobs, "running": self._running}
+
+    async def stop(self):
+        """실행 중인 작업 취소 (앱 shutdown)"""
+        tasks = [job.task for job in self._running.values() if job.task] + list(self._refresh_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# 싱글톤 인스턴스
+report_jobs = ReportJobManager(report_pipeline, sse_event_manager, get_storage(), write_batcher)
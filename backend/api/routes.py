@@ -11,9 +11,14 @@ import asyncio
 import logging
 import uuid
 import httpx
-from fastapi import APIRouter, HTTPException, Query, BackgroundTasks, Request
+from datetime import datetime
+from contextlib import aclosing
+from fastapi import (
+    APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request, Response, WebSocket, WebSocketDisconnect,
+)
 from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from starlette.requests import HTTPConnection
 from typing import Dict, List, Optional, Any
 
 from orchestrator.state_machine import (
@@ -26,6 +31,8 @@ from orchestrator.state_machine import (
     get_legal_round_start_phase, is_legal_phase,
 )
 from orchestrator.turn_manager import turn_manager, get_phase_config
+from orchestrator.context_builder import ContextBuilder, format_related, format_turns, log_packed
+from orchestrator.round_digest import digest_items, round_digester
 from agents.base_agent import gemini_client
 from agents.agent1_planner import Agent1Planner
 from agents.agent2_critic import Agent2Critic
@@ -41,16 +48,44 @@ from agents.devproject.agent_prd import DevAgentPRD
 from agents.devproject.agent_tech import DevAgentTech
 from agents.devproject.agent_ux import DevAgentUX
 from agents.devproject.agent_dm import DevAgentDM
-from storage import supabase_client as db
+from storage import get_storage, get_search_index, get_vector_index
+from storage.archive import archive_finished_sessions, transcript_archive
+from storage.base import session_cursor
+from storage.case_file_patch import CaseFilePatch
+from storage.draft_writer import draft_writer
+from storage.write_batcher import write_batcher
 from .events import sse_event_manager, EventType
-from config import BASE_URL
+from .export import EXPORT_PARTS, session_exporter
+from .feed import feed_items, stream_feed
+from .report_jobs import report_jobs
+from .sse_wire import WireEvent
+from .ws_codec import FrameCodec, FrameDecodeError
+from .session_lifecycle import session_lifecycle
+from config import (
+    BASE_URL, SESSION_LIST_DEFAULT_LIMIT, SESSION_LIST_MAX_LIMIT, ARCHIVE_AFTER_DAYS, SEARCH_MAX_LIMIT,
+    FEED_MESSAGE_LIMIT, EXPORT_MAX_SESSIONS, CONTEXT_DEFAULT_TOKENS, CONTEXT_RECENT_MESSAGES,
+    CONTEXT_TURN_MAX_TOKENS, VECTOR_INDEX_ENABLED, VECTOR_RECENT_MESSAGES, VECTOR_TOP_K, DIGEST_ENABLED,
+    DIGEST_RECENT_MESSAGES,
+)
 from prompts.legal.role_prompts import LEGAL_STEERING_BLOCK, FACTS_STIPULATE_PROMPT
+from rendering.report import available_formats
 
 # 로깅 설정
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api")
+
+async def track_session_activity(connection: HTTPConnection):
+    """세션 경로 요청(HTTP/WebSocket)이면 활동 기록 (hibernate된 세션은 상태 복원)"""
+    session_id = connection.path_params.get("session_id")
+    if session_id:
+        await session_lifecycle.resume(session_id)
+
+
+router = APIRouter(prefix="/api", dependencies=[Depends(track_session_activity)])
+
+# 저장소 (STORAGE_BACKEND 설정에 따라 supabase / sqlite / memory)
+db = get_storage()
 
 # 일반 토론 에이전트 인스턴스
 agents = {
@@ -124,6 +159,35 @@ class SessionResponse(BaseModel):
     created_at: Optional[str] = None  # ISO format datetime string
 
 
+async def gather_turns(session_id: str, query_parts: List[str], recent_limit: Optional[int] = None) -> tuple:
+    """
+    프롬프트에 넣을 발언 후보 → (직전 발언, 관련 조각)
+
+    벡터 색인이 켜져 있으면 직전 VECTOR_RECENT_MESSAGES개 + 질의(주제/phase + 직전 발언)와 관련된
+    이전 발언 조각/CaseFile 사실 top-k, 꺼져 있으면 직전 CONTEXT_RECENT_MESSAGES개만.
+    recent_limit을 주면 직전 발언 수를 그 값으로 (라운드 요약이 있을 때).
+    """
+    if not VECTOR_INDEX_ENABLED:
+        limit = recent_limit or CONTEXT_RECENT_MESSAGES
+        return await write_batcher.get_recent_messages(session_id, limit, ("role", "content_text")), []
+    limit = recent_limit or VECTOR_RECENT_MESSAGES
+    recent = await write_batcher.get_recent_messages(session_id, limit, ("id", "role", "content_text"))
+    query = "\n".join([*query_parts, *(m.get("content_text") or "" for m in recent[-1:])])
+    try:
+        related = await get_vector_index().search(
+            db, session_id, query, VECTOR_TOP_K, exclude_refs=[m.get("id") for m in recent]
+        )
+    except Exception as e:
+        logger.error(f"[VectorIndex] Search failed: {e}", exc_info=True)
+        related = []
+    return recent, related
+
+
+def _case_file_items(case_file: dict, fields: List[str]) -> List[str]:
+    """CaseFile 목록 필드 항목 (관련 조각에서 이미 넣은 사실을 빼기 위함)"""
+    return [item for field in fields for item in (case_file.get(field) or []) if isinstance(item, str)]
+
+
 # Phase 실행 함수
 async def execute_phase(session_id: str, phase: str, config: dict) -> str:
     """
@@ -162,26 +226,20 @@ async def execute_phase(session_id: str, phase: str, config: dict) -> str:
     if hasattr(agent, 'set_round'):
         agent.set_round(current_round)
         
-    # 프로젝트 타입 설정 (Verifier 등)
-    if hasattr(agent, 'set_project_type'):
-        session_data = await db.get_session(session_id)
-        if session_data:
-            agent.set_project_type(session_data.get("project_type", "general"))
+    # 세션 및 CaseFile 조회 (미반영 쓰기 포함)
+    session_data = await write_batcher.get_session(session_id)
+    case_file_data = await write_batcher.get_case_file(session_id)
     
-    # 세션 및 CaseFile 조회
-    session_data = await db.get_session(session_id)
-    case_file_data = await db.get_case_file(session_id)
+    # 프로젝트 타입 설정 (Verifier 등)
+    if hasattr(agent, 'set_project_type') and session_data:
+        agent.set_project_type(session_data.get("project_type", "general"))
     
     # 이전 대화 맥락 구성
-    case_file_summary = ""
     criticisms_last_round = ""
     steering_block = ""
+    steering = None
     
     if case_file_data:
-        decisions = case_file_data.get('decisions', [])
-        open_issues = case_file_data.get('open_issues', [])
-        case_file_summary = f"결정사항: {'; '.join(decisions[-3:])}. 미해결: {'; '.join(open_issues[-3:])}"
-        
         # Agent2용 이전 비판 목록
         criticisms = case_file_data.get('criticisms_last_round', [])
         if criticisms:
@@ -206,12 +264,51 @@ User note: {steering.get('free_text', '')}
 4) 응답 끝에 `Steering Compliance Check: OK/NOT OK`로 준수 여부를 자가 점검하세요.
 """
     
+    # CaseFile + 직전/관련 발언을 phase 예산 안에서 우선순위대로 (Steering은 항상 포함)
+    case_file = case_file_data or {}
+    digests = case_file.get("round_digests") if DIGEST_ENABLED else None
+    topic = (session_data.get("topic") if session_data else None) or ""
+    recent, related = await gather_turns(session_id, [
+        topic, config.get("description", ""), (steering or {}).get("goal") or "",
+    ], DIGEST_RECENT_MESSAGES if digests else None)
+    packed = (
+        ContextBuilder(config.get("context_tokens", CONTEXT_DEFAULT_TOKENS))
+        .reserve("steering", steering_block)
+        .add("결정사항", case_file.get("decisions_so_far") or case_file.get("decisions"), priority=1)
+        .add("제약", case_file.get("constraints"), priority=1)
+        .add("확정 사실", case_file.get("facts"), priority=1, newest_first=False)
+        .add("라운드 요약", digest_items(digests), priority=2)
+        .add("최근 발언", format_turns(recent), priority=2, max_item_tokens=CONTEXT_TURN_MAX_TOKENS)
+        .add("관련 내용", format_related(related, _case_file_items(case_file, [
+            "decisions_so_far", "decisions", "constraints", "facts", "open_issues", "scope_in", "scope_out",
+            "risks_so_far",
+        ])), priority=2, newest_first=False)
+        .add("미해결", case_file.get("open_issues"), priority=2)
+        .add("포함 범위", case_file.get("scope_in"), priority=2)
+        .add("제외 범위", case_file.get("scope_out"), priority=2)
+        .add("리스크", case_file.get("risks_so_far"), priority=2)
+        .add("목표", case_file.get("goals"), priority=3)
+        .add("가정", case_file.get("assumptions"), priority=3)
+        .add("검증계획", case_file.get("next_experiments"), priority=3)
+        .build()
+    )
+    log_packed("Phase", session_id, phase, packed)
+    case_file_summary = packed.render()
+    
+    # 생성 중 본문은 초안(status=streaming)으로 주기적 저장
+    draft = draft_writer.start(session_id, {
+        "role": agent_name,
+        "round_index": current_round,
+        "phase": phase
+    })
+    
     # 이벤트 발송
     await sse_event_manager.emit(session_id, EventType.SPEAKER_CHANGE, {"active_speaker": agent_name})
     await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_START, {
         "role": agent_name,
         "round_index": current_round,
-        "phase": phase
+        "phase": phase,
+        "message_id": draft.message_id
     })
     
     # 프롬프트 구성 (Steering Block은 BaseAgent 내부에서 처리)
@@ -251,7 +348,8 @@ User note: {steering.get('free_text', '')}
                 steering_block=steering_block
             ):
                 full_response += chunk
-                await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_CHUNK, {"text": chunk})
+                event = await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_CHUNK, {"text": chunk})
+                draft.update(full_response, event.id)
         except Exception as e:
             logger.error(f"Agent execution error: {e}")
             full_response = f"[오류 발생: {str(e)}]"
@@ -272,19 +370,16 @@ User note: {steering.get('free_text', '')}
             break
     
     # 스트리밍 종료
-    await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_END, {
-        "message_id": f"{agent_name}-{session_id}-{phase}"
+    end_event = await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_END, {
+        "message_id": draft.message_id
     })
     
-    # 메시지 저장
-    await db.save_message(session_id, {
-        "role": agent_name,
-        "content_text": full_response,
-        "round_index": current_round,
-        "phase": phase
-    })
+    # 최종 본문 저장 (초안이 없었으면 배칭 insert)
+    await draft.finish(full_response, end_event.id)
     
-    # Agent2 리스크 태그 추출 및 저장
+    # 라운드 요약은 백그라운드로 (다음 phase 진행과 겹침)
+    if DIGEST_ENABLED and not full_response.startswith("[오류 발생"):
+        round_digester.schedule(session_id, current_round, phase, agent_name, full_response)
     
     # Agent2 리스크 태그 추출 및 저장
     if agent_name == "agent2":
@@ -310,23 +405,13 @@ def extract_risk_tags(response: str) -> List[str]:
 
 
 async def update_criticisms(session_id: str, new_tags: List[str]):
-    """CaseFile에 비판 태그 업데이트"""
-    case_file = await db.get_case_file(session_id)
-    if not case_file:
-        return
-    
-    # 세션 누적
-    criticisms_so_far = case_file.get('criticisms_so_far', [])
-    for tag in new_tags:
-        if tag not in criticisms_so_far:
-            criticisms_so_far.append(tag)
-    
-    # 이번 라운드 태그
-    await db.save_case_file(session_id, {
-        **case_file,
-        'criticisms_so_far': criticisms_so_far,
-        'criticisms_last_round': new_tags
-    })
+    """CaseFile에 비판 태그 업데이트 (세션 누적은 append, 이번 라운드 태그는 set)"""
+    await write_batcher.patch_case_file(
+        session_id,
+        CaseFilePatch()
+        .append('criticisms_so_far', new_tags, unique=True)
+        .set('criticisms_last_round', new_tags)
+    )
 
 
 async def execute_round(session_id: str, current_round: int):
@@ -346,7 +431,8 @@ async def execute_round(session_id: str, current_round: int):
     phase = get_round_start_phase(current_round, project_type)
     if not phase:
         logger.error(f"Invalid round: {current_round} for project_type: {project_type}")
-        await db.update_session(session_id, {"phase": Phase.FINALIZE_DONE.value, "status": "finalized"})
+        await write_batcher.update_session(session_id, {"phase": Phase.FINALIZE_DONE.value, "status": "finalized"})
+        await write_batcher.flush(session_id)
         await sse_event_manager.emit(session_id, EventType.SESSION_END, {})
         return
     
@@ -354,8 +440,8 @@ async def execute_round(session_id: str, current_round: int):
     
     # Phase 순차 실행
     while not is_wait_user_phase(phase) and not is_final_phase(phase) and phase not in [Phase.USER_GATE.value, Phase.END_GATE.value]:
-        # 세션 상태 업데이트
-        await db.update_session(session_id, {
+        # 세션 상태 업데이트 (연속된 phase 갱신은 배처에서 병합)
+        await write_batcher.update_session(session_id, {
             "phase": phase,
             "round_index": current_round
         })
@@ -384,11 +470,13 @@ async def execute_round(session_id: str, current_round: int):
     
     # 라운드 종료 (USER_GATE, END_GATE, WAIT_USER, FINALIZE_DONE)
     logger.info(f"[ExecuteRound] Round {current_round} completed. Final phase: {phase}. Updating session.")
-    await db.update_session(session_id, {"phase": phase})
+    await write_batcher.update_session(session_id, {"phase": phase})
+    # 남은 라운드 요약 반영 (게이트의 결정사항/미해결, 리포트 갱신 입력)
+    await round_digester.drain(session_id)
     
     if is_final_phase(phase):
-        # 최종 리포트 저장
-        messages = await db.get_messages(session_id)
+        # 최종 리포트 저장 (마지막 메시지만 조회)
+        messages = await write_batcher.get_recent_messages(session_id, 1, ("content_text",))
         last_message = messages[-1] if messages else None
         if last_message:
             await db.save_final_report(
@@ -397,14 +485,16 @@ async def execute_round(session_id: str, current_round: int):
                 last_message.get("content_text", "")
             )
         
-        await db.update_session(session_id, {"status": "finalized"})
+        await write_batcher.update_session(session_id, {"status": "finalized"})
+        await write_batcher.flush(session_id)
         await sse_event_manager.emit(session_id, EventType.SESSION_END, {})
         
     elif phase in [Phase.USER_GATE.value, Phase.END_GATE.value]:
         # USER_GATE / END_GATE 도달 -> 사용자 개입 대기 (자동 진행 중단)
         logger.info(f"[ExecuteRound] Reached gate: {phase}. Waiting for user intervention.")
         
-        # 게이트 렌더링용 데이터 수집
+        # 게이트 렌더링용 데이터 수집 (ROUND_END 전에 모든 쓰기 반영)
+        await write_batcher.flush(session_id)
         case_file = await db.get_case_file(session_id)
         decisions = case_file.get("decisions", [])
         open_issues = case_file.get("open_issues", [])
@@ -430,9 +520,13 @@ async def execute_round(session_id: str, current_round: int):
             "timestamp": datetime.utcnow().isoformat()
         }
         await sse_event_manager.emit(session_id, EventType.ROUND_END, payload)
+        if phase == Phase.END_GATE.value:
+            # 마지막 라운드: finalize를 기다리는 동안 리포트를 미리 생성 (바뀐 섹션만)
+            report_jobs.schedule_refresh(session_id, project_type)
         
     else:
         # WAIT_USER (기존 로직 유지 - 하지만 v2.2에서는 USER_GATE를 주로 사용)
+        await write_batcher.flush(session_id)
         await sse_event_manager.emit(session_id, EventType.ROUND_END, {"round_index": current_round})
 
 
@@ -604,15 +698,16 @@ async def start_round(session_id: str):
     
     if current_round > MAX_ROUNDS:
         # 라운드 제한 도달
-        await db.update_session(session_id, {
+        await write_batcher.update_session(session_id, {
             "phase": Phase.FINALIZE_DONE.value,
             "status": "finalized"
         })
+        await write_batcher.flush(session_id)
         await sse_event_manager.emit(session_id, EventType.SESSION_END, {})
         return
     
     # 라운드 증가
-    await db.update_session(session_id, {
+    await write_batcher.update_session(session_id, {
         "round_index": current_round,
         "status": "active"
     })
@@ -645,12 +740,14 @@ async def send_message_endpoint(session_id: str, request: UserMessageRequest, ba
             )
         
         # 사용자 메시지 저장
-        await db.save_message(session_id, {
+        message = await db.save_message(session_id, {
             "role": "user",
             "content_text": request.message,
             "round_index": session.get("round_index"),
             "phase": "user_input"
         })
+        if message:
+            await sse_event_manager.emit(session_id, EventType.MESSAGE_CREATED, {"message": message})
         
         # 다음 라운드 시작
         background_tasks.add_task(start_round, session_id)
@@ -722,9 +819,9 @@ async def steering_endpoint(session_id: str, request: SteeringRequest, backgroun
         elif action == "input":
             # Steering 데이터 저장
             if request.steering:
-                await db.save_case_file(session_id, {
-                    "steering": request.steering
-                })
+                await db.patch_case_file(
+                    session_id, CaseFilePatch().set("steering", request.steering)
+                )
                 logger.info(f"[Steering] Saved steering data: {request.steering}")
         
         # skip 또는 input 처리 후 다음 라운드 진행
@@ -749,7 +846,7 @@ async def steering_endpoint(session_id: str, request: SteeringRequest, backgroun
 async def get_session_endpoint(session_id: str):
     """세션 상태 조회"""
     try:
-        session = await db.get_session(session_id)
+        session = await write_batcher.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
         
@@ -771,15 +868,40 @@ async def get_session_endpoint(session_id: str):
 
 
 @router.get("/sessions", response_model=List[SessionResponse])
-async def list_sessions_endpoint(user_id: Optional[str] = Query(None)):
-    """세션 목록 조회 (user_id 필수 - 없으면 빈 배열 반환)"""
+async def list_sessions_endpoint(
+    response: Response,
+    user_id: Optional[str] = Query(None),
+    limit: int = Query(SESSION_LIST_DEFAULT_LIMIT, ge=1, le=SESSION_LIST_MAX_LIMIT),
+    cursor: Optional[str] = Query(None),
+    status: Optional[str] = Query(None),
+    project_type: Optional[str] = Query(None)
+):
+    """
+    세션 목록 조회 (user_id 필수 - 없으면 빈 배열 반환)
+    
+    최신순 keyset 페이지네이션: 다음 페이지가 있으면 X-Next-Cursor 헤더로
+    커서를 내려주고, 클라이언트는 이를 cursor 파라미터로 다시 전달합니다.
+    """
     try:
         # user_id가 없으면 빈 배열 반환 (보안상 모든 세션을 보여주지 않음)
         if not user_id:
             logger.warning("[ListSessions] user_id not provided, returning empty list")
             return []
         
-        sessions = await db.list_sessions(user_id)
+        try:
+            sessions = await db.list_sessions(
+                user_id,
+                limit=limit,
+                cursor=cursor,
+                status=status,
+                project_type=project_type
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        if len(sessions) == limit:
+            response.headers["X-Next-Cursor"] = session_cursor(sessions[-1])
+        
         return [
             SessionResponse(
                 id=s["id"],
@@ -793,16 +915,141 @@ async def list_sessions_endpoint(user_id: Optional[str] = Query(None)):
                 created_at=s.get("created_at")
             ) for s in sessions
         ]
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"[ListSessions] 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/archive/run")
+async def run_archive_endpoint(
+    older_than_days: int = Query(ARCHIVE_AFTER_DAYS, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """종료 후 older_than_days가 지난 세션의 대화 기록을 아카이브로 이동"""
+    try:
+        result = await archive_finished_sessions(db, transcript_archive, older_than_days, limit)
+        return {"run": result, "totals": transcript_archive.stats()}
+    except Exception as e:
+        logger.error(f"[Archive] 오류 발생: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/archive/stats")
+async def archive_stats_endpoint():
+    """아카이브 통계 (아카이브 세션/메시지 수, 회수한 공간)"""
+    return transcript_archive.stats()
+
+
+@router.post("/lifecycle/sweep")
+async def lifecycle_sweep_endpoint():
+    """유휴/종료 세션의 프로세스 내 상태 즉시 정리"""
+    try:
+        evicted = await session_lifecycle.sweep()
+        return {"evicted": evicted, "gauges": session_lifecycle.gauges()}
+    except Exception as e:
+        logger.error(f"[Lifecycle] 오류 발생: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/lifecycle/stats")
+async def lifecycle_stats_endpoint():
+    """이 워커가 추적 중인 세션 수와 세션별 상태의 추정 메모리"""
+    return session_lifecycle.gauges()
+
+
+@router.get("/search")
+async def search_endpoint(
+    q: str = Query(..., min_length=1),
+    user_id: Optional[str] = None,
+    type: Optional[str] = Query(None, pattern="^(topic|message|report)$"),
+    limit: int = Query(20, ge=1, le=SEARCH_MAX_LIMIT),
+    offset: int = Query(0, ge=0)
+):
+    """
+    세션 주제/메시지/최종 리포트 전문 검색 (관련도순, user_id 필수 - 없으면 빈 결과 반환)
+
+    다음 페이지가 있으면 next_offset을 함께 반환합니다.
+    """
+    try:
+        # user_id가 없으면 빈 결과 반환 (보안상 다른 사용자의 세션을 검색하지 않음)
+        if not user_id:
+            logger.warning("[Search] user_id not provided, returning empty results")
+            return {"results": [], "next_offset": None}
+
+        results = await asyncio.to_thread(
+            get_search_index().search, q, user_id, type, limit + 1, offset
+        )
+        next_offset = offset + limit if len(results) > limit else None
+        return {"results": results[:limit], "next_offset": next_offset}
+    except Exception as e:
+        logger.error(f"[Search] 오류 발생: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/search/reindex")
+async def search_reindex_endpoint():
+    """기존 세션/메시지/리포트 전체 재색인"""
+    try:
+        counts = await get_search_index().backfill(db)
+        return {"indexed": counts}
+    except Exception as e:
+        logger.error(f"[Search] 재색인 오류: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _resume_event_id(request: Request, query_value: Optional[int]) -> Optional[int]:
+    """Last-Event-ID 헤더와 쿼리 중 더 최신 값 (둘 다 없으면 None)"""
+    header = request.headers.get("last-event-id")
+    if not header:
+        return query_value
+    try:
+        return max(int(header), query_value or 0)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid Last-Event-ID: {header}")
+
+
 @router.get("/sessions/{session_id}/events")
-async def session_events_endpoint(session_id: str):
-    """SSE 이벤트 스트림"""
+async def session_events_endpoint(
+    session_id: str,
+    request: Request,
+    lastEventId: Optional[int] = Query(None, ge=0)
+):
+    """
+    SSE 이벤트 스트림
+
+    재연결 시 Last-Event-ID 헤더(EventSource 자동 재연결) 또는 lastEventId 쿼리
+    (클라이언트가 직접 재연결하는 경우) 이후의 이벤트를 먼저 재전송합니다.
+    """
+    return StreamingResponse(
+        sse_event_manager.stream_events(session_id, _resume_event_id(request, lastEventId)),
+        media_type="text/event-stream"
+    )
+
+
+@router.get("/sessions/{session_id}/feed")
+async def session_feed_endpoint(
+    session_id: str,
+    request: Request,
+    cursor: Optional[int] = Query(None, ge=0),
+    messages: int = Query(FEED_MESSAGE_LIMIT, ge=0, le=200)
+):
+    """
+    세션 피드 (스냅샷 + 실시간 델타)
+
+    첫 프레임은 세션/CaseFile 요약/최근 메시지/생성 중인 초안을 담은 snapshot(id=cursor)이고,
+    이후 cursor 다음 이벤트부터 이어집니다. 재연결 시 Last-Event-ID 헤더 또는 cursor 쿼리가
+    있으면 스냅샷 없이 그 이후 이벤트만 보냅니다.
+    """
+    resume_from = _resume_event_id(request, cursor)
+    if resume_from is None:
+        session = await write_batcher.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+
     return StreamingResponse(
-        sse_event_manager.stream_events(session_id),
+        stream_feed(session_id, resume_from, messages),
         media_type="text/event-stream"
     )
 
@@ -811,6 +1058,8 @@ async def session_events_endpoint(session_id: str):
 async def finalize_session_endpoint(session_id: str):
     """세션 마무리 - 즉시 종료하고 리포트 생성"""
     try:
+        # 진행 중 라운드의 미반영 쓰기를 먼저 반영
+        await write_batcher.flush(session_id)
         session = await db.get_session(session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
@@ -821,67 +1070,14 @@ async def finalize_session_endpoint(session_id: str):
             "status": "finalized"
         })
         
-        # 리포트 자동 생성 시도
-        messages = await db.get_messages(session_id)
-        if messages:
-            project_type = session.get("project_type", "general")
-            
-            conversation_text = ""
-            for msg in messages:
-                role = msg.get("role", "unknown")
-                content = msg.get("content_text", "")
-                conversation_text += f"{role}: {content}\n\n"
-            
-            # 프로젝트 타입별 분량 및 양식 설정
-            if project_type == "legal":
-                char_limit = "4000자"
-                format_guide = """[작성 양식 - 법률 분석 리포트]
-    1. **사안 요약**: 사건 개요 및 핵심 쟁점 정리
-    2. **법적 분석**: 관련 법령 및 판례 적용 분석
-    3. **원고측 주장 정리**: 원고측의 핵심 주장 및 근거
-    4. **피고측 주장 정리**: 피고측의 핵심 주장 및 근거
-    5. **승소 가능성 평가**: 각 쟁점별 승패 예측
-    6. **리스크 분석**: 잠재적 리스크 및 대응 전략
-    7. **권고안**: 실행 가능한 전략적 권고사항
-    8. **향후 절차**: 다음 진행 단계 및 일정"""
-            elif project_type == "dev_project":
-                char_limit = "4000자"
-                format_guide = """[작성 양식 - 개발 프로젝트 리포트]
-    1. **프로젝트 개요**: 목표 및 범위 요약
-    2. **핵심 결정사항**: 채택된 기술 스택, 아키텍처, 주요 결정
-    3. **범위 정의**: 포함 범위(In-Scope) 및 제외 범위(Out-Scope)
-    4. **기능 명세**: 주요 기능 및 사용자 스토리
-    5. **기술 구현 가이드**: 구체적인 기술 구현 방향
-    6. **UX/UI 가이드**: 디자인 방향 및 사용자 경험 고려사항
-    7. **일정 및 마일스톤**: 주차별 로드맵 (최소 4주)
-    8. **리스크 및 대응**: 예상 리스크 및 완화 전략
-    9. **성공 지표(KPI)**: 측정 가능한 성공 기준"""
-            else:
-                char_limit = "2000자"
-                format_guide = """[작성 양식]
-    1. **종합 결론**: 토론의 핵심 결과 요약
-    2. **실행 방안**: 구체적인 실행 단계 및 계획
-    3. **구현 방향**: 기술적/실무적 구현 가이드"""
-            
-            prompt = f"""
-            다음은 AI 에이전트들이 나눈 토론 내용입니다.
-            이 내용을 바탕으로 최종 결론 보고서를 작성해주세요.
-            
-            [토론 내용]
-            {conversation_text}
-            
-            {format_guide}
-            
-            분량은 공백 포함 {char_limit} 정도로 구체적이고 상세하게 서술해주세요.
-            각 섹션에 충분한 내용을 담아 실질적으로 활용 가능한 보고서를 작성해주세요.
-            """
-            
-            try:
-                report_content = await gemini_client.generate_text(prompt)
-                report_json = {"content": report_content}
-                await db.save_final_report(session_id, report_json, report_content)
-            except Exception as e:
-                logger.error(f"Failed to generate report on finalize: {e}")
+        # 리포트 자동 생성 시도 (입력이 그대로인 리포트는 재사용, 양식만 바뀌었으면 백그라운드 재생성)
+        try:
+            state, _, job = await report_jobs.ensure(session_id, session.get("project_type", "general"))
+            if state in ("miss", "running"):
+                # 요청이 끊겨도 작업은 계속 (실패는 작업이 로깅하고 이전 리포트로 되돌림)
+                await asyncio.shield(job.task)
+        except Exception as e:
+            logger.error(f"Failed to generate report on finalize: {e}")
         
         # SSE 이벤트 발송
         await sse_event_manager.emit(session_id, EventType.SESSION_END, {})
@@ -900,94 +1096,106 @@ class FinalReportResponse(BaseModel):
     report_md: Optional[str] = None
 
 
+class ReportJobResponse(BaseModel):
+    job_id: str
+    status: str  # running | complete | stale | failed (complete/stale이면 content가 저장된 리포트 전체)
+    event_id: int = 0  # 응답 시점 마지막 이벤트 id (이 id 이후로 구독하면 REPORT_CHUNK를 놓치지 않음)
+    content: str = ""  # 이미 실행 중인 작업이면 지금까지의 본문
+    chunks: int = 0  # content에 포함된 chunk 수 (seq가 이보다 작은 REPORT_CHUNK는 이미 반영됨)
+
+
 @router.get("/sessions/{session_id}/report", response_model=FinalReportResponse)
 async def get_final_report(session_id: str):
-    """최종 리포트 조회"""
+    """최종 리포트 조회 (생성 중이면 지금까지의 본문, report_json.status='streaming')"""
     report = await db.get_final_report(session_id)
-    if not report:
+    if not report or (report.get("report_json") or {}).get("status") == "failed":
         raise HTTPException(status_code=404, detail="Report not found")
     return report
 
 
-@router.post("/sessions/{session_id}/report/generate", response_model=FinalReportResponse)
+@router.post("/sessions/{session_id}/report/generate", response_model=ReportJobResponse, status_code=202)
 async def generate_report(session_id: str):
-    """최종 리포트 생성 (On-Demand)"""
-    # 세션 및 메시지 조회
-    session = await db.get_session(session_id)
+    """
+    최종 리포트 생성 (On-Demand, 스트리밍 작업)
+
+    작업 id를 바로 반환하고, 본문은 세션 이벤트 스트림의 REPORT_CHUNK로 전송합니다.
+    완료/실패는 REPORT_END 또는 GET /report/jobs/{job_id}로 확인합니다.
+    메시지가 그대로면 저장된 리포트를 status=complete로 바로 반환하고,
+    양식만 바뀌었으면 저장된 리포트를 status=stale로 반환하며 백그라운드에서 재생성합니다.
+    """
+    session = await write_batcher.get_session(session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    messages = await db.get_messages(session_id)
-    if not messages:
+
+    state, report, job = await report_jobs.ensure(session_id, session.get("project_type", "general"))
+    if state == "empty":
         raise HTTPException(status_code=400, detail="No messages to summarize")
+    if state in ("fresh", "stale"):
+        report_json = report["report_json"]
+        return ReportJobResponse(
+            job_id=job.id if job else report_json.get("job_id", ""),
+            status="complete" if state == "fresh" else "stale",
+            event_id=sse_event_manager.latest_event_id(session_id) or 0,
+            content=report_json.get("content") or report.get("report_md") or "",
+        )
 
-    project_type = session.get("project_type", "general")
-    
-    # 프롬프트 구성
-    conversation_text = ""
-    for msg in messages:
-        role = msg.get("role", "unknown")
-        content = msg.get("content_text", "")
-        conversation_text += f"{role}: {content}\n\n"
-
-    # 프로젝트 타입별 분량 및 양식 설정
-    if project_type == "legal":
-        char_limit = "4000자"
-        format_guide = """
-    [작성 양식 - 법률 분석 리포트]
-    1. **사안 요약**: 사건 개요 및 핵심 쟁점 정리
-    2. **법적 분석**: 관련 법령 및 판례 적용 분석
-    3. **원고측 주장 정리**: 원고측의 핵심 주장 및 근거
-    4. **피고측 주장 정리**: 피고측의 핵심 주장 및 근거
-    5. **승소 가능성 평가**: 각 쟁점별 승패 예측
-    6. **리스크 분석**: 잠재적 리스크 및 대응 전략
-    7. **권고안**: 실행 가능한 전략적 권고사항
-    8. **향후 절차**: 다음 진행 단계 및 일정"""
-    elif project_type == "dev_project":
-        char_limit = "4000자"
-        format_guide = """
-    [작성 양식 - 개발 프로젝트 리포트]
-    1. **프로젝트 개요**: 목표 및 범위 요약
-    2. **핵심 결정사항**: 채택된 기술 스택, 아키텍처, 주요 결정
-    3. **범위 정의**: 포함 범위(In-Scope) 및 제외 범위(Out-Scope)
-    4. **기능 명세**: 주요 기능 및 사용자 스토리
-    5. **기술 구현 가이드**: 구체적인 기술 구현 방향
-    6. **UX/UI 가이드**: 디자인 방향 및 사용자 경험 고려사항
-    7. **일정 및 마일스톤**: 주차별 로드맵 (최소 4주)
-    8. **리스크 및 대응**: 예상 리스크 및 완화 전략
-    9. **성공 지표(KPI)**: 측정 가능한 성공 기준"""
-    else:
-        char_limit = "2000자"
-        format_guide = """
-    [작성 양식]
-    1. **종합 결론**: 토론의 핵심 결과 요약
-    2. **실행 방안**: 구체적인 실행 단계 및 계획
-    3. **구현 방향**: 기술적/실무적 구현 가이드"""
-
-    prompt = f"""
-    다음은 AI 에이전트들이 나눈 토론 내용입니다.
-    이 내용을 바탕으로 최종 결론 보고서를 작성해주세요.
-    
-    [토론 내용]
-    {conversation_text}
-    {format_guide}
-    
-    분량은 공백 포함 {char_limit} 정도로 구체적이고 상세하게 서술해주세요.
-    각 섹션에 충분한 내용을 담아 실질적으로 활용 가능한 보고서를 작성해주세요.
-    """
+    # start() 이후 await가 없어 event_id와 본문이 같은 시점 (겹치는 chunk는 클라이언트가 seq로 제거)
+    event_id = sse_event_manager.latest_event_id(session_id) or 0
+    return ReportJobResponse(
+        job_id=job.id, status=job.status, event_id=event_id, content=job.content, chunks=job.chunks
+    )
 
-    # Gemini 호출
-    try:
-        report_content = await gemini_client.generate_text(prompt)
-    except Exception as e:
-        logger.error(f"Failed to generate report: {e}")
-        raise HTTPException(status_code=500, detail=f"Report generation failed: {str(e)}")
 
-    # 저장
-    report_json = {"content": report_content}
-    await db.save_final_report(session_id, report_json, report_content)
-    
-    return {"report_json": report_json, "report_md": report_content}
+@router.get("/sessions/{session_id}/report/jobs/{job_id}")
+async def report_job_endpoint(session_id: str, job_id: str):
+    """리포트 생성 작업 상태"""
+    job = await report_jobs.get(session_id, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    return job
+
+
+class ExportRequest(BaseModel):
+    """세션 일괄 내보내기 요청"""
+    session_ids: List[str]
+    format: str = "zip"  # "zip" | "ndjson"
+    include: List[str] = list(EXPORT_PARTS)  # report | messages | case_file
+    render: List[str] = []  # 리포트 렌더링 형식: "html" | "pdf" (pdf는 zip만)
+
+
+@router.post("/export")
+async def export_sessions(request: ExportRequest):
+    """
+    세션 일괄 내보내기 (리포트 + 대화 기록 + CaseFile)
+
+    선택한 세션들을 zip 또는 NDJSON으로 스트리밍합니다.
+    대화 기록은 페이지 단위로 읽어 바로 내보내므로 세션 수/길이와 무관하게 메모리 사용량이 일정합니다.
+    """
+    session_ids = list(dict.fromkeys(request.session_ids))
+    if not session_ids:
+        raise HTTPException(status_code=400, detail="No sessions selected")
+    if len(session_ids) > EXPORT_MAX_SESSIONS:
+        raise HTTPException(status_code=400, detail=f"Too many sessions (max {EXPORT_MAX_SESSIONS})")
+    if request.format not in ("zip", "ndjson"):
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {request.format}")
+    unknown = set(request.include) - set(EXPORT_PARTS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown export parts: {', '.join(sorted(unknown))}")
+    render = list(dict.fromkeys(request.render))
+    unavailable = set(render) - set(available_formats())
+    if unavailable:
+        raise HTTPException(status_code=400, detail=f"Unavailable render formats: {', '.join(sorted(unavailable))}")
+    if render and "report" not in request.include:
+        raise HTTPException(status_code=400, detail="Rendering requires the report part")
+    if "pdf" in render and request.format != "zip":
+        raise HTTPException(status_code=400, detail="PDF rendering is only available in zip exports")
+
+    filename = f"sessions-export-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{request.format}"
+    return StreamingResponse(
+        session_exporter.stream(session_ids, request.format, request.include, render),
+        media_type="application/zip" if request.format == "zip" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # ==========================================
@@ -1086,16 +1294,13 @@ async def submit_facts_endpoint(
             missing = []
         
         # CaseFile 업데이트
-        case_file = await db.get_case_file(session_id)
-        case_file_update = {
-            **case_file,
+        await db.patch_case_file(session_id, CaseFilePatch.from_fields({
             "case_overview": request.case_overview,
             "parties": request.parties,
             "confirmed_facts": confirmed,
             "disputed_facts": disputed,
             "missing_facts_questions": missing,
-        }
-        await db.save_case_file(session_id, case_file_update)
+        }))
         
         # 다음 phase 결정
         facts_gate_required = len(missing) >= 3
@@ -1190,11 +1395,7 @@ async def legal_steering_endpoint(
             "report_style": request.report_style,
         }
         
-        case_file = await db.get_case_file(session_id)
-        await db.save_case_file(session_id, {
-            **case_file,
-            "legal_steering": steering_data
-        })
+        await db.patch_case_file(session_id, CaseFilePatch().set("legal_steering", steering_data))
         
         logger.info(f"[LegalSteering] Saved steering for session {session_id}: {steering_data}")
         
@@ -1241,7 +1442,7 @@ async def execute_legal_round(session_id: str, round_number: int):
     # Phase 순차 실행
     while phase and phase not in [Phase.USER_GATE.value, Phase.END_GATE.value, Phase.FINALIZE_DONE.value]:
         # 세션 상태 업데이트
-        await db.update_session(session_id, {
+        await write_batcher.update_session(session_id, {
             "phase": phase,
             "round_index": round_number
         })
@@ -1260,9 +1461,11 @@ async def execute_legal_round(session_id: str, round_number: int):
     
     # 최종 상태(USER_GATE/END_GATE) 업데이트
     if phase:
-        await db.update_session(session_id, {"phase": phase})
+        await write_batcher.update_session(session_id, {"phase": phase})
     
-    # ROUND_END 이벤트 발송
+    # ROUND_END 이벤트 발송 (발송 전 남은 라운드 요약과 모든 쓰기 반영)
+    await round_digester.drain(session_id)
+    await write_batcher.flush(session_id)
     case_file = await db.get_case_file(session_id)
     await sse_event_manager.emit(session_id, EventType.ROUND_END, {
         "round_index": round_number,
@@ -1270,34 +1473,25 @@ async def execute_legal_round(session_id: str, round_number: int):
         "gate_status": gate_status or "Go",
         "open_issues": case_file.get("disputed_facts", [])[:3]
     })
+    if phase == Phase.END_GATE.value:
+        # 마지막 라운드: finalize를 기다리는 동안 리포트를 미리 생성 (바뀐 섹션만)
+        report_jobs.schedule_refresh(session_id, session.get("project_type", "legal"))
 
 
 async def execute_legal_phase(session_id: str, phase: str, agent_name: str, round_number: int) -> str:
     """법무 시뮬레이션 단일 Phase 실행"""
-    session = await db.get_session(session_id)
-    case_file = await db.get_case_file(session_id)
+    session = await write_batcher.get_session(session_id)
+    case_file = await write_batcher.get_case_file(session_id)
     
     case_type = session.get("case_type", "civil")
     confirmed_facts = "\n".join(case_file.get("confirmed_facts", []))
     
-    # 이전 메시지 요약
-    messages = await db.get_messages(session_id)
-    case_summary = ""
-    if messages:
-        recent = messages[-5:]
-        case_summary = "\n".join([f"{m.get('role')}: {m.get('content_text', '')[:200]}" for m in recent])
-    
     # 에이전트 가져오기
     agent = legal_agents.get(agent_name)
     if not agent:
         logger.error(f"[LegalPhase] Agent not found: {agent_name}")
         return ""
     
-    # 컨텍스트 설정
-    agent.set_round(round_number)
-    if hasattr(agent, 'set_case_context'):
-        agent.set_case_context(case_type, confirmed_facts, case_summary)
-    
     # Steering Block 구성
     steering = case_file.get("legal_steering") or {}
     steering_block = LEGAL_STEERING_BLOCK.replace("{{focus_issue}}", steering.get("focus_issue", "미설정"))
@@ -1307,12 +1501,46 @@ async def execute_legal_phase(session_id: str, phase: str, agent_name: str, roun
     steering_block = steering_block.replace("{{exclusions}}", ", ".join(steering.get("exclusions", [])) or "없음")
     steering_block = steering_block.replace("{{notes}}", steering.get("notes", ""))
     
+    # 확정 사실 + 쟁점 + 직전/관련 발언을 phase 예산 안에서 우선순위대로 (조회 비용은 대화 길이와 무관)
+    digests = case_file.get("round_digests") if DIGEST_ENABLED else None
+    topic = (session.get("topic") if session else None) or ""
+    recent, related = await gather_turns(session_id, [
+        topic, steering.get("focus_issue") or "",
+    ], DIGEST_RECENT_MESSAGES if digests else None)
+    packed = (
+        ContextBuilder(get_phase_config(phase)["context_tokens"])
+        .reserve("steering", steering_block)
+        .add("확정 사실", case_file.get("confirmed_facts"), priority=1, newest_first=False)
+        .add("쟁점 사실", case_file.get("disputed_facts"), priority=2, newest_first=False)
+        .add("라운드 요약", digest_items(digests), priority=2)
+        .add("최근 발언", format_turns(recent), priority=2, max_item_tokens=CONTEXT_TURN_MAX_TOKENS)
+        .add("관련 내용", format_related(related, _case_file_items(case_file, [
+            "confirmed_facts", "disputed_facts", "missing_facts_questions",
+        ])), priority=2, newest_first=False)
+        .add("누락 사실 질문", case_file.get("missing_facts_questions"), priority=3, newest_first=False)
+        .build()
+    )
+    log_packed("LegalPhase", session_id, phase, packed)
+    case_summary = packed.render(exclude=("확정 사실",))
+    
+    # 컨텍스트 설정
+    agent.set_round(round_number)
+    if hasattr(agent, 'set_case_context'):
+        agent.set_case_context(case_type, "\n".join(packed.items("확정 사실")), case_summary)
+    
+    draft = draft_writer.start(session_id, {
+        "role": agent_name,
+        "round_index": round_number,
+        "phase": phase
+    })
+    
     # SSE 이벤트
     await sse_event_manager.emit(session_id, EventType.SPEAKER_CHANGE, {"active_speaker": agent_name})
     await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_START, {
         "role": agent_name,
         "round_index": round_number,
-        "phase": phase
+        "phase": phase,
+        "message_id": draft.message_id
     })
     
     # 스트리밍 실행
@@ -1326,7 +1554,8 @@ async def execute_legal_phase(session_id: str, phase: str, agent_name: str, roun
             steering_block=steering_block
         ):
             full_response += chunk
-            await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_CHUNK, {"text": chunk})
+            event = await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_CHUNK, {"text": chunk})
+            draft.update(full_response, event.id)
     except Exception as e:
         logger.error(f"[LegalPhase] Agent error: {e}")
         full_response = f"[오류 발생: {str(e)}]"
@@ -1341,16 +1570,14 @@ async def execute_legal_phase(session_id: str, phase: str, agent_name: str, roun
         })
     
     # 메시지 저장
-    await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_END, {
-        "message_id": f"{agent_name}-{session_id}-{phase}"
+    end_event = await sse_event_manager.emit(session_id, EventType.MESSAGE_STREAM_END, {
+        "message_id": draft.message_id
     })
     
-    await db.save_message(session_id, {
-        "role": agent_name,
-        "content_text": full_response,
-        "round_index": round_number,
-        "phase": phase
-    })
+    await draft.finish(full_response, end_event.id)
+    
+    if DIGEST_ENABLED and not full_response.startswith("[오류 발생"):
+        round_digester.schedule(session_id, round_number, phase, agent_name, full_response)
     
     return full_response
 
@@ -1379,3 +1606,129 @@ def check_legal_guardrails(response: str, confirmed_facts: str) -> Optional[str]
     
     return None
 
+
+# ==========================================
+# 세션 WebSocket (SSE 피드 + 액션 POST 대체)
+# ==========================================
+
+# op → (요청 모델, 처리 함수). 처리는 HTTP 엔드포인트와 같은 함수를 그대로 사용
+WS_ACTIONS = {
+    "message": (UserMessageRequest, send_message_endpoint),
+    "steering": (SteeringRequest, steering_endpoint),
+    "legal_steering": (LegalSteeringRequest, legal_steering_endpoint),
+    "facts": (FactsSubmitRequest, submit_facts_endpoint),
+}
+
+# 진행 중인 액션과 액션이 예약한 백그라운드 작업 (완료 전 GC 방지)
+_ws_background_tasks: set = set()
+
+
+async def _run_background(session_id: str, tasks: BackgroundTasks):
+    try:
+        await tasks()
+    except Exception as e:
+        logger.error(f"[WebSocket] Background task failed for {session_id}: {e}", exc_info=True)
+
+
+async def _handle_ws_action(session_id: str, codec: FrameCodec, frame: dict) -> bytes:
+    """액션 프레임 처리 → ack/error 제어 프레임"""
+    op, ref = frame["op"], frame.get("ref")
+    action = WS_ACTIONS.get(op)
+    if action is None:
+        return codec.control("error", ref=ref, status=400, detail=f"Unknown op: {op}")
+    model, handler = action
+
+    try:
+        request = model(**(frame.get("body") or {}))
+    except (ValidationError, TypeError) as e:
+        return codec.control("error", ref=ref, status=422, detail=str(e))
+
+    background_tasks = BackgroundTasks()
+    try:
+        result = await handler(session_id, request, background_tasks)
+    except HTTPException as e:
+        return codec.control("error", ref=ref, status=e.status_code, detail=e.detail)
+    except Exception as e:
+        logger.error(f"[WebSocket] {op} failed for {session_id}: {e}", exc_info=True)
+        return codec.control("error", ref=ref, status=500, detail=str(e))
+
+    # HTTP와 마찬가지로 응답 후 실행 (라운드 진행 등)
+    if background_tasks.tasks:
+        task = asyncio.create_task(_run_background(session_id, background_tasks))
+        _ws_background_tasks.add(task)
+        task.add_done_callback(_ws_background_tasks.discard)
+
+    if isinstance(result, BaseModel):
+        result = result.model_dump()
+    return codec.control("ack", ref=ref, result=result)
+
+
+@router.websocket("/sessions/{session_id}/ws")
+async def session_websocket_endpoint(
+    websocket: WebSocket,
+    session_id: str,
+    cursor: Optional[int] = Query(None, ge=0),
+    messages: int = Query(FEED_MESSAGE_LIMIT, ge=0, le=200)
+):
+    """
+    세션 WebSocket
+
+    세션 피드(snapshot + 실시간 이벤트)를 내려보내면서 같은 연결로 사용자 액션
+    (message / steering / legal_steering / facts)을 받습니다. 프레임 형식은 api/ws_codec.py 참고.
+    재연결 시 마지막으로 받은 이벤트 id를 cursor 쿼리로 주면 스냅샷 없이 그 이후 이벤트만 보냅니다.
+    """
+    codec, subprotocol = FrameCodec.negotiate(websocket.scope.get("subprotocols", []))
+    await websocket.accept(subprotocol=subprotocol)
+    if cursor is None and not await write_batcher.get_session(session_id):
+        # accept 후 close해야 클라이언트가 close code 4404(세션 없음)를 받음
+        # (accept 전 close는 핸드셰이크 거절 = HTTP 403이라 이유를 구분할 수 없음)
+        await websocket.close(code=4404)
+        return
+    send_lock = asyncio.Lock()
+
+    async def send(frame: bytes):
+        async with send_lock:
+            await websocket.send_bytes(frame)
+
+    async def run_action(frame: dict):
+        # 액션은 태스크로 실행하고 끝나면 ack (finalize 등 긴 액션이 수신 루프를 막지 않도록)
+        reply = await _handle_ws_action(session_id, codec, frame)
+        try:
+            await send(reply)
+        except Exception as e:
+            logger.info(f"[WebSocket] Dropped {frame['op']} reply for {session_id}: {e}")
+
+    async def pump_events():
+        async with aclosing(feed_items(session_id, cursor, messages)) as items:
+            async for item in items:
+                if item is None:
+                    continue  # 유휴 연결 유지는 WebSocket ping이 담당
+                await send(codec.event(item) if isinstance(item, WireEvent) else codec.aux(*item))
+
+    await send(codec.hello(session_id))
+    pump = asyncio.create_task(pump_events())
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            raw = message["text"] if message.get("text") is not None else message.get("bytes")
+            try:
+                frame = codec.decode(raw)
+            except FrameDecodeError as e:
+                await send(codec.control("error", ref=None, status=400, detail=str(e)))
+                continue
+            # 연결이 끊겨도 진행 중인 액션은 HTTP 요청처럼 끝까지 실행
+            task = asyncio.create_task(run_action(frame))
+            _ws_background_tasks.add(task)
+            task.add_done_callback(_ws_background_tasks.discard)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        pump.cancel()
+        try:
+            await pump
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.warning(f"[WebSocket] Event pump for {session_id} ended: {e}")
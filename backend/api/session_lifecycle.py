@@ -0,0 +1,310 @@
+"""
+세션 수명 관리 (유휴 세션 hibernate + 프로세스 내 상태 정리)
+
+세션마다 생기는 프로세스 내 상태
+- SSEEventManager: 링 버퍼, 구독자 집합
+- StateMachine: 락, 취소 이벤트, 요청 캐시, 입력 버퍼
+- WriteBatcher: 미반영 쓰기, flush 락/예약
+- register()로 등록한 컴포넌트: 생성 중인 초안(DraftWriter), 요약 작업(RoundDigester),
+  리포트 작업(ReportJobManager), 벡터 색인(VectorIndex), 실행 표시(TurnManager)
+는 세션이 끝나도 지워지지 않아 오래 떠 있는 워커의 메모리가 계속 늘어납니다.
+
+- touch(): 세션 요청마다 마지막 활동 시각 기록 (라우터 의존성에서 호출)
+- sweep(): SESSION_SWEEP_INTERVAL_SECONDS마다 유휴 세션 정리
+  - 마지막 활동(요청 또는 이벤트) 후 SESSION_IDLE_TTL_SECONDS,
+    SESSION_END가 나간 세션은 SESSION_FINALIZED_TTL_SECONDS
+  - 구독자가 붙어 있거나 라운드/flush가 진행 중인 세션은 건너뜀
+- hibernate: 미반영 쓰기를 flush하고, 잃으면 안 되는 상태(StateMachine.export_state)는
+  CaseFile.runtime_state로 옮긴 뒤 메모리에서 제거
+- resume(): 이 프로세스가 모르는 세션에 요청이 오면 runtime_state를 복원하고 비움 (lazy)
+- gauges(): 컴포넌트별 추적 세션 수 / 추정 바이트
+- 시작 시와 정리 주기마다 워커 장애로 중단된 streaming 초안도 정리 (DraftWriter.sweep_orphans)
+"""
+import asyncio
+import logging
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Set
+
+from pydantic import BaseModel
+
+from config import (
+    SESSION_IDLE_TTL_SECONDS, SESSION_FINALIZED_TTL_SECONDS, SESSION_SWEEP_INTERVAL_SECONDS, VECTOR_INDEX_ENABLED,
+)
+from orchestrator.round_digest import round_digester
+from orchestrator.state_machine import StateMachine, state_machine
+from orchestrator.turn_manager import turn_manager
+from storage import get_storage, get_vector_index
+from storage.cache import CachedStorage
+from storage.case_file_patch import CaseFilePatch
+from storage.draft_writer import DraftWriter, draft_writer
+from storage.write_batcher import WriteBatcher, write_batcher
+from .events import EventType, SSEEventManager, sse_event_manager
+from .report_jobs import report_jobs
+
+logger = logging.getLogger(__name__)
+
+
+def _approx_size(obj, seen: Set[int]) -> int:
+    """
+    객체가 차지하는 대략적인 바이트 수
+
+    컨테이너, pydantic 모델, __slots__ 객체, asyncio.Queue 내용까지만 따라가고
+    락/태스크 등 이벤트 루프에 연결된 객체는 자기 크기만 셉니다.
+    """
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, dict):
+        size += sum(_approx_size(k, seen) + _approx_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(_approx_size(item, seen) for item in obj)
+    elif isinstance(obj, BaseModel):
+        size += _approx_size(obj.__dict__, seen)
+    elif isinstance(obj, asyncio.Queue):
+        size += _approx_size(obj._queue, seen)
+    elif hasattr(type(obj), "__slots__") and not isinstance(obj, (str, bytes, int, float)):
+        size += sum(_approx_size(getattr(obj, slot, None), seen) for slot in type(obj).__slots__)
+    return size
+
+
+class SessionLifecycleManager:
+    """
+    유휴 세션의 프로세스 내 상태 정리기
+
+    정리 대상 컴포넌트는 per_session_state()로 세션별 컨테이너를 노출하고
+    forget_session()/cleanup_session()으로 세션 하나를 지울 수 있어야 합니다.
+    register()로 등록하는 컴포넌트는 per_session_state(), is_busy(session_id),
+    forget_session(session_id)를 구현합니다 (is_busy면 그 세션은 정리하지 않음).
+    """
+
+    def __init__(
+        self,
+        events: SSEEventManager,
+        machine: StateMachine,
+        batcher: WriteBatcher,
+        drafts: Optional[DraftWriter] = None,
+        storage=None,
+        idle_ttl: float = SESSION_IDLE_TTL_SECONDS,
+        finalized_ttl: float = SESSION_FINALIZED_TTL_SECONDS,
+        sweep_interval: float = SESSION_SWEEP_INTERVAL_SECONDS,
+    ):
+        self._events = events
+        self._machine = machine
+        self._batcher = batcher
+        self._drafts = drafts
+        self._storage = storage or get_storage()
+        self._idle_ttl = idle_ttl
+        self._finalized_ttl = finalized_ttl
+        self._sweep_interval = sweep_interval
+        self._last_seen: Dict[str, float] = {}
+        # 저장소에 쓰는 중인 hibernate 상태 (그 사이 들어온 요청이 바로 복원)
+        self._hibernating: Dict[str, dict] = {}
+        self._components: Dict[str, Any] = {}
+        self._sweep_task: Optional[asyncio.Task] = None
+        self.evicted = 0
+        self.hibernated = 0
+        self.resumed = 0
+
+    def register(self, name: str, component):
+        """세션별 상태를 가진 컴포넌트 등록 (정리/게이지 대상)"""
+        self._components[name] = component
+
+    # === 활동 기록 / 복원 ===
+
+    def touch(self, session_id: str):
+        """세션 활동 기록"""
+        self._last_seen[session_id] = time.time()
+
+    async def resume(self, session_id: str):
+        """
+        세션 요청 진입점
+
+        이 프로세스가 추적하지 않던 세션이면 hibernate된 상태를 복원합니다.
+        """
+        if session_id in self._last_seen:
+            self.touch(session_id)
+            return
+        self.touch(session_id)
+
+        state = self._hibernating.get(session_id)
+        if state is None:
+            try:
+                case_file = await self._batcher.get_case_file(session_id)
+            except Exception as e:
+                logger.error(f"[Lifecycle] Resume lookup failed for {session_id}: {e}")
+                return
+            state = (case_file or {}).get("runtime_state")
+            if not state:
+                return
+
+        await self._batcher.patch_case_file(session_id, CaseFilePatch().set("runtime_state", None))
+        self._machine.restore_state(session_id, state)
+        self.resumed += 1
+        logger.info(f"[Lifecycle] Resumed {session_id}: {sorted(state)}")
+
+    # === 정리 ===
+
+    def _tracked_sessions(self) -> Set[str]:
+        session_ids = set(self._last_seen)
+        for component in (self._events, self._machine, self._batcher, *self._components.values()):
+            for container in component.per_session_state().values():
+                session_ids.update(container)
+        return session_ids
+
+    def _last_activity(self, session_id: str, now: float) -> float:
+        last = self._last_seen.get(session_id)
+        event = self._events.last_event(session_id)
+        if event is not None:
+            event_time = datetime.fromisoformat(event.timestamp).replace(tzinfo=timezone.utc).timestamp()
+            last = event_time if last is None else max(last, event_time)
+        if last is None:
+            # 요청 없이 생긴 상태 (백그라운드 작업 등): 처음 본 시각부터 계산
+            last = self._last_seen[session_id] = now
+        return last
+
+    def _is_busy(self, session_id: str) -> bool:
+        return (
+            self._events.subscriber_count(session_id) > 0
+            or self._machine.is_busy(session_id)
+            or self._batcher.has_pending(session_id)
+            or any(component.is_busy(session_id) for component in self._components.values())
+        )
+
+    def _is_expired(self, session_id: str, now: float) -> bool:
+        event = self._events.last_event(session_id)
+        finished = event is not None and event.type == EventType.SESSION_END
+        ttl = self._finalized_ttl if finished else self._idle_ttl
+        return now - self._last_activity(session_id, now) >= ttl
+
+    async def hibernate(self, session_id: str) -> bool:
+        """
+        세션 하나를 저장소로 내리고 프로세스 내 상태 제거
+
+        Returns: 제거했으면 True (진행 중인 작업이 있으면 False)
+        """
+        if self._is_busy(session_id):
+            await self._batcher.flush(session_id)
+
+        # 상태 추출과 제거 사이에 await가 없어야 그 사이 변경이 유실되지 않음
+        if self._is_busy(session_id) or not self._batcher.forget_session(session_id):
+            return False
+        state = self._machine.export_state(session_id)
+        self._machine.forget_session(session_id)
+        self._events.cleanup_session(session_id)
+        for component in self._components.values():
+            component.forget_session(session_id)
+        self._last_seen.pop(session_id, None)
+
+        if state:
+            self._hibernating[session_id] = state
+            try:
+                await self._storage.patch_case_file(session_id, CaseFilePatch().set("runtime_state", state))
+                self.hibernated += 1
+            except Exception as e:
+                # 저장 실패 시 메모리로 되돌림
+                logger.error(f"[Lifecycle] Hibernate failed for {session_id}: {e}", exc_info=True)
+                self._machine.restore_state(session_id, state)
+                self.touch(session_id)
+                return False
+            finally:
+                self._hibernating.pop(session_id, None)
+        if isinstance(self._storage, CachedStorage):
+            self._storage.invalidate_session(session_id)
+        self.evicted += 1
+        return True
+
+    async def sweep(self, now: Optional[float] = None) -> int:
+        """만료된 유휴 세션 정리. Returns: 정리한 세션 수"""
+        now = now if now is not None else time.time()
+        evicted = 0
+        for session_id in self._tracked_sessions():
+            if not self._is_expired(session_id, now):
+                continue
+            try:
+                if await self.hibernate(session_id):
+                    evicted += 1
+            except Exception as e:
+                logger.error(f"[Lifecycle] Eviction failed for {session_id}: {e}", exc_info=True)
+        if evicted:
+            logger.info(f"[Lifecycle] Evicted {evicted} idle sessions")
+        return evicted
+
+    async def sweep_drafts(self) -> int:
+        """중단된 streaming 초안 정리. Returns: 정리한 초안 수"""
+        if self._drafts is None:
+            return 0
+        try:
+            return await self._drafts.sweep_orphans()
+        except Exception as e:
+            logger.error(f"[Lifecycle] Draft sweep failed: {e}", exc_info=True)
+            return 0
+
+    async def _sweep_loop(self):
+        # 시작 직후 한 번 (이전 워커가 남긴 초안), 이후 정리 주기마다
+        await self.sweep_drafts()
+        while True:
+            await asyncio.sleep(self._sweep_interval)
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"[Lifecycle] Sweep failed: {e}", exc_info=True)
+            await self.sweep_drafts()
+
+    async def start(self):
+        """주기적 정리 시작 (앱 startup)"""
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        """주기적 정리 종료 (앱 shutdown)"""
+        if self._sweep_task:
+            self._sweep_task.cancel()
+            try:
+                await self._sweep_task
+            except asyncio.CancelledError:
+                pass
+            self._sweep_task = None
+
+    # === 게이지 ===
+
+    @staticmethod
+    def _measure(containers: Dict[str, dict]) -> Dict[str, dict]:
+        return {
+            name: {"sessions": len(container), "bytes": _approx_size(container, set())}
+            for name, container in containers.items()
+        }
+
+    def gauges(self) -> dict:
+        """추적 중인 세션 수와 컴포넌트별 추정 메모리"""
+        components = {
+            "sse": self._measure(self._events.per_session_state()),
+            "state_machine": self._measure(self._machine.per_session_state()),
+            "write_batcher": self._measure(self._batcher.per_session_state()),
+            **{name: self._measure(c.per_session_state()) for name, c in self._components.items()},
+        }
+        gauges = {
+            "tracked_sessions": len(self._tracked_sessions()),
+            "bytes": sum(c["bytes"] for parts in components.values() for c in parts.values()),
+            "components": components,
+            "evicted_total": self.evicted,
+            "hibernated_total": self.hibernated,
+            "resumed_total": self.resumed,
+        }
+        if isinstance(self._storage, CachedStorage):
+            gauges["l1_cache"] = self._storage.stats()
+        return gauges
+
+
+# 싱글톤 인스턴스
+session_lifecycle = SessionLifecycleManager(sse_event_manager, state_machine, write_batcher, draft_writer)
+session_lifecycle.register("drafts", draft_writer)
+session_lifecycle.register("round_digester", round_digester)
+session_lifecycle.register("report_jobs", report_jobs)
+session_lifecycle.register("turn_manager", turn_manager)
+if VECTOR_INDEX_ENABLED:
+    session_lifecycle.register("vector_index", get_vector_index())
@@ -0,0 +1,88 @@
+"""
+SSE 와이어 이벤트
+
+스트리밍 토큰마다 pydantic SSEEvent를 만들고(검증 + datetime 생성),
+전송/재전송할 때마다 json.dumps를 다시 하던 비용을 없앱니다.
+
+- WireEvent: 검증 없는 __slots__ 레코드. 생성 시 SSE 전송 바이트를 한 번만 만들고
+  링 버퍼, 재전송, 모든 구독자가 같은 bytes 객체를 공유
+- json_bytes: orjson이 있으면 orjson, 없으면 json (UTF-8 bytes)
+- 버스/이벤트 로그에서 이미 직렬화된 data(JSON)를 받으면 다시 인코딩하지 않음
+"""
+import json
+from datetime import datetime
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_bytes(data) -> bytes:
+    """data를 UTF-8 JSON bytes로 직렬화"""
+    if orjson:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, default=str, separators=(",", ":")).encode()
+
+
+# 30초 동안 이벤트가 없을 때 보내는 주석 프레임
+KEEPALIVE = b": keepalive\n\n"
+
+
+def sse_frame(event_type: str, data) -> bytes:
+    """id 없는 SSE 프레임 (클라이언트의 Last-Event-ID를 바꾸지 않는 보조 데이터)"""
+    return b"event: %b\ndata: %b\n\n" % (event_type.encode(), json_bytes(data))
+
+
+class WireEvent:
+    """
+    SSE 이벤트 (직렬화 완료)
+
+    type은 EventType 값 문자열이며 str Enum인 EventType과 그대로 비교할 수 있습니다.
+    timestamp는 ISO 8601 문자열입니다. id가 None이면 id 줄 없이 보냅니다 (클라이언트의 Last-Event-ID 유지).
+    """
+
+    __slots__ = ("id", "type", "data", "timestamp", "payload")
+
+    def __init__(
+        self,
+        id: Optional[int],
+        type: str,
+        data: dict,
+        timestamp: Optional[str] = None,
+        data_json: Optional[bytes] = None,
+    ):
+        self.id = id
+        self.type = type
+        self.data = data
+        self.timestamp = timestamp or datetime.utcnow().isoformat()
+        if data_json is None:
+            data_json = json_bytes(data)
+        if id is None:
+            self.payload = b"event: %b\ndata: %b\n\n" % (type.encode(), data_json)
+        else:
+            self.payload = b"id: %d\nevent: %b\ndata: %b\n\n" % (id, type.encode(), data_json)
+
+    @classmethod
+    def from_published(cls, published: dict) -> "WireEvent":
+        """버스/이벤트 로그의 이벤트 dict {id, type, data, timestamp[, data_json]}에서 생성"""
+        return cls(
+            published["id"],
+            published["type"],
+            published["data"],
+            published["timestamp"],
+            published.get("data_json"),
+        )
+
+    @property
+    def data_json(self) -> bytes:
+        """data의 JSON bytes (전송 바이트에서 잘라냄, 다른 전송 방식에서 재인코딩 없이 사용)"""
+        return self.payload[self.payload.index(b"\ndata: ") + 7:-2]
+
+    def to_sse_format(self) -> bytes:
+        """SSE 전송 포맷 (미리 만든 bytes)"""
+        return self.payload
+
+    def __repr__(self) -> str:
+        return f"WireEvent(id={self.id}, type={self.type!r})"
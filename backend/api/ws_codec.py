@@ -0,0 +1,119 @@
+"""
+WebSocket 프레임 코덱
+
+세션 WebSocket(/api/sessions/{id}/ws)은 스트리밍 출력과 사용자 액션을 연결 하나로 주고받습니다.
+SSE 텍스트 프레임(id/event/data 줄)과 액션별 HTTP POST 대신 짧은 배열 프레임을 씁니다.
+
+서버 → 클라이언트 (항상 바이너리 프레임)
+- 이벤트:      [type_code, id_delta, data]
+  type_code는 hello 프레임의 types 목록 인덱스, id_delta는 직전 이벤트 id와의 차이
+  (첫 이벤트는 0 기준 → 절대값). 연속 chunk는 대부분 1이라 1바이트로 인코딩됨
+- id 없는 이벤트: [type_code, data] (session_state 등)
+- 제어 프레임: {"op": "hello" | "ack" | "error", ...}
+
+클라이언트 → 서버 (텍스트/바이너리 모두 허용)
+- {"op": "message" | "steering" | "legal_steering" | "facts", "ref": 임의 값, "body": {...}}
+  → {"op": "ack", "ref", "result"} 또는 {"op": "error", "ref", "status", "detail"}
+  액션은 동시에 처리되고 끝나는 순서대로 응답하므로 ref로 요청과 응답을 맞춤
+
+인코딩은 서브프로토콜로 협상합니다.
+- "msgpack": msgpack 설치 시 (없으면 json으로 대체)
+- "json": UTF-8 JSON. data는 WireEvent가 이미 만든 JSON bytes를 그대로 이어 붙임
+permessage-deflate는 클라이언트가 제안하면 uvicorn(websockets)이 협상합니다 (--ws-per-message-deflate, 기본 켜짐).
+"""
+import json
+from typing import List, Optional, Tuple, Union
+
+from .events import EventType
+from .sse_wire import WireEvent, json_bytes
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SUBPROTOCOL_MSGPACK = "msgpack"
+SUBPROTOCOL_JSON = "json"
+
+# type_code → 이벤트 타입 (hello 프레임으로 클라이언트에 알려 줌)
+EVENT_TYPES: List[str] = [event_type.value for event_type in EventType]
+_TYPE_CODES = {event_type: code for code, event_type in enumerate(EVENT_TYPES)}
+
+
+class FrameDecodeError(ValueError):
+    """클라이언트 프레임 해석 실패"""
+
+
+class FrameCodec:
+    """
+    연결 하나의 프레임 인코더/디코더
+
+    id_delta 기준값(직전 이벤트 id)을 연결마다 들고 있으므로 연결 간에 공유하지 않습니다.
+    """
+
+    def __init__(self, use_msgpack: bool):
+        self.use_msgpack = use_msgpack and msgpack is not None
+        self._last_id = 0
+
+    @classmethod
+    def negotiate(cls, offered: List[str]) -> Tuple["FrameCodec", Optional[str]]:
+        """
+        클라이언트가 제안한 서브프로토콜 중 하나 선택
+
+        Returns: (코덱, 응답할 서브프로토콜 - 제안이 없었으면 None)
+        """
+        if SUBPROTOCOL_MSGPACK in offered and msgpack is not None:
+            return cls(True), SUBPROTOCOL_MSGPACK
+        if SUBPROTOCOL_JSON in offered:
+            return cls(False), SUBPROTOCOL_JSON
+        return cls(False), None
+
+    @property
+    def name(self) -> str:
+        return SUBPROTOCOL_MSGPACK if self.use_msgpack else SUBPROTOCOL_JSON
+
+    def _pack(self, value) -> bytes:
+        if self.use_msgpack:
+            return msgpack.packb(value, use_bin_type=True, default=str)
+        return json_bytes(value)
+
+    # === 서버 → 클라이언트 ===
+
+    def event(self, event: WireEvent) -> bytes:
+        """이벤트 프레임 (id 없는 이벤트는 aux 프레임)"""
+        if event.id is None:
+            return self.aux(event.type, event.data)
+        delta = event.id - self._last_id
+        self._last_id = event.id
+        code = _TYPE_CODES[event.type]
+        if self.use_msgpack:
+            return self._pack([code, delta, event.data])
+        return b"[%d,%d,%b]" % (code, delta, event.data_json)
+
+    def aux(self, event_type: str, data: dict) -> bytes:
+        """id 없는 이벤트 프레임 (id_delta 기준값을 바꾸지 않음)"""
+        return self._pack([_TYPE_CODES[event_type], data])
+
+    def control(self, op: str, **fields) -> bytes:
+        """제어 프레임"""
+        return self._pack({"op": op, **fields})
+
+    def hello(self, session_id: str) -> bytes:
+        return self.control("hello", session_id=session_id, codec=self.name, types=EVENT_TYPES)
+
+    # === 클라이언트 → 서버 ===
+
+    def decode(self, message: Union[str, bytes]) -> dict:
+        """액션 프레임 해석 (텍스트는 JSON, 바이너리는 협상한 인코딩)"""
+        try:
+            if isinstance(message, str):
+                frame = json.loads(message)
+            elif self.use_msgpack:
+                frame = msgpack.unpackb(message, raw=False)
+            else:
+                frame = json.loads(message)
+        except Exception as e:
+            raise FrameDecodeError(f"Malformed frame: {e}") from e
+        if not isinstance(frame, dict) or not isinstance(frame.get("op"), str):
+            raise FrameDecodeError("Frame must be an object with an 'op' field")
+        return frame
@@ -0,0 +1,214 @@
+"""
+최종 리포트 생성 벤치마크 (대화 전체 한 번에 vs 라운드 요약 map-reduce, 한 번에 vs 섹션별 병렬)
+
+Gemini 대신 지연 모델을 가진 가짜 클라이언트로 호출 수, 보낸 프롬프트 분량, 지연을 비교합니다.
+지연 = 요청 오버헤드 + 입력 토큰 × prefill + 출력 토큰 × decode (토큰 ≈ 글자 수 / --chars-per-token)
+출력 분량은 프롬프트에 적힌 "공백 포함 N자"를 따릅니다. first는 첫 본문 chunk(제목 줄 제외)까지의 시간입니다.
+
+- direct: 기존 방식 (모든 메시지를 이어 붙인 프롬프트 하나)
+- map-reduce cold: 요약 캐시 없음
+- map-reduce warm: 같은 대화로 다시 생성 (요약 캐시만 재사용, 리포트 본문은 다시 생성)
+- map-reduce +1 round: 라운드가 하나 늘어난 뒤 재생성 (끝난 라운드 요약은 캐시)
+- single / sections: 요약 캐시가 찬 상태에서 리포트 본문을 한 번에 vs 섹션별 병렬로 생성
+- per round: 라운드가 끝날 때마다 리포트를 요청하면 다시 생성되는 섹션 수 (섹션 입력이 고정 라운드라 대부분 재사용)
+- incremental: 마지막 라운드 종료(END_GATE) 후 백그라운드 생성 → finalize / 사용자 발언 추가 후 finalize
+  (CaseFile은 앱과 같이 사전 단계에 사실관계, 게이트마다 Steering, phase마다 라운드 요약이 바뀌는 가짜 데이터)
+
+실행: cd backend && python -m benchmarks.report_bench [--rounds 3 --messages-per-round 4 --message-chars 3500]
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+
+from orchestrator.report_pipeline import ReportPipeline, _conversation_text, _render_context, _round_conversations
+
+WORDS = ["계약", "해지", "손해배상", "위약금", "증거", "판결", "합의", "쟁점", "입증", "리스크",
+         "원고", "피고", "청구", "기각", "조정", "통보", "책임", "과실", "상계", "소멸시효"]
+
+
+class SimulatedClient:
+    """generate_text / stream_text를 흉내 내는 지연 모델 클라이언트"""
+
+    def __init__(self, args):
+        self.args = args
+        self.max_prompt_tokens = 0
+
+    def _tokens(self, chars: int) -> float:
+        return chars / self.args.chars_per_token
+
+    def _out_chars(self, prompt: str) -> int:
+        # 요약 프롬프트는 요약 분량, 리포트/섹션 프롬프트는 적힌 분량을 출력
+        if "요약문만 출력하세요" in prompt:
+            return min(len(prompt) // 4, 1200)
+        match = re.search(r"공백 포함 (\d+)자", prompt)
+        return int(match.group(1)) if match else self.args.report_chars
+
+    async def _prefill(self, prompt: str):
+        in_tokens = self._tokens(len(prompt))
+        self.max_prompt_tokens = max(self.max_prompt_tokens, in_tokens)
+        await asyncio.sleep((self.args.overhead + in_tokens * self.args.prefill_ms / 1000) * self.args.time_scale)
+
+    def _text(self, prompt: str, chars: int) -> str:
+        # 같은 입력이면 같은 출력 (캐시 효과 확인용)
+        rng = random.Random(hash(prompt))
+        return " ".join(rng.choice(WORDS) for _ in range(chars // 3))
+
+    async def generate_text(self, prompt: str) -> str:
+        out_chars = self._out_chars(prompt)
+        await self._prefill(prompt)
+        await asyncio.sleep(self._tokens(out_chars) * self.args.decode_ms / 1000 * self.args.time_scale)
+        return self._text(prompt, out_chars)
+
+    async def stream_text(self, prompt: str, max_output_tokens=None):
+        out_chars = self._out_chars(prompt)
+        await self._prefill(prompt)
+        text = self._text(prompt, out_chars)
+        step = 100
+        for i in range(0, len(text), step):
+            chunk = text[i:i + step]
+            await asyncio.sleep(self._tokens(len(chunk)) * self.args.decode_ms / 1000 * self.args.time_scale)
+            yield chunk
+
+
+def _transcript(rng: random.Random, rounds: int, per_round: int, chars: int, start: int = 1) -> list:
+    messages = []
+    roles = ["judge", "claimant", "opposing", "verifier"]
+    for r in range(start, start + rounds):
+        for i in range(per_round):
+            text = " ".join(rng.choice(WORDS) for _ in range(chars // 3))
+            messages.append({"role": roles[i % len(roles)], "content_text": text, "round_index": r})
+        messages.append({"role": "user", "content_text": "다음 라운드 진행", "round_index": r})
+    return messages
+
+
+def _case_file(rng: random.Random, previous: dict, round_index: int) -> dict:
+    """라운드가 끝날 때의 가짜 CaseFile (사전 단계에 사실관계, 게이트마다 Steering, 라운드마다 요약/결정)"""
+    def words(n):
+        return " ".join(rng.choice(WORDS) for _ in range(n))
+
+    case_file = {key: list(value) if isinstance(value, list) else value for key, value in previous.items()}
+    if round_index == 0:
+        case_file.update(case_overview=words(40), parties=["원고", "피고"], confirmed_facts=[words(10)],
+                         disputed_facts=[words(10)], missing_facts_questions=[words(8)])
+    else:
+        case_file["legal_steering"] = {"goal": words(5), "stance": words(3)}
+        case_file["round_digests"] = {
+            **(case_file.get("round_digests") or {}),
+            str(round_index): {"claims": [words(8)], "decisions": [words(6)], "risks": [words(6)]},
+        }
+        case_file.setdefault("decisions", []).append(words(8))
+    return case_file
+
+
+async def _measure(label: str, run, client: SimulatedClient, args):
+    client.max_prompt_tokens = 0
+    t0 = time.perf_counter()
+    first = None
+
+    def on_first():
+        nonlocal first
+        if first is None:
+            first = (time.perf_counter() - t0) / args.time_scale
+
+    calls, chars = await run(on_first)
+    elapsed = (time.perf_counter() - t0) / args.time_scale
+    print(f"  {label:22} calls={calls:3}  prompt={chars / args.chars_per_token:9,.0f} tok  "
+          f"max prompt={client.max_prompt_tokens:8,.0f} tok  first={first or elapsed:6.1f}s  latency={elapsed:6.1f}s")
+
+
+async def main_async(args):
+    rng = random.Random(42)
+    messages = _transcript(rng, args.rounds, args.messages_per_round, args.message_chars)
+    more = messages + _transcript(rng, 1, args.messages_per_round, args.message_chars, start=args.rounds + 1)
+    print(f"transcript: {args.rounds} rounds, {len(messages)} messages, "
+          f"{len(_conversation_text(messages)):,} chars (+1 round: {len(_conversation_text(more)):,} chars)")
+
+    client = SimulatedClient(args)
+    pipeline = ReportPipeline(client, sections=False)
+
+    async def direct(on_first):
+        prompt = pipeline.report_prompt(args.project_type, _render_context(_round_conversations(messages), False, None))
+        async for _ in client.stream_text(prompt):
+            on_first()
+        return 1, len(prompt)
+
+    def mapreduce(msgs, sections=False, case_file=None, reuse=None, target=pipeline, cold_body=True):
+        async def run(on_first):
+            target.sections = sections
+            calls, chars = target.llm_calls, target.prompt_chars
+            plan = await target.plan(args.project_type, msgs, case_file)
+            if cold_body:
+                # 요약 캐시만 남기고 리포트 본문은 다시 생성 (같은 입력의 본문 캐시 제외)
+                for section in plan:
+                    target._cache.invalidate(("section", section.key))
+            async for chunk in target.stream_plan(args.project_type, plan, reuse):
+                if not chunk.startswith("#"):  # 제목 줄은 생성 전에 나가므로 제외
+                    on_first()
+            return target.llm_calls - calls, target.prompt_chars - chars
+        return run
+
+    await _measure("direct", direct, client, args)
+    await _measure("map-reduce cold", mapreduce(messages), client, args)
+    await _measure("map-reduce warm", mapreduce(messages), client, args)
+    await _measure("map-reduce +1 round", mapreduce(more), client, args)
+    print("report body (summary cache warm):")
+    await _measure("single", mapreduce(more), client, args)
+    await _measure("sections", mapreduce(more, sections=True), client, args)
+
+    # 라운드마다 리포트를 요청했을 때 다시 생성되는 섹션 (이전 리포트의 섹션을 reuse로 넘김)
+    print("per round (report requested after each ROUND_END):")
+    rng = random.Random(7)
+    per_round = ReportPipeline(client, sections=True)
+    reuse: dict = {}
+    session_messages: list = []
+    case_file: dict = {}
+    for round_index in range(0, args.rounds + 1):
+        session_messages += _transcript(rng, 1, args.messages_per_round, args.message_chars, start=round_index)
+        case_file = _case_file(rng, case_file, round_index)
+        generated = per_round.sections_generated
+        await _measure(f"after {_round_name(round_index)}", mapreduce(
+            session_messages, True, case_file, reuse, per_round, cold_body=False
+        ), client, args)
+        print(f"  {'':22} sections regenerated={per_round.sections_generated - generated}")
+
+    # report_jobs: END_GATE 후 백그라운드 생성 → finalize (캐시가 빈 새 파이프라인)
+    print("incremental (refresh after the last ROUND_END, then finalize):")
+    incremental = ReportPipeline(client, sections=True)
+    reuse = {}
+    generated = incremental.sections_generated
+    await _measure("refresh END_GATE", mapreduce(
+        session_messages, True, case_file, reuse, incremental, cold_body=False
+    ), client, args)
+    print(f"  {'':22} sections regenerated={incremental.sections_generated - generated}")
+    await _measure("finalize", mapreduce(session_messages, True, case_file, reuse, incremental, cold_body=False), client, args)
+    extra = session_messages + [{"role": "user", "content_text": "결론 정리 부탁드립니다", "round_index": args.rounds}]
+    generated = incremental.sections_generated
+    await _measure("finalize +1 message", mapreduce(extra, True, case_file, reuse, incremental, cold_body=False), client, args)
+    print(f"  {'':22} sections regenerated={incremental.sections_generated - generated} "
+          f"of {len(await incremental.plan(args.project_type, extra, case_file))}")
+
+
+def _round_name(round_index: int) -> str:
+    return f"round {round_index}" if round_index else "pre-stage"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--project-type", default="legal")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--messages-per-round", type=int, default=4)
+    parser.add_argument("--message-chars", type=int, default=3500)
+    parser.add_argument("--report-chars", type=int, default=4000)
+    parser.add_argument("--chars-per-token", type=float, default=1.5)
+    parser.add_argument("--overhead", type=float, default=0.5, help="요청당 고정 지연 (s)")
+    parser.add_argument("--prefill-ms", type=float, default=0.2, help="입력 토큰당 지연 (ms)")
+    parser.add_argument("--decode-ms", type=float, default=10.0, help="출력 토큰당 지연 (ms)")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="실제로 기다리는 비율")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
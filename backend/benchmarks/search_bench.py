@@ -0,0 +1,63 @@
+"""
+전문 검색 벤치마크
+
+메시지 N건(기본 100,000)을 색인한 뒤 대표 검색어들의 검색 지연을 측정합니다.
+
+실행: cd backend && python -m benchmarks.search_bench [--messages 100000]
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+
+from storage.search_index import SearchIndex
+
+WORDS = [
+    "계약", "해지", "손해배상", "위약금", "통보", "증거", "판결", "항소", "합의", "조정",
+    "마케팅", "전환율", "리텐션", "예산", "캠페인", "고객", "세그먼트", "실험", "지표", "가설",
+    "아키텍처", "데이터베이스", "인증", "배포", "장애", "모니터링", "캐시", "API", "latency", "SLA",
+    "일정", "리스크", "우선순위", "요구사항", "사용자", "온보딩", "결제", "정산", "보안", "규정",
+]
+QUERIES = ["계약 해지", "손해배상", "캐시 장애", "API", "온보딩 결제", "리텐션 실험", "배", "latency SLA"]
+
+
+def _sentence(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) + rng.choice(["은", "를", "의", "에서", "", "으로"]) for _ in range(40))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--per-session", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    index = SearchIndex(":memory:")
+
+    started = time.perf_counter()
+    sessions = args.messages // args.per_session
+    for s in range(sessions):
+        session = {"id": str(uuid.uuid4()), "user_id": f"user-{s % 20}", "topic": _sentence(rng)[:40]}
+        index.index_session(session)
+        index.index_messages(session["id"], [
+            {"id": str(uuid.uuid4()), "role": "agent1", "content_text": _sentence(rng), "round_index": i // 10}
+            for i in range(args.per_session)
+        ])
+    print(f"indexed {sessions} sessions / {sessions * args.per_session} messages "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    for query in QUERIES:
+        for user_id in (None, "user-3"):
+            timings = []
+            for _ in range(args.repeat):
+                t0 = time.perf_counter()
+                results = index.search(query, user_id=user_id, limit=20)
+                timings.append((time.perf_counter() - t0) * 1000)
+            print(f"{query!r:16} user={user_id or '-':7} hits={len(results):2} "
+                  f"p50={statistics.median(timings):6.1f}ms max={max(timings):6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+SSE 이벤트 표현 마이크로 벤치마크 (SSEEvent vs WireEvent)
+
+스트리밍 토큰 하나(MESSAGE_STREAM_CHUNK)당
+- 이벤트 생성 + 구독자 N명에게 전송 포맷으로 변환하는 CPU 시간
+- 재전송(링 버퍼 전체 재직렬화) 시간
+- 링 버퍼에 이벤트를 들고 있는 메모리 (tracemalloc)
+를 비교합니다. WireEvent는 orjson(requirements.txt)으로 직렬화하며, 설치되지 않은 환경이면 json으로 측정합니다.
+
+실행: cd backend && python -m benchmarks.sse_event_bench [--events 20000 --subscribers 10]
+"""
+import argparse
+import time
+import tracemalloc
+
+from api.events import SSEEvent, EventType
+from api.sse_wire import WireEvent, json_bytes, orjson
+
+
+def _chunk(i: int) -> dict:
+    return {"text": f"토큰{i} "}
+
+
+def _legacy(events: int, subscribers: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(events):
+        event = SSEEvent(id=i, type=EventType.MESSAGE_STREAM_CHUNK, data=_chunk(i))
+        for _ in range(subscribers):
+            event.to_sse_format().encode()
+    return time.perf_counter() - t0
+
+
+def _wire(events: int, subscribers: int) -> float:
+    t0 = time.perf_counter()
+    for i in range(events):
+        data = _chunk(i)
+        event = WireEvent(i, EventType.MESSAGE_STREAM_CHUNK.value, data, data_json=json_bytes(data))
+        for _ in range(subscribers):
+            event.to_sse_format()
+    return time.perf_counter() - t0
+
+
+def _replay(buffer: list, encode) -> float:
+    t0 = time.perf_counter()
+    for event in buffer:
+        encode(event)
+    return time.perf_counter() - t0
+
+
+def _retained(build, count: int) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    buffer = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del buffer
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--subscribers", type=int, default=10)
+    parser.add_argument("--buffer", type=int, default=1000)
+    args = parser.parse_args()
+
+    # WireEvent 결과는 인코더에 따라 크게 다르므로 측정한 인코더를 함께 출력
+    encoder = f"orjson {orjson.__version__}" if orjson else "json (orjson 미설치)"
+    print(f"encoder={encoder} events={args.events} subscribers={args.subscribers}")
+
+    legacy = _legacy(args.events, args.subscribers)
+    wire = _wire(args.events, args.subscribers)
+    print(f"  emit+fan-out  SSEEvent {legacy / args.events * 1e6:7.2f}us/event   "
+          f"WireEvent {wire / args.events * 1e6:7.2f}us/event   ({legacy / wire:.1f}x)")
+
+    legacy_buffer = [SSEEvent(id=i, type=EventType.MESSAGE_STREAM_CHUNK, data=_chunk(i)) for i in range(args.buffer)]
+    wire_buffer = [WireEvent(i, EventType.MESSAGE_STREAM_CHUNK.value, _chunk(i)) for i in range(args.buffer)]
+    legacy_replay = _replay(legacy_buffer, lambda e: e.to_sse_format().encode())
+    wire_replay = _replay(wire_buffer, WireEvent.to_sse_format)
+    print(f"  replay {args.buffer:5}  SSEEvent {legacy_replay * 1000:7.2f}ms         "
+          f"WireEvent {wire_replay * 1000:7.2f}ms         ({legacy_replay / wire_replay:.1f}x)")
+
+    legacy_bytes = _retained(
+        lambda i: SSEEvent(id=i, type=EventType.MESSAGE_STREAM_CHUNK, data=_chunk(i)), args.buffer
+    )
+    wire_bytes = _retained(lambda i: WireEvent(i, EventType.MESSAGE_STREAM_CHUNK.value, _chunk(i)), args.buffer)
+    print(f"  retained      SSEEvent {legacy_bytes / args.buffer:7.0f}B/event    "
+          f"WireEvent {wire_bytes / args.buffer:7.0f}B/event    (incl. wire bytes)")
+
+
+if __name__ == "__main__":
+    main()
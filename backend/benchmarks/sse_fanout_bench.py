@@ -0,0 +1,75 @@
+"""
+SSE fan-out 벤치마크
+
+세션 하나에 구독자 N명(기본 1,000)을 붙이고 이벤트를 발생시켜
+- emit 1회 비용 (모든 구독자 큐에 전달)
+- 구독자별 전달 완료율
+- 읽지 않는 느린 구독자의 큐 상한 / RESYNC 전환
+을 측정합니다.
+
+실행: cd backend && python -m benchmarks.sse_fanout_bench [--subscribers 1000 --events 2000]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from api.events import SSEEventManager, EventType
+
+
+async def run(subscribers: int, events: int, slow_ratio: float):
+    manager = SSEEventManager()
+    session_id = "bench-session"
+
+    slow_count = int(subscribers * slow_ratio)
+    fast = [manager.subscribe(session_id) for _ in range(subscribers - slow_count)]
+    slow = [manager.subscribe(session_id) for _ in range(slow_count)]
+    received = [0] * len(fast)
+
+    async def consume(i: int, subscriber):
+        while True:
+            event = await subscriber.queue.get()
+            received[i] += 1
+            if event.type == EventType.SESSION_END:
+                return
+
+    consumers = [asyncio.create_task(consume(i, s)) for i, s in enumerate(fast)]
+
+    emit_ms = []
+    payload = {"role": "agent1", "chunk": "가" * 40}
+    for i in range(events):
+        t0 = time.perf_counter()
+        await manager.emit(session_id, EventType.MESSAGE_STREAM_CHUNK, payload)
+        emit_ms.append((time.perf_counter() - t0) * 1000)
+        if i % 50 == 0:
+            # 실제 스트리밍처럼 생성 사이에 소비자가 돌 기회를 줌
+            await asyncio.sleep(0)
+    await manager.emit(session_id, EventType.SESSION_END, {})
+    await asyncio.gather(*consumers)
+
+    delivered = sum(received)
+    expected = len(fast) * (events + 1)
+    slow_depth = max((s.queue.qsize() for s in slow), default=0)
+    resync = sum(1 for s in slow if s.dropped)
+
+    print(f"subscribers={subscribers} (slow={slow_count}) events={events}")
+    print(f"  emit p50={statistics.median(emit_ms):.3f}ms p99={sorted(emit_ms)[int(len(emit_ms) * 0.99)]:.3f}ms "
+          f"total={sum(emit_ms):.0f}ms")
+    print(f"  fast subscribers delivered {delivered}/{expected} "
+          f"({'all' if delivered == expected else 'LOSS'})")
+    print(f"  slow subscribers: max queue depth={slow_depth} (cap {manager._subscriber_queue_size}), "
+          f"resynced={resync}/{slow_count}")
+    print(f"  ring buffer size={len(manager._event_buffers[session_id])} (cap {manager._buffer_size})")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--slow-ratio", type=float, default=0.05)
+    args = parser.parse_args()
+    asyncio.run(run(args.subscribers, args.events, args.slow_ratio))
+
+
+if __name__ == "__main__":
+    main()
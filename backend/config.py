@@ -14,10 +14,132 @@ GEMINI_MODEL = os.environ.get("GEMINI_MODEL", "gemini-3-pro-preview")
 SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 
+# 서버리스(Vercel) 배포: 작업 디렉터리는 읽기 전용이고 /tmp는 인스턴스마다 따로라
+# 로컬 SQLite 부가 기능(검색 색인, 이벤트 로그)은 기본으로 끔
+SERVERLESS = bool(os.environ.get("VERCEL"))
+# uvicorn 워커 수 (여러 프로세스가 상태를 나눠 갖는지 판단)
+WEB_CONCURRENCY = int(os.environ.get("WEB_CONCURRENCY", "1"))
+
+# 로컬 SQLite 부가 파일(검색 색인, 이벤트 로그/버스) 기본 위치
+DATA_DIR = os.environ.get("DATA_DIR", "/tmp" if SERVERLESS else ".")
+
+# 저장소 설정
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "supabase")  # "supabase" | "sqlite" | "memory"
+SQLITE_PATH = os.environ.get("SQLITE_PATH", "orchestrator.db")
+
+# L1 캐시 (세션/CaseFile)
+# 무효화는 EVENT_BUS_BACKEND=sqlite일 때만 프로세스 간에 전달되므로, 그 밖의 다중 프로세스 배포
+# (Vercel 서버리스, WEB_CONCURRENCY > 1)에서는 기본으로 끔 (켜면 다른 워커의 쓰기가 TTL 동안 안 보임)
+_L1_CACHE_DEFAULT = os.environ.get("EVENT_BUS_BACKEND", "memory") == "sqlite" or (
+    not SERVERLESS and WEB_CONCURRENCY <= 1
+)
+L1_CACHE_ENABLED = os.environ.get("L1_CACHE_ENABLED", str(_L1_CACHE_DEFAULT)).lower() == "true"
+L1_CACHE_MAX_ENTRIES = 1024
+L1_CACHE_TTL_SECONDS = 30  # 다른 워커의 쓰기가 무효화 메시지 없이 보일 수 있는 최대 시간
+
+# CaseFile 패치 충돌 시 재시도 횟수
+CASE_FILE_PATCH_MAX_RETRIES = 5
+
+# 종료 세션 아카이브 (cold storage)
+ARCHIVE_DIR = os.environ.get("ARCHIVE_DIR", "archive")
+ARCHIVE_AFTER_DAYS = int(os.environ.get("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_CODEC = os.environ.get("ARCHIVE_CODEC", "zstd")  # "zstd" | "zlib" (읽기는 파일 확장자 기준)
+
+# 전문 검색 색인 (SQLite FTS5, 원본 저장소와 별도 파일)
+SEARCH_ENABLED = os.environ.get("SEARCH_ENABLED", str(not SERVERLESS)).lower() == "true"
+SEARCH_INDEX_PATH = os.environ.get("SEARCH_INDEX_PATH", os.path.join(DATA_DIR, "search_index.db"))
+SEARCH_MAX_LIMIT = 50
+SEARCH_RANK_WINDOW = 2000  # 관련도 점수를 매기는 후보 구간 크기 (최근 것부터, 넘는 offset은 다음 구간으로 이어짐)
+
+# 세션별 벡터 색인 (phase 프롬프트에 관련 발언/사실 top-k, 쓰기 시 증분 갱신)
+VECTOR_INDEX_ENABLED = os.environ.get("VECTOR_INDEX_ENABLED", "true").lower() == "true"
+VECTOR_EMBEDDER = os.environ.get("VECTOR_EMBEDDER", "hashing")  # storage/vector_index.EMBEDDERS
+VECTOR_DIM = 1024  # 해싱 임베딩 차원
+VECTOR_CHUNK_CHARS = 400  # 메시지 조각 길이
+VECTOR_MAX_SESSIONS = 64  # 메모리에 색인을 두는 세션 수 (LRU, 밀려나면 다음 검색 때 다시 구성)
+VECTOR_TOP_K = 6  # phase마다 가져오는 관련 조각 수
+VECTOR_MIN_SCORE = 0.1  # 이보다 낮은 코사인 점수는 버림
+VECTOR_RECENT_MESSAGES = 2  # 검색을 쓸 때도 그대로 넣는 직전 발언 수
+
+# 라운드 요약 (phase 발언을 백그라운드로 압축해 CaseFile.round_digests에 누적, 다음 phase 컨텍스트로 사용)
+DIGEST_ENABLED = os.environ.get("DIGEST_ENABLED", "true").lower() == "true"
+DIGEST_INPUT_MAX_CHARS = 6000  # 요약할 발언 최대 길이
+DIGEST_MAX_ITEMS = 6  # 라운드 요약 항목(주장/결정/…)별 최대 개수 (최근 것 유지)
+DIGEST_DRAIN_TIMEOUT_SECONDS = 20  # 라운드 종료 시 남은 요약을 기다리는 상한
+DIGEST_RECENT_MESSAGES = 1  # 라운드 요약이 있을 때 원문으로 넣는 직전 발언 수
+
+# 세션 목록 페이지 크기
+SESSION_LIST_DEFAULT_LIMIT = 50
+SESSION_LIST_MAX_LIMIT = 200
+
 # 오케스트레이터 설정
 MAX_ROUNDS = 5  # 최대 라운드 수
 CASEFILE_MAX_CHARS = 1200  # CaseFile 요약 최대 길이
+# 에이전트 프롬프트 컨텍스트 (orchestrator/context_builder.py, phase별 예산은 turn_manager.PHASE_CONFIG)
+CONTEXT_DEFAULT_TOKENS = 1500  # phase 설정에 context_tokens가 없을 때 (법무/개발 프로젝트)
+CONTEXT_RECENT_MESSAGES = 6  # 컨텍스트 후보로 조회하는 최근 발언 수
+CONTEXT_TURN_MAX_TOKENS = 250  # 최근 발언 하나 상한 (넘으면 잘라냄)
+# 토큰 추정 가중치 (글자당 토큰, 넉넉하게 잡아 실제보다 약간 크게 추정)
+CONTEXT_TOKENS_PER_HANGUL = 1.0
+CONTEXT_TOKENS_PER_ASCII = 0.3
+CONTEXT_TOKENS_PER_OTHER = 0.5
 SSE_BUFFER_SIZE = 100  # SSE 이벤트 버퍼 크기
+SSE_SUBSCRIBER_QUEUE_SIZE = 256  # 구독자별 미전송 이벤트 상한 (넘치면 RESYNC)
+FEED_MESSAGE_LIMIT = 30  # 세션 피드 스냅샷에 담는 최근 메시지 수
+
+# SSE 이벤트 버스 (워커가 여러 개면 sqlite: 같은 파일을 공유하는 cross-process 버스)
+EVENT_BUS_BACKEND = os.environ.get("EVENT_BUS_BACKEND", "memory")  # "memory" | "sqlite"
+EVENT_BUS_SQLITE_PATH = os.environ.get("EVENT_BUS_SQLITE_PATH", os.path.join(DATA_DIR, "event_bus.db"))
+EVENT_BUS_POLL_MS = int(os.environ.get("EVENT_BUS_POLL_MS", "50"))
+EVENT_BUS_RETENTION = 10000  # 버스 테이블에 남겨 두는 최근 이벤트 수
+
+# SSE 이벤트 로그 (재연결 시 Last-Event-ID 이후 재전송용, append-only)
+# 워커가 여러 개면 EVENT_BUS_BACKEND=sqlite여야 재전송이 정확함 (memory 버스는 워커마다 다른 id 블록을
+# 써서 한 세션의 id가 워커 간에 단조 증가하지 않고, Last-Event-ID 이후의 이벤트를 건너뛸 수 있음)
+EVENT_LOG_ENABLED = os.environ.get("EVENT_LOG_ENABLED", str(not SERVERLESS)).lower() == "true"
+EVENT_LOG_PATH = os.environ.get("EVENT_LOG_PATH", os.path.join(DATA_DIR, "event_log.db"))
+EVENT_LOG_RETENTION_DAYS = 7  # 종료 세션 로그 보관 기간
+EVENT_ID_BLOCK_SIZE = 1000  # memory 버스가 이벤트 로그에서 한 번에 예약하는 이벤트 id 수
+
+# 세션 수명 관리 (유휴/종료 세션의 프로세스 내 상태 정리)
+SESSION_IDLE_TTL_SECONDS = int(os.environ.get("SESSION_IDLE_TTL_SECONDS", "1800"))
+SESSION_FINALIZED_TTL_SECONDS = 300  # SESSION_END 이후에는 더 빨리 정리
+SESSION_SWEEP_INTERVAL_SECONDS = 60
+
+# 쓰기 배칭 설정
+WRITE_BATCH_WINDOW_MS = int(os.environ.get("WRITE_BATCH_WINDOW_MS", "50"))  # 세션별 쓰기 병합 윈도우
+WRITE_BATCH_MAX_MESSAGES = 20  # 윈도우 내 메시지가 이만큼 쌓이면 즉시 반영
+
+# 스트리밍 중인 메시지 초안 저장 간격 (재접속 시 초안 + 이후 이벤트만 받음)
+DRAFT_FLUSH_INTERVAL_MS = int(os.environ.get("DRAFT_FLUSH_INTERVAL_MS", "500"))
+# 시작 후 이 시간이 지나도 streaming인 초안은 워커 장애로 중단된 것으로 보고 정리 (phase 생성 시간보다 넉넉히)
+DRAFT_ORPHAN_SECONDS = int(os.environ.get("DRAFT_ORPHAN_SECONDS", "900"))
+
+# 최종 리포트 map-reduce (라운드 요약 → 최종 리포트)
+REPORT_DIRECT_MAX_CHARS = 12000  # 대화 전체가 이보다 짧으면 요약 없이 한 번에 생성
+REPORT_ROUND_MAX_INPUT_CHARS = 40000  # 라운드 원문이 이보다 길면 긴 메시지부터 따로 요약
+REPORT_LONG_MESSAGE_CHARS = 6000  # (위 경우) 따로 요약할 메시지 길이
+REPORT_MESSAGE_SUMMARY_CHARS = 800  # 긴 메시지 요약 분량
+REPORT_ROUND_SUMMARY_MIN_CHARS = 2000  # 이보다 짧은 라운드는 요약 없이 원문 사용
+REPORT_ROUND_SUMMARY_CHARS = 1200  # 라운드 요약 분량
+REPORT_MAP_CONCURRENCY = 4  # 동시 요약 요청 수 (Gemini 할당량)
+REPORT_SUMMARY_CACHE_SIZE = 512
+REPORT_SUMMARY_CACHE_TTL_SECONDS = 6 * 3600
+# 섹션별 병렬 생성 (공통 컨텍스트 + 섹션마다 따로 생성해 순서대로 이어 붙임, false면 한 번에 생성)
+REPORT_SECTION_PARALLEL = os.environ.get("REPORT_SECTION_PARALLEL", "true").lower() == "true"
+REPORT_SECTION_CONCURRENCY = 9  # 동시 섹션 생성 요청 수 (양식 최대 섹션 수)
+REPORT_SECTION_TOKENS_PER_CHAR = 2.0  # 섹션 출력 토큰 상한 = 섹션 분량 × 이 값 (한국어 여유 포함)
+REPORT_SECTION_THINKING_TOKENS = 2048  # 출력 상한에 더하는 사고(thinking) 토큰 여유
+# 마지막 라운드 종료(END_GATE) 후 백그라운드로 리포트 생성 (finalize 때는 마지막 라운드를 읽는 섹션만 다시 생성)
+REPORT_INCREMENTAL_ENABLED = os.environ.get("REPORT_INCREMENTAL_ENABLED", "true").lower() == "true"
+REPORT_FLUSH_INTERVAL_MS = 1000  # 스트리밍 리포트 작업의 부분 본문 저장 간격
+REPORT_JOB_RETENTION_SECONDS = 3600  # 끝난 리포트 작업 상태 보관 기간
+
+# 세션 일괄 내보내기 (zip / NDJSON 스트리밍)
+EXPORT_PAGE_SIZE = 200  # 대화 기록을 한 번에 읽어 내보낼 메시지 수
+EXPORT_MAX_SESSIONS = 100  # 요청 하나로 내보낼 수 있는 세션 수
+# 리포트 HTML/PDF 렌더링 프로세스 수 (0이면 스레드에서 렌더링)
+EXPORT_RENDER_WORKERS = int(os.environ.get("EXPORT_RENDER_WORKERS", "2"))
 
 # 카테고리 정의
 CATEGORIES = ["newbiz", "marketing", "dev", "domain"]
@@ -5,6 +5,14 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.routes import router
+from api.events import sse_event_manager
+from api.export import render_pool
+from api.report_jobs import report_jobs
+from api.session_lifecycle import session_lifecycle
+from config import L1_CACHE_ENABLED
+from orchestrator.round_digest import round_digester
+from storage.cache import invalidation_bus
+from storage.write_batcher import write_batcher
 
 app = FastAPI(
     title="3 에이전트 오케스트레이터",
@@ -19,11 +27,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # API 라우터 등록
 app.include_router(router)
 
+@app.on_event("startup")
+async def start_event_bus():
+    """SSE 이벤트 버스 수신 시작 (cross-process 버스면 poll 루프)"""
+    await sse_event_manager.start()
+
+@app.on_event("startup")
+async def start_cache_invalidation():
+    """L1 캐시 무효화 수신 시작 (cross-process 버스면 poll 루프)"""
+    if L1_CACHE_ENABLED:
+        await invalidation_bus.start()
+
+@app.on_event("startup")
+async def start_session_sweeper():
+    """유휴 세션 정리 주기 작업 시작"""
+    await session_lifecycle.start()
+
+@app.on_event("shutdown")
+async def flush_pending_writes():
+    """종료 전 배칭 중인 쓰기 반영"""
+    await session_lifecycle.stop()
+    await report_jobs.stop()
+    await round_digester.stop()
+    await write_batcher.flush_all()
+    await sse_event_manager.stop()
+    await invalidation_bus.stop()
+    render_pool.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "오케스트레이터 API 서버 가동 중"}
@@ -52,6 +52,12 @@ class CaseFile(BaseModel):
     steering_history: List[Dict[str, Any]] = Field(default_factory=list, description="Steering 이력")
     committed_steering_snapshot: Dict[str, Any] = Field(default_factory=dict, description="현재 적용된 Steering")
     
+    # 라운드별 발언 요약 (phase마다 백그라운드로 누적, 다음 phase 컨텍스트로 사용)
+    round_digests: Dict[str, Dict[str, Any]] = Field(default_factory=dict, description="라운드 요약")
+    
+    # 유휴 정리(hibernate) 시 옮겨 둔 프로세스 내 상태 (다음 요청 때 복원 후 비움)
+    runtime_state: Optional[Dict[str, Any]] = Field(default=None, description="hibernate된 세션 런타임 상태")
+    
     def get_summary(self, max_chars: int = CASEFILE_MAX_CHARS) -> str:
         """
         CaseFile 요약 (권장 800~1200자)
@@ -0,0 +1,204 @@
+"""
+컨텍스트 빌더 - phase별 토큰 예산 안에서 우선순위대로 프롬프트 컨텍스트 구성
+
+execute_phase / execute_legal_phase가 각자 자르던 컨텍스트(결정 3개, 발언 5개×200자 등)를
+하나의 규칙으로 묶습니다.
+
+- 블록(Steering, 확정 사실, 결정사항, 미해결 쟁점, 최근 발언 …)마다 우선순위를 두고
+  우선순위가 높은 블록부터 예산이 허락하는 만큼 항목을 담음 (기본은 최신 항목부터)
+- 항목이 너무 길면 max_item_tokens에서 잘라냄
+- 담지 못한 항목 수/잘라낸 항목 수를 PackedContext.dropped / truncated로 알려줌
+- 토큰 수는 API 호출 없이 글자 종류별 가중치로 추정 (한글은 음절당, 영문/숫자는 몇 글자당 1토큰)
+"""
+import logging
+import re
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from config import (
+    CONTEXT_TOKENS_PER_HANGUL, CONTEXT_TOKENS_PER_ASCII, CONTEXT_TOKENS_PER_OTHER,
+)
+
+logger = logging.getLogger(__name__)
+
+_HANGUL = re.compile(r"[가-힣ᄀ-ᇿ㄰-㆏]")
+_ASCII_WORD = re.compile(r"[A-Za-z0-9]")
+_SPACE = re.compile(r"\s")
+
+_ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (한국어 기준)
+
+    한글 음절 × CONTEXT_TOKENS_PER_HANGUL + 영문/숫자 × CONTEXT_TOKENS_PER_ASCII
+    + 그 밖의 문자(문장부호, 한자 등) × CONTEXT_TOKENS_PER_OTHER (공백 제외)
+    """
+    if not text:
+        return 0
+    hangul = len(_HANGUL.findall(text))
+    ascii_word = len(_ASCII_WORD.findall(text))
+    spaces = len(_SPACE.findall(text))
+    other = len(text) - hangul - ascii_word - spaces
+    return int(
+        hangul * CONTEXT_TOKENS_PER_HANGUL
+        + ascii_word * CONTEXT_TOKENS_PER_ASCII
+        + other * CONTEXT_TOKENS_PER_OTHER
+        + 0.999
+    )
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 뒤를 잘라냄 (잘렸으면 … 표시)"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # 글자 수 비율로 자른 뒤 넘치는 만큼 줄임
+    length = max(1, len(text) * max_tokens // max(1, estimate_tokens(text)))
+    while length > 1 and estimate_tokens(text[:length]) + 1 > max_tokens:
+        length = length * 9 // 10
+    return text[:length].rstrip() + _ELLIPSIS
+
+
+class ContextBlock(NamedTuple):
+    """컨텍스트 블록 하나"""
+    label: str  # 블록 제목 ("결정사항")
+    items: List[str]  # 시간순 (오래된 것 먼저)
+    priority: int  # 작을수록 먼저 담음
+    newest_first: bool = True  # 예산이 모자라면 오래된 항목부터 버림 (False면 뒤 항목부터)
+    max_item_tokens: Optional[int] = None  # 항목 하나 상한 (넘으면 잘라냄)
+
+
+class PackedContext:
+    """예산 안에 담긴 컨텍스트"""
+
+    def __init__(self, blocks: List[ContextBlock], kept: Dict[str, List[str]], reserved: Dict[str, str],
+                 tokens: int, budget: int, dropped: Dict[str, int], truncated: Dict[str, int]):
+        self._blocks = blocks
+        self.kept = kept  # 블록별 담긴 항목 (시간순)
+        self.reserved = reserved  # 예산을 먼저 차감한 필수 텍스트 (Steering 등)
+        self.tokens = tokens
+        self.budget = budget
+        self.dropped = dropped  # 블록별 버린 항목 수
+        self.truncated = truncated  # 블록별 잘라낸 항목 수
+
+    def items(self, label: str) -> List[str]:
+        return self.kept.get(label, [])
+
+    def render(self, exclude: Sequence[str] = ()) -> str:
+        """담긴 블록을 선언 순서대로 "[제목]\\n- 항목" 형태로"""
+        parts = []
+        for block in self._blocks:
+            if block.label in exclude or not self.kept.get(block.label):
+                continue
+            parts.append(_render_block(block.label, self.kept[block.label]))
+        return "\n".join(parts)
+
+    def report(self) -> dict:
+        """로그/디버그용 요약"""
+        return {
+            "tokens": self.tokens,
+            "budget": self.budget,
+            "dropped": {label: n for label, n in self.dropped.items() if n},
+            "truncated": {label: n for label, n in self.truncated.items() if n},
+        }
+
+
+def _render_block(label: str, items: List[str]) -> str:
+    return f"[{label}]\n" + "\n".join(f"- {item}" for item in items)
+
+
+class ContextBuilder:
+    """
+    토큰 예산 기반 컨텍스트 빌더
+
+    builder = ContextBuilder(budget)
+    builder.reserve("steering", steering_block)  # 항상 포함, 예산에서 먼저 차감
+    builder.add("결정사항", decisions, priority=1)
+    packed = builder.build()
+    """
+
+    def __init__(self, budget: int):
+        self._budget = budget
+        self._reserved: Dict[str, str] = {}
+        self._blocks: List[ContextBlock] = []
+
+    def reserve(self, label: str, text: str) -> "ContextBuilder":
+        if text:
+            self._reserved[label] = text
+        return self
+
+    def add(
+        self,
+        label: str,
+        items: Sequence[str],
+        priority: int,
+        newest_first: bool = True,
+        max_item_tokens: Optional[int] = None,
+    ) -> "ContextBuilder":
+        items = [str(item).strip() for item in items or [] if item and str(item).strip()]
+        if items:
+            self._blocks.append(ContextBlock(label, items, priority, newest_first, max_item_tokens))
+        return self
+
+    def build(self) -> PackedContext:
+        used = sum(estimate_tokens(text) for text in self._reserved.values())
+        kept: Dict[str, Dict[int, str]] = {}
+        dropped: Dict[str, int] = {}
+        truncated: Dict[str, int] = {}
+
+        for block in sorted(self._blocks, key=lambda b: b.priority):
+            header = estimate_tokens(f"[{block.label}]")
+            order = range(len(block.items) - 1, -1, -1) if block.newest_first else range(len(block.items))
+            chosen: Dict[int, str] = {}
+            dropped[block.label] = truncated[block.label] = 0
+            for index in order:
+                original = block.items[index]
+                item = truncate_to_tokens(original, block.max_item_tokens) if block.max_item_tokens else original
+                cost = estimate_tokens(item) + 1 + (0 if chosen else header)
+                if used + cost > self._budget:
+                    # 더 짧은 항목은 들어갈 수 있으므로 계속 확인
+                    dropped[block.label] += 1
+                    continue
+                chosen[index] = item
+                used += cost
+                if item is not original:
+                    truncated[block.label] += 1
+            kept[block.label] = chosen
+
+        return PackedContext(
+            blocks=self._blocks,
+            kept={label: [chosen[i] for i in sorted(chosen)] for label, chosen in kept.items()},
+            reserved=dict(self._reserved),
+            tokens=used,
+            budget=self._budget,
+            dropped=dropped,
+            truncated=truncated,
+        )
+
+
+def format_turns(messages: Sequence[dict]) -> List[str]:
+    """최근 발언 → "역할: 본문" 항목 (get_recent_messages 결과, 시간순)"""
+    return [f"{m.get('role')}: {m.get('content_text') or ''}" for m in messages if m.get("content_text")]
+
+
+def format_related(results: Sequence[dict], exclude: Sequence[str] = ()) -> List[str]:
+    """벡터 색인 검색 결과 → 항목 (점수순, exclude와 같은 본문은 건너뜀)"""
+    skip = set(exclude)
+    items = []
+    for result in results:
+        if result["text"] in skip:
+            continue
+        if result["kind"] == "fact":
+            items.append(f"({result.get('label')}) {result['text']}")
+        else:
+            items.append(f"{result.get('role')} (R{result.get('round_index')}): {result['text']}")
+    return items
+
+
+def log_packed(tag: str, session_id: str, phase: str, packed: PackedContext):
+    """컨텍스트 구성 결과 로그 (버린 항목이 있으면 info)"""
+    report = packed.report()
+    if report["dropped"]:
+        logger.info(f"[{tag}] Context {session_id}/{phase}: {report}")
+    else:
+        logger.debug(f"[{tag}] Context {session_id}/{phase}: {report}")
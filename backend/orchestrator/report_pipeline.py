@@ -0,0 +1,420 @@
+"""
+최종 리포트 생성 파이프라인 (map-reduce)
+
+finalize / report generate는 모든 메시지를 이어 붙인 프롬프트 하나로 리포트를 만들어
+대화가 길어질수록 지연과 토큰 비용이 선형으로 늘고, 긴 법무 세션은 컨텍스트 한도에 걸렸습니다.
+
+- 짧은 대화(REPORT_DIRECT_MAX_CHARS 이하)는 기존처럼 한 번에 생성
+- map: 라운드별 요약 (라운드 병렬). 너무 큰 라운드는 긴 메시지를 먼저 따로 요약
+- reduce: 라운드 요약 + CaseFile + 프로젝트 타입별 양식으로 최종 리포트 생성
+  섹션별 병렬 생성(REPORT_SECTION_PARALLEL)이면 섹션마다 분량/출력 토큰 예산을 나눠 동시에 생성하고
+  목차 순서대로 이어 붙여 스트리밍 (첫 섹션은 생성되는 대로, 뒤 섹션은 앞 섹션이 끝나면 모아 둔 본문부터)
+- 섹션 프롬프트는 그 섹션이 의존하는 라운드/CaseFile 필드/라운드 요약(ReportSectionSpec)만으로 만들고
+  프롬프트 해시(key)가 같은 섹션은 다시 생성하지 않음 → 마지막 라운드 갱신 후 finalize에서는
+  마지막 라운드를 읽는 섹션만 다시 생성 (report_jobs)
+- 요약은 입력 내용 해시로 캐시 → 끝난 라운드는 다시 요약하지 않음
+  (generate 후 finalize, 라운드가 하나 늘어난 뒤 재생성 등)
+- content_key(): 리포트 입력(메시지 id/버전 + CaseFile 버전) 해시. 저장된 리포트 재사용 판단용
+- streaming 초안(생성 중이거나 중단된 메시지)은 리포트 입력에서 제외 (report_inputs)
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from itertools import groupby
+from typing import AsyncGenerator, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from agents.base_agent import gemini_client
+from config import (
+    CASEFILE_MAX_CHARS, REPORT_DIRECT_MAX_CHARS, REPORT_LONG_MESSAGE_CHARS, REPORT_ROUND_MAX_INPUT_CHARS, REPORT_ROUND_SUMMARY_MIN_CHARS,
+    REPORT_MESSAGE_SUMMARY_CHARS, REPORT_ROUND_SUMMARY_CHARS, REPORT_MAP_CONCURRENCY,
+    REPORT_SUMMARY_CACHE_SIZE, REPORT_SUMMARY_CACHE_TTL_SECONDS,
+    REPORT_SECTION_PARALLEL, REPORT_SECTION_CONCURRENCY, REPORT_SECTION_TOKENS_PER_CHAR,
+    REPORT_SECTION_THINKING_TOKENS,
+)
+from models.case_file import CaseFile
+from prompts.report import (
+    REPORT_CONTEXT, REPORT_PROMPT, SECTION_PROMPT, MESSAGE_SUMMARY_PROMPT, ROUND_SUMMARY_PROMPT,
+    format_guide, format_version, get_report_format, section_outline,
+)
+from storage.cache import LRUCache
+from .round_digest import digest_items
+
+logger = logging.getLogger(__name__)
+
+# 리포트 입력이 바뀌었는지 판단하는 메시지 컬럼 (id + 버전)
+REPORT_KEY_COLUMNS = ("id", "status", "event_id")
+
+# 리포트 생성에 필요한 메시지 컬럼
+REPORT_MESSAGE_COLUMNS = ("role", "content_text", "round_index", *REPORT_KEY_COLUMNS)
+
+# generate_text가 예외 대신 돌려주는 실패 응답 (캐시하지 않음)
+_FAILED_PREFIXES = ("[오류 발생", "[Gemini API")
+
+
+def _is_failed(text: Optional[str]) -> bool:
+    return not text or text.startswith(_FAILED_PREFIXES)
+
+
+def _conversation_text(messages: List[dict]) -> str:
+    return "".join(f"{m.get('role', 'unknown')}: {m.get('content_text') or ''}\n\n" for m in messages)
+
+
+def _case_file_summary(case_file: Optional[dict]) -> str:
+    if not case_file:
+        return ""
+    try:
+        return CaseFile(**{"session_id": "", **case_file}).get_summary()
+    except Exception as e:
+        logger.warning(f"[ReportPipeline] CaseFile summary failed: {e}")
+        return ""
+
+
+def report_inputs(messages: List[dict]) -> List[dict]:
+    """리포트 입력 메시지 (생성 중이거나 중단된 streaming 초안 제외)"""
+    return [m for m in messages if m.get("status") != "streaming"]
+
+
+def content_key(messages: List[dict], case_file: Optional[dict] = None) -> str:
+    """
+    리포트 입력 해시 (메시지 id/status/event_id + CaseFile updated_at)
+
+    메시지 본문은 완료(status) 또는 draft 갱신(event_id) 때만 바뀌므로 본문 없이 REPORT_KEY_COLUMNS만으로 계산합니다.
+    streaming 초안은 리포트 입력이 아니므로 해시에서도 뺍니다.
+    """
+    digest = hashlib.sha256()
+    for m in report_inputs(messages):
+        digest.update(f"{m.get('id')}|{m.get('status') or ''}|{m.get('event_id') or ''}\n".encode())
+    digest.update(str((case_file or {}).get("updated_at") or "").encode())
+    return digest.hexdigest()
+
+
+def _round_label(round_index: Optional[int]) -> str:
+    return f"라운드 {round_index}" if round_index else "사전 단계"
+
+
+def _group_rounds(messages: List[dict]) -> List[Tuple[int, List[dict]]]:
+    """연속한 같은 라운드 메시지 묶음 (같은 라운드가 떨어져 있으면 여러 묶음)"""
+    return [
+        (round_index, list(group))
+        for round_index, group in groupby(messages, key=lambda m: m.get("round_index") or 0)
+    ]
+
+
+def _merge_rounds(pairs: Sequence[Tuple[int, str]]) -> Dict[int, str]:
+    """(round_index, 텍스트) 묶음을 라운드별로 이어 붙임"""
+    merged: Dict[int, str] = {}
+    for round_index, text in pairs:
+        merged[round_index] = f"{merged[round_index]}\n\n{text}" if round_index in merged else text
+    return merged
+
+
+def _round_conversations(messages: List[dict]) -> Dict[int, str]:
+    """라운드별 대화 원문"""
+    return _merge_rounds([(r, _conversation_text(msgs).strip()) for r, msgs in _group_rounds(messages)])
+
+
+def _select_rounds(round_texts: Dict[int, str], rounds: Optional[Tuple[int, ...]]) -> Dict[int, str]:
+    """섹션이 의존하는 라운드만 (None이면 전체, 음수는 마지막 라운드 기준)"""
+    if rounds is None:
+        return round_texts
+    last = max(round_texts, default=0)
+    wanted = {r if r >= 0 else last + 1 + r for r in rounds}
+    return {r: text for r, text in round_texts.items() if r in wanted}
+
+
+def _case_file_fields(case_file: Optional[dict], fields: Sequence[str]) -> str:
+    """CaseFile 필드 일부 (필드 설명을 제목으로)"""
+    lines = []
+    for field in fields:
+        value = (case_file or {}).get(field)
+        if not value:
+            continue
+        if isinstance(value, list):
+            text = "; ".join(str(v) for v in value)
+        elif isinstance(value, dict):
+            text = json.dumps(value, ensure_ascii=False)
+        else:
+            text = str(value)
+        info = CaseFile.model_fields.get(field)
+        lines.append(f"[{(info.description if info else None) or field}] {text[:CASEFILE_MAX_CHARS]}")
+    return "\n".join(lines)
+
+
+def _render_context(
+    round_texts: Dict[int, str],
+    summarized: bool,
+    case_file: Optional[dict],
+    rounds: Optional[Tuple[int, ...]] = None,
+    fields: Sequence[str] = (),
+    digests: bool = False,
+) -> str:
+    """리포트 컨텍스트 (rounds/fields를 주면 그 입력만, digests면 라운드 요약 포함)"""
+    selected = _select_rounds(round_texts, rounds)
+    rounds_text = "\n\n".join(f"## {_round_label(r)}\n{text}" for r, text in sorted(selected.items()))
+    case_file_summary = _case_file_fields(case_file, fields) if fields else _case_file_summary(case_file)
+    if digests:
+        items = digest_items((case_file or {}).get("round_digests"))
+        if items:
+            case_file_summary = "\n".join(filter(None, [case_file_summary, "[라운드 요약]", *items]))
+    return REPORT_CONTEXT.format(
+        source="토론을 라운드별로 요약한 내용" if summarized else "토론 내용",
+        case_file_summary=case_file_summary or "(없음)",
+        rounds_label="라운드별 요약" if summarized else "토론 내용",
+        rounds_text=rounds_text or "(없음)",
+    )
+
+
+def _prompt_key(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode()).hexdigest()
+
+
+class ReportSection(NamedTuple):
+    """생성 단위 (섹션 하나, 한 번에 생성하면 리포트 전체)"""
+    title: str
+    header: str  # 본문 앞에 붙는 제목 줄 (한 번에 생성하면 빈 문자열)
+    prompt: str
+    max_output_tokens: Optional[int]
+    key: str  # 프롬프트 해시 (같으면 이전 본문 재사용)
+
+
+class ReportPipeline:
+    """
+    리포트 생성기
+
+    client는 generate_text(prompt) / stream_text(prompt, max_output_tokens)를 제공하는 Gemini 클라이언트입니다.
+    sections가 True면 리포트를 섹션별로 병렬 생성합니다.
+    llm_calls / prompt_chars는 누적 호출 수와 보낸 프롬프트 글자 수,
+    sections_generated / sections_reused는 누적 섹션 생성/재사용 수 (벤치마크/모니터링용)입니다.
+    """
+
+    def __init__(
+        self,
+        client,
+        concurrency: int = REPORT_MAP_CONCURRENCY,
+        sections: bool = REPORT_SECTION_PARALLEL,
+        section_concurrency: int = REPORT_SECTION_CONCURRENCY,
+    ):
+        self.client = client
+        self.sections = sections
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._section_semaphore = asyncio.Semaphore(section_concurrency)
+        # 요약("summary", 해시) / 섹션 본문("section", key) 캐시
+        self._cache = LRUCache(REPORT_SUMMARY_CACHE_SIZE, REPORT_SUMMARY_CACHE_TTL_SECONDS)
+        self.llm_calls = 0
+        self.prompt_chars = 0
+        self.sections_generated = 0
+        self.sections_reused = 0
+
+    async def _call(self, prompt: str) -> str:
+        async with self._semaphore:
+            self.llm_calls += 1
+            self.prompt_chars += len(prompt)
+            return await self.client.generate_text(prompt)
+
+    async def _summarize(self, prompt: str) -> Optional[str]:
+        """요약 (같은 프롬프트면 캐시된 결과, 실패하면 None)"""
+        key = ("summary", _prompt_key(prompt))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        summary = await self._call(prompt)
+        if _is_failed(summary):
+            logger.warning(f"[ReportPipeline] Summary failed: {(summary or '')[:100]}")
+            return None
+        self._cache.put(key, summary, None)
+        return summary
+
+    # === map ===
+
+    async def _condense_message(self, message: dict) -> dict:
+        """긴 메시지는 요약본으로 대체 (실패하면 원문 유지)"""
+        content = message.get("content_text") or ""
+        if len(content) <= REPORT_LONG_MESSAGE_CHARS:
+            return message
+        summary = await self._summarize(MESSAGE_SUMMARY_PROMPT.format(
+            role=message.get("role", "unknown"), content=content, max_chars=REPORT_MESSAGE_SUMMARY_CHARS,
+        ))
+        return {**message, "content_text": summary} if summary else message
+
+    async def summarize_round(self, round_index: Optional[int], messages: List[dict]) -> str:
+        """라운드 하나 요약 (짧은 라운드는 원문 그대로)"""
+        text = _conversation_text(messages)
+        if len(text) > REPORT_ROUND_MAX_INPUT_CHARS:
+            # 한 번에 요약하기엔 큰 라운드: 긴 메시지부터 따로 요약
+            condensed = await asyncio.gather(*(self._condense_message(m) for m in messages))
+            text = _conversation_text(condensed)
+        if len(text) <= REPORT_ROUND_SUMMARY_MIN_CHARS:
+            return text.strip()
+        label = _round_label(round_index)
+        summary = await self._summarize(ROUND_SUMMARY_PROMPT.format(
+            round_label=label, conversation_text=text, max_chars=REPORT_ROUND_SUMMARY_CHARS,
+        ))
+        # 요약 실패 시 (요약된) 원문으로 reduce
+        return summary or text.strip()
+
+    async def summarize_rounds(self, messages: List[dict]) -> Dict[int, str]:
+        """라운드별 요약 {round_index: 요약} (라운드 순서 유지)"""
+        rounds = _group_rounds(messages)
+        summaries = await asyncio.gather(*(self.summarize_round(r, msgs) for r, msgs in rounds))
+        # 같은 라운드가 떨어져 있으면(사용자 입력 등) 이어 붙임
+        return _merge_rounds([(round_index, summary) for (round_index, _), summary in zip(rounds, summaries)])
+
+    # === reduce ===
+
+    async def round_texts(self, messages: List[dict]) -> Tuple[Dict[int, str], bool]:
+        """
+        라운드별 리포트 입력 → ({round_index: 텍스트}, 요약 여부)
+
+        짧은 대화(REPORT_DIRECT_MAX_CHARS 이하)는 원문, 긴 대화는 라운드 요약입니다.
+        messages는 created_at 오름차순 (REPORT_MESSAGE_COLUMNS 포함)입니다.
+        """
+        conversation_text = _conversation_text(messages)
+        if len(conversation_text) <= REPORT_DIRECT_MAX_CHARS:
+            return _round_conversations(messages), False
+
+        summaries = await self.summarize_rounds(messages)
+        logger.info(
+            f"[ReportPipeline] Reduced {len(conversation_text)} chars "
+            f"to {sum(len(s) for s in summaries.values())} chars over {len(summaries)} rounds"
+        )
+        return summaries, True
+
+    def report_prompt(self, project_type: str, context: str) -> str:
+        """리포트 전체를 한 번에 생성하는 프롬프트"""
+        return REPORT_PROMPT.format(
+            context=context,
+            format_guide=format_guide(project_type),
+            char_limit=get_report_format(project_type).char_limit,
+        )
+
+    async def plan(
+        self, project_type: str, messages: List[dict], case_file: Optional[dict] = None
+    ) -> List[ReportSection]:
+        """
+        생성 계획 (필요하면 map 단계 요약 포함)
+
+        섹션별 생성이면 섹션마다 의존하는 라운드/CaseFile 필드만으로 프롬프트를 만들고
+        분량과 출력 토큰 상한은 섹션 수로 나눕니다. case_file은 저장소의 CaseFile 행입니다.
+        """
+        round_texts, summarized = await self.round_texts(report_inputs(messages))
+        if not self.sections:
+            prompt = self.report_prompt(project_type, _render_context(round_texts, summarized, case_file))
+            return [ReportSection("", "", prompt, None, _prompt_key(prompt))]
+
+        report_format = get_report_format(project_type)
+        outline = section_outline(project_type)
+        section_chars = report_format.char_limit // len(report_format.sections)
+        max_output_tokens = int(section_chars * REPORT_SECTION_TOKENS_PER_CHAR) + REPORT_SECTION_THINKING_TOKENS
+        plan = []
+        for index, spec in enumerate(report_format.sections, 1):
+            prompt = SECTION_PROMPT.format(
+                context=_render_context(round_texts, summarized, case_file, spec.rounds, spec.fields, spec.digests),
+                outline=outline, index=index, title=spec.title,
+                description=spec.description, char_limit=section_chars,
+            )
+            plan.append(ReportSection(
+                spec.title, f"## {index}. {spec.title}\n\n", prompt, max_output_tokens, _prompt_key(prompt)
+            ))
+        return plan
+
+    def format_version(self, project_type: str) -> str:
+        """저장된 리포트 재사용 판단용 양식 버전 (섹션별 생성 여부 포함)"""
+        return f"{format_version(project_type)}-{'sections' if self.sections else 'single'}"
+
+    async def generate(self, project_type: str, messages: List[dict], case_file: Optional[dict] = None) -> str:
+        """최종 리포트 생성 (generate_stream을 모두 이어 붙임)"""
+        return "".join([chunk async for chunk in self.generate_stream(project_type, messages, case_file)])
+
+    async def generate_stream(
+        self, project_type: str, messages: List[dict], case_file: Optional[dict] = None
+    ) -> AsyncGenerator[str, None]:
+        """최종 리포트 스트리밍 생성 (map 단계는 끝난 뒤 리포트 출력만 스트리밍, 오류는 예외)"""
+        plan = await self.plan(project_type, messages, case_file)
+        async for chunk in self.stream_plan(project_type, plan):
+            yield chunk
+
+    async def stream_plan(
+        self, project_type: str, plan: List[ReportSection], reuse: Optional[Dict[str, str]] = None
+    ) -> AsyncGenerator[str, None]:
+        """
+        계획대로 리포트 스트리밍 생성
+
+        reuse는 섹션 key → 본문 (이전 리포트의 섹션). reuse나 캐시에 있는 섹션은 다시 생성하지 않고
+        바로 내보내며, 새로 생성한 섹션 본문도 reuse에 채워 넣습니다.
+        """
+        reuse = {} if reuse is None else reuse
+        title = get_report_format(project_type).title
+        if self.sections and title:
+            yield f"# {title}\n\n"
+        async for chunk in self._stream_sections(plan, reuse):
+            yield chunk
+
+    async def _stream_sections(self, sections: List[ReportSection], reuse: Dict[str, str]) -> AsyncGenerator[str, None]:
+        """
+        섹션 병렬 생성 + 순서대로 스트리밍
+
+        섹션마다 큐를 두고 생성 작업이 chunk를 넣으면, 앞 섹션부터 차례로 큐를 비우며 내보냅니다.
+        한 섹션이 실패하면 모든 큐에 예외를 넣어 바로 전파하고 나머지는 취소합니다.
+        """
+        queues: List[asyncio.Queue] = [asyncio.Queue() for _ in sections]
+
+        async def produce(queue: asyncio.Queue, section: ReportSection):
+            try:
+                if section.header:
+                    await queue.put(section.header)
+                content = reuse.get(section.key)
+                if content is None:
+                    content = self._cache.get(("section", section.key))
+                if content is not None:
+                    self.sections_reused += 1
+                    await queue.put(content)
+                else:
+                    parts = []
+                    async with self._section_semaphore:
+                        self.llm_calls += 1
+                        self.prompt_chars += len(section.prompt)
+                        async for chunk in self.client.stream_text(
+                            section.prompt, max_output_tokens=section.max_output_tokens
+                        ):
+                            parts.append(chunk)
+                            await queue.put(chunk)
+                    content = "".join(parts)
+                    self.sections_generated += 1
+                    if content:
+                        self._cache.put(("section", section.key), content, None)
+                reuse[section.key] = content
+                if section.header:
+                    await queue.put("\n\n")
+                await queue.put(None)
+            except Exception as e:
+                for q in queues:
+                    q.put_nowait(e)
+
+        tasks = [asyncio.create_task(produce(queue, section)) for queue, section in zip(queues, sections)]
+        try:
+            for queue in queues:
+                while True:
+                    item = await queue.get()
+                    if item is None:
+                        break
+                    if isinstance(item, Exception):
+                        raise item
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "llm_calls": self.llm_calls,
+            "prompt_chars": self.prompt_chars,
+            "sections_generated": self.sections_generated,
+            "sections_reused": self.sections_reused,
+            "summary_cache": self._cache.stats(),
+        }
+
+
+# 싱글톤 인스턴스
+report_pipeline = ReportPipeline(gemini_client)
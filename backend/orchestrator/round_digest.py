@@ -0,0 +1,179 @@
+"""
+라운드 요약(rolling round digest) - phase 발언을 백그라운드로 압축해 라운드별로 누적
+
+에이전트는 messages=[]로 호출되고 CaseFile은 라운드 사이에 거의 비어 있었습니다
+(CaseFileUpdater가 연결되어 있지 않았음). phase가 끝나면 발언을 구조화된 요약
+(주장/결정/리스크/미해결 …)으로 압축해 CaseFile.round_digests에 누적하고,
+다음 phase들은 원문 대신 이 요약을 컨텍스트로 받습니다.
+
+- schedule()은 바로 반환 (요약은 다음 phase 진행과 겹쳐서 실행, 세션 안에서는 순서대로)
+- 종합(agent3) 발언의 요약은 CaseFileUpdater.update_on_round_end로 결정사항/미해결/가정/검증계획에 반영
+- 라운드 종료(ROUND_END) 전에 drain()으로 남은 요약을 기다림 (DIGEST_DRAIN_TIMEOUT_SECONDS 상한)
+- CaseFile에는 append 패치로만 씀 (문서를 읽어 고친 뒤 통째로 쓰지 않음 → 동시 쓰기와 충돌해도
+  재시도 때 최신 문서에 다시 적용됨). 새 항목이 없는 요약은 쓰지 않음
+- 요약 실패는 로그만 남김 (컨텍스트는 직전 발언/관련 조각으로 대체됨)
+"""
+import asyncio
+import logging
+from typing import Dict, List, Optional, Set
+
+from agents.base_agent import gemini_client
+from config import DIGEST_INPUT_MAX_CHARS, DIGEST_MAX_ITEMS, DIGEST_DRAIN_TIMEOUT_SECONDS
+from models.case_file import CaseFile
+from models.message import Agent3Response
+from prompts.digest import DIGEST_PROMPT, DIGEST_SCHEMA, DIGEST_LABELS
+from storage.case_file_patch import CaseFilePatch
+from storage.write_batcher import write_batcher
+from .case_file_updater import CaseFileUpdater, case_file_updater
+
+logger = logging.getLogger(__name__)
+
+# 요약을 CaseFileUpdater로 CaseFile에 반영하는 종합 역할
+SYNTHESIZER_ROLES = ("agent3",)
+
+DIGEST_FIELDS = ("claims", "decisions", "risks", "open_issues", "assumptions", "next_experiments")
+
+# CaseFileUpdater가 갱신하는 필드
+_UPDATER_FIELDS = ("decisions", "open_issues", "assumptions", "next_experiments")
+# update_on_round_end의 키워드 분류용 접두어 (저장 전에 뗌)
+_UPDATER_PREFIXES = {"open_issues": "미해결: ", "assumptions": "가정: "}
+# CaseFile.trim_to_limits와 같은 상한
+_UPDATER_LIMITS = {"decisions": 10, "open_issues": 5, "assumptions": 5, "next_experiments": 5}
+
+
+def digest_patch(round_index: int, digest: dict, role: str, phase: str) -> CaseFilePatch:
+    """
+    phase 요약 하나를 라운드 요약에 합치는 패치 (항목별 중복 제거, 최근 DIGEST_MAX_ITEMS개)
+
+    새 항목이 없으면 빈 패치
+    """
+    patch = CaseFilePatch()
+    for field in DIGEST_FIELDS:
+        items = [str(item).strip() for item in digest.get(field) or []]
+        items = [f"{role}: {item}" if field == "claims" else item for item in items if item]
+        if items:
+            patch.append(f"round_digests.{round_index}.{field}", items, unique=True, limit=DIGEST_MAX_ITEMS)
+    if not patch.is_empty():
+        patch.append(f"round_digests.{round_index}.phases", [phase])
+    return patch
+
+
+def digest_items(round_digests: Optional[Dict[str, dict]]) -> List[str]:
+    """컨텍스트 블록 항목 (라운드 오래된 순 → "R1 결정: …")"""
+    items = []
+    for round_key in sorted(round_digests or {}, key=lambda k: int(k) if str(k).isdigit() else 0):
+        digest = round_digests[round_key]
+        for field, label in DIGEST_LABELS.items():
+            items.extend(f"R{round_key} {label}: {item}" for item in digest.get(field) or [])
+    return items
+
+
+class RoundDigester:
+    """
+    phase 발언 요약기
+
+    client는 generate_json(prompt, json_schema)을 가진 클라이언트(GeminiClient),
+    batcher는 CaseFile을 읽고 패치할 WriteBatcher입니다.
+    """
+
+    def __init__(self, client, batcher, updater: CaseFileUpdater = case_file_updater):
+        self.client = client
+        self._batcher = batcher
+        self._updater = updater
+        self._tails: Dict[str, asyncio.Task] = {}  # 세션별 마지막 요약 작업 (순서 보장)
+        self._tasks: Set[asyncio.Task] = set()
+        self.digested = 0
+        self.failed = 0
+
+    def schedule(self, session_id: str, round_index: int, phase: str, role: str, content: str):
+        """발언 요약 예약 (바로 반환)"""
+        if not content or not content.strip():
+            return
+        previous = self._tails.get(session_id)
+        task = asyncio.create_task(self._run(previous, session_id, round_index, phase, role, content))
+        self._tails[session_id] = task
+        self._tasks.add(task)
+        task.add_done_callback(lambda t: self._done(session_id, t))
+
+    def _done(self, session_id: str, task: asyncio.Task):
+        self._tasks.discard(task)
+        if self._tails.get(session_id) is task:
+            del self._tails[session_id]
+
+    async def drain(self, session_id: str, timeout: float = DIGEST_DRAIN_TIMEOUT_SECONDS):
+        """세션의 남은 요약을 기다림 (timeout이 지나면 기다리지 않고 진행, 요약은 계속 실행)"""
+        task = self._tails.get(session_id)
+        if not task:
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[Digest] Drain timed out for {session_id}")
+
+    def is_busy(self, session_id: str) -> bool:
+        task = self._tails.get(session_id)
+        return task is not None and not task.done()
+
+    def forget_session(self, session_id: str):
+        """끝난 요약 작업 제거 (실행 중이면 그대로 둠)"""
+        if not self.is_busy(session_id):
+            self._tails.pop(session_id, None)
+
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용)"""
+        return {"tails": self._tails}
+
+    async def stop(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(
+        self, previous: Optional[asyncio.Task], session_id: str, round_index: int, phase: str, role: str, content: str
+    ):
+        if previous:
+            await asyncio.gather(previous, return_exceptions=True)
+        try:
+            await self._digest(session_id, round_index, phase, role, content)
+            self.digested += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"[Digest] Failed {session_id}/{phase}: {e}", exc_info=True)
+
+    async def _digest(self, session_id: str, round_index: int, phase: str, role: str, content: str):
+        prompt = DIGEST_PROMPT.format(
+            round_index=round_index, phase=phase, role=role, content=content[:DIGEST_INPUT_MAX_CHARS]
+        )
+        digest = await self.client.generate_json(prompt=prompt, json_schema=DIGEST_SCHEMA)
+        if not isinstance(digest, dict) or "error" in digest:
+            raise RuntimeError((digest or {}).get("error") if isinstance(digest, dict) else "invalid digest")
+
+        patch = digest_patch(round_index, digest, role, phase)
+        if patch.is_empty():
+            logger.debug(f"[Digest] {session_id}/{phase}: nothing new")
+            return
+
+        if role in SYNTHESIZER_ROLES and digest.get("decisions"):
+            # 빈 CaseFile로 분류만 하고 결과는 append (현재 문서를 읽지 않음)
+            updated = self._updater.update_on_round_end(CaseFile(session_id=session_id), Agent3Response(
+                conclusion=digest["decisions"][0],
+                # update_on_round_end가 키워드로 미해결/가정을 분류
+                reasoning_summary=[
+                    f"{prefix}{item}" for field, prefix in _UPDATER_PREFIXES.items() for item in digest.get(field) or []
+                ],
+                two_week_validation=list(digest.get("next_experiments") or []),
+            ))
+            for field in _UPDATER_FIELDS:
+                prefix = _UPDATER_PREFIXES.get(field)
+                items = [item.removeprefix(prefix) for item in getattr(updated, field)] if prefix else getattr(updated, field)
+                if items:
+                    patch.append(field, items, limit=_UPDATER_LIMITS[field])
+
+        await self._batcher.patch_case_file(session_id, patch)
+        logger.debug(f"[Digest] {session_id}/{phase}: {patch.fields()}")
+
+
+# 싱글톤 인스턴스
+round_digester = RoundDigester(gemini_client, write_batcher)
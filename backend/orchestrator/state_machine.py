@@ -575,6 +575,48 @@ class StateMachine:
     def get_buffered_input(self, session_id: str) -> Optional[str]:
         """버퍼된 입력 반환 및 삭제"""
         return self._input_buffers.pop(session_id, None)
+    
+    # 세션 수명 관리 (SessionLifecycleManager가 유휴 세션 정리 시 사용)
+    def is_busy(self, session_id: str) -> bool:
+        """세션 락이 잡혀 있는지 (실행 중이면 정리하지 않음)"""
+        lock = self._locks.get(session_id)
+        return bool(lock and lock.locked())
+    
+    def export_state(self, session_id: str) -> dict:
+        """정리 전에 저장소로 옮겨야 하는 상태 (없으면 빈 dict)"""
+        state = {}
+        if self.is_aborted(session_id):
+            state["aborted"] = True
+        if self._request_cache.get(session_id):
+            state["request_cache"] = dict(self._request_cache[session_id])
+        if session_id in self._input_buffers:
+            state["input_buffer"] = self._input_buffers[session_id]
+        return state
+    
+    def restore_state(self, session_id: str, state: dict):
+        """export_state로 저장했던 상태 복원"""
+        if state.get("aborted"):
+            self.abort_session(session_id)
+        if state.get("request_cache"):
+            self._request_cache.setdefault(session_id, {}).update(state["request_cache"])
+        if "input_buffer" in state and session_id not in self._input_buffers:
+            self._input_buffers[session_id] = state["input_buffer"]
+    
+    def forget_session(self, session_id: str):
+        """세션의 프로세스 내 상태 제거"""
+        self._locks.pop(session_id, None)
+        self._abort_events.pop(session_id, None)
+        self._request_cache.pop(session_id, None)
+        self._input_buffers.pop(session_id, None)
+    
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용)"""
+        return {
+            "locks": self._locks,
+            "abort_events": self._abort_events,
+            "request_cache": self._request_cache,
+            "input_buffers": self._input_buffers,
+        }
 
 
 # 싱글톤 인스턴스
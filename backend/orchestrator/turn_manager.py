@@ -16,6 +16,7 @@ import logging
 from typing import Optional, Dict, Callable, Any
 from datetime import datetime
 
+from config import CONTEXT_DEFAULT_TOKENS
 from .state_machine import (
     Phase, 
     MAX_ROUNDS, 
@@ -32,33 +33,36 @@ from .state_machine import (
 logger = logging.getLogger(__name__)
 
 
-# Phase별 턴 설명 및 글자 수 제한
+# Phase별 턴 설명, 글자 수 제한, 컨텍스트 토큰 예산
 PHASE_CONFIG = {
     # Round 1
-    Phase.A1_R1_PLAN: {"description": "초기 구현 계획 제시 (MVP/KPI 포함)", "max_chars": 600},
-    Phase.A2_R1_CRIT: {"description": "핵심 비판 및 리스크 Top 3 지적", "max_chars": 400},
-    Phase.A3_R1_SYN: {"description": "1차 절충안 제시", "max_chars": 400},
-    Phase.V_R1_AUDIT: {"description": "1차 라운드 검증 및 Round 2 방향 제시", "max_chars": 400},
+    Phase.A1_R1_PLAN: {"description": "초기 구현 계획 제시 (MVP/KPI 포함)", "max_chars": 600, "context_tokens": 800},
+    Phase.A2_R1_CRIT: {"description": "핵심 비판 및 리스크 Top 3 지적", "max_chars": 400, "context_tokens": 1200},
+    Phase.A3_R1_SYN: {"description": "1차 절충안 제시", "max_chars": 400, "context_tokens": 1500},
+    Phase.V_R1_AUDIT: {"description": "1차 라운드 검증 및 Round 2 방향 제시", "max_chars": 400, "context_tokens": 1500},
     
     # Round 2 (Agent1 없음!)
-    Phase.A2_R2_CRIT: {"description": "새로운/남은 리스크만 지적 (기존 반복 금지)", "max_chars": 400},
-    Phase.A3_R2_SYN: {"description": "2차 절충안 및 결정 초안", "max_chars": 400},
-    Phase.V_R2_GATE: {"description": "Gate 판정 (Go/Conditional/No-Go)", "max_chars": 400},
+    Phase.A2_R2_CRIT: {"description": "새로운/남은 리스크만 지적 (기존 반복 금지)", "max_chars": 400, "context_tokens": 1200},
+    Phase.A3_R2_SYN: {"description": "2차 절충안 및 결정 초안", "max_chars": 400, "context_tokens": 1500},
+    Phase.V_R2_GATE: {"description": "Gate 판정 (Go/Conditional/No-Go)", "max_chars": 400, "context_tokens": 1500},
     
     # Round 3
-    Phase.A2_R3_LASTCHECK: {"description": "최종 경고 1~2개만", "max_chars": 300},
-    Phase.A3_R3_FINAL: {"description": "최종 결정문 작성", "max_chars": 1500},
-    Phase.V_R3_SIGNOFF: {"description": "최종 서명 (Approved/Conditional/Rejected)", "max_chars": 500},
+    Phase.A2_R3_LASTCHECK: {"description": "최종 경고 1~2개만", "max_chars": 300, "context_tokens": 1200},
+    Phase.A3_R3_FINAL: {"description": "최종 결정문 작성", "max_chars": 1500, "context_tokens": 2500},
+    Phase.V_R3_SIGNOFF: {"description": "최종 서명 (Approved/Conditional/Rejected)", "max_chars": 500, "context_tokens": 2000},
 }
 
 
+_DEFAULT_PHASE_CONFIG = {"description": "unknown", "max_chars": 300, "context_tokens": CONTEXT_DEFAULT_TOKENS}
+
+
 def get_phase_config(phase: str) -> dict:
-    """Phase의 설정(description, max_chars) 반환"""
+    """Phase의 설정(description, max_chars, context_tokens) 반환"""
     try:
         phase_enum = Phase(phase)
-        return PHASE_CONFIG.get(phase_enum, {"description": "unknown", "max_chars": 300})
+        return PHASE_CONFIG.get(phase_enum, dict(_DEFAULT_PHASE_CONFIG))
     except ValueError:
-        return {"description": "unknown", "max_chars": 300}
+        return dict(_DEFAULT_PHASE_CONFIG)
 
 
 class TurnManager:
@@ -156,7 +160,8 @@ class TurnManager:
                 return phase
                 
             finally:
-                self._running_sessions[session_id] = False
+                # False로 남겨 두면 세션마다 항목이 쌓이므로 제거
+                self._running_sessions.pop(session_id, None)
     
     def _extract_gate_status(self, result: Any) -> Optional[str]:
         """Verifier 응답에서 gate_status 추출"""
@@ -178,6 +183,18 @@ class TurnManager:
     def is_running(self, session_id: str) -> bool:
         """세션이 현재 실행 중인지 확인"""
         return self._running_sessions.get(session_id, False)
+    
+    def is_busy(self, session_id: str) -> bool:
+        return self.is_running(session_id)
+    
+    def forget_session(self, session_id: str):
+        """실행 중이 아닌 세션의 항목 제거"""
+        if not self.is_running(session_id):
+            self._running_sessions.pop(session_id, None)
+    
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용)"""
+        return {"running_sessions": self._running_sessions}
 
 
 # 싱글톤 인스턴스
@@ -0,0 +1,46 @@
+"""
+라운드 요약(digest) 프롬프트 - phase 발언 하나를 구조화된 항목으로 압축
+
+phase가 끝날 때마다 백그라운드로 호출해 CaseFile.round_digests[라운드]에 누적합니다 (orchestrator/round_digest.py).
+다음 phase들은 원문 대신 이 요약을 컨텍스트로 받습니다.
+"""
+
+DIGEST_PROMPT = """
+다음은 AI 에이전트 토론 {round_index}라운드 {phase} 단계에서 {role}가 한 발언입니다.
+다음 발언자가 원문 없이도 논의를 이어갈 수 있도록 핵심만 항목별로 뽑아주세요.
+
+- claims: 이 발언의 핵심 주장과 근거 (수치/조건 포함, 항목당 한 문장)
+- decisions: 합의되었거나 제안된 결정사항
+- risks: 지적된 리스크/반론
+- open_issues: 아직 결론나지 않은 쟁점이나 추가 확인이 필요한 사항
+- assumptions: 발언이 전제로 삼은 가정
+- next_experiments: 제안된 검증 실험/다음 액션
+
+해당 내용이 없으면 빈 목록으로 두고, 각 항목은 80자 이내로 작성하세요.
+
+[발언]
+{content}
+"""
+
+_ITEMS = {"type": "array", "items": {"type": "string"}}
+
+DIGEST_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "claims": _ITEMS,
+        "decisions": _ITEMS,
+        "risks": _ITEMS,
+        "open_issues": _ITEMS,
+        "assumptions": _ITEMS,
+        "next_experiments": _ITEMS,
+    },
+    "required": ["claims", "decisions", "risks", "open_issues"],
+}
+
+# 라운드 요약 항목 → 컨텍스트 표시 이름
+DIGEST_LABELS = {
+    "claims": "주장",
+    "decisions": "결정",
+    "risks": "리스크",
+    "open_issues": "미해결",
+}
@@ -0,0 +1,186 @@
+"""
+최종 리포트 프롬프트 - 프로젝트 타입별 양식 + map-reduce 요약
+
+finalize / report generate가 각자 들고 있던 양식(format_guide)을 한 곳에 모읍니다.
+양식은 섹션 목록으로 정의하고 format_guide()가 기존과 같은 텍스트로 렌더링합니다.
+양식/프롬프트를 고치면 format_version()이 바뀌어 저장된 리포트가 stale로 취급됩니다.
+
+리포트 프롬프트는 컨텍스트(CaseFile + 대화 원문 또는 라운드 요약) 뒤에 작성 지시를 붙입니다.
+섹션은 의존하는 라운드와 CaseFile 필드를 선언하고, 섹션별 생성 시 그 입력만으로 컨텍스트를 만듭니다.
+입력이 바뀌지 않은 섹션은 다시 생성하지 않습니다 (orchestrator/report_pipeline.py).
+
+대부분의 섹션은 앞 라운드(고정 번호)와 사전 단계에 정해지는 CaseFile 필드만 읽어 라운드가 끝나면 입력이
+더 바뀌지 않고, 마지막 라운드(-1)를 읽는 마무리 섹션만 finalize 직전 입력(사용자 추가 발언 등)에 따라 다시 생성됩니다.
+"""
+import hashlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# 양식 외적인 변경(후처리 등)으로 리포트를 다시 만들어야 할 때 올림
+REPORT_FORMAT_REVISION = 1
+
+
+class ReportSectionSpec(NamedTuple):
+    """리포트 섹션 하나와 그 입력"""
+    title: str
+    description: str  # 작성 내용
+    # 의존하는 라운드 (0은 사전 단계, 음수는 마지막 라운드 기준: -1 = 마지막 라운드, None이면 전체)
+    # 라운드마다 바뀌지 않도록 고정 번호나 -1로 지정 (None은 라운드가 늘 때마다 다시 생성됨)
+    rounds: Optional[Tuple[int, ...]] = (-1,)
+    # 의존하는 CaseFile 필드 (비어 있으면 CaseFile 요약)
+    fields: Tuple[str, ...] = ()
+    # 전체 라운드 요약(CaseFile.round_digests)을 함께 읽음 (마무리 섹션용, phase가 끝날 때마다 바뀜)
+    digests: bool = False
+
+
+class ReportFormat(NamedTuple):
+    """프로젝트 타입별 리포트 양식"""
+    title: str  # 양식 이름 (빈 문자열이면 "[작성 양식]")
+    char_limit: int  # 전체 분량 (공백 포함 글자 수, 섹션별 생성 시 섹션 수로 나눔)
+    sections: List[ReportSectionSpec]
+
+
+REPORT_FORMATS: Dict[str, ReportFormat] = {
+    "legal": ReportFormat(
+        title="법률 분석 리포트",
+        char_limit=4000,
+        sections=[
+            ReportSectionSpec("사안 요약", "사건 개요 및 핵심 쟁점 정리", rounds=(0, 1),
+                              fields=("case_overview", "parties", "confirmed_facts")),
+            ReportSectionSpec("법적 분석", "관련 법령 및 판례 적용 분석", rounds=(1, 2), fields=("disputed_facts",)),
+            ReportSectionSpec("원고측 주장 정리", "원고측의 핵심 주장 및 근거", rounds=(1, 2),
+                              fields=("confirmed_facts",)),
+            ReportSectionSpec("피고측 주장 정리", "피고측의 핵심 주장 및 근거", rounds=(1, 2),
+                              fields=("confirmed_facts",)),
+            ReportSectionSpec("승소 가능성 평가", "각 쟁점별 승패 예측", rounds=(2,),
+                              fields=("confirmed_facts", "disputed_facts")),
+            ReportSectionSpec("리스크 분석", "잠재적 리스크 및 대응 전략", rounds=(2,),
+                              fields=("disputed_facts", "missing_facts_questions")),
+            ReportSectionSpec("권고안", "실행 가능한 전략적 권고사항", rounds=(-1,), digests=True,
+                              fields=("legal_steering", "disputed_facts")),
+            ReportSectionSpec("향후 절차", "다음 진행 단계 및 일정", rounds=(-1,),
+                              fields=("missing_facts_questions", "legal_steering")),
+        ],
+    ),
+    "dev_project": ReportFormat(
+        title="개발 프로젝트 리포트",
+        char_limit=4000,
+        sections=[
+            ReportSectionSpec("프로젝트 개요", "목표 및 범위 요약", rounds=(1,), fields=("goals", "constraints")),
+            ReportSectionSpec("핵심 결정사항", "채택된 기술 스택, 아키텍처, 주요 결정", rounds=(1, 2),
+                              fields=("decisions_so_far", "decisions")),
+            ReportSectionSpec("범위 정의", "포함 범위(In-Scope) 및 제외 범위(Out-Scope)", rounds=(1,),
+                              fields=("scope_in", "scope_out")),
+            ReportSectionSpec("기능 명세", "주요 기능 및 사용자 스토리", rounds=(1, 2), fields=("scope_in",)),
+            ReportSectionSpec("기술 구현 가이드", "구체적인 기술 구현 방향", rounds=(2,),
+                              fields=("tech_artifacts_summary", "decisions_so_far")),
+            ReportSectionSpec("UX/UI 가이드", "디자인 방향 및 사용자 경험 고려사항", rounds=(1, 2),
+                              fields=("ux_artifacts_summary",)),
+            ReportSectionSpec("일정 및 마일스톤", "주차별 로드맵 (최소 4주)", rounds=(-1,),
+                              fields=("decisions_so_far", "scope_in", "constraints")),
+            ReportSectionSpec("리스크 및 대응", "예상 리스크 및 완화 전략", rounds=(-1,), digests=True,
+                              fields=("risks_so_far",)),
+            ReportSectionSpec("성공 지표(KPI)", "측정 가능한 성공 기준", rounds=(1, 2), fields=("goals",)),
+        ],
+    ),
+    "general": ReportFormat(
+        title="",
+        char_limit=2000,
+        sections=[
+            ReportSectionSpec("종합 결론", "토론의 핵심 결과 요약", rounds=(1, 2), digests=True,
+                              fields=("decisions", "open_issues")),
+            ReportSectionSpec("실행 방안", "구체적인 실행 단계 및 계획", rounds=(-1,),
+                              fields=("decisions", "next_experiments", "constraints")),
+            ReportSectionSpec("구현 방향", "기술적/실무적 구현 가이드", rounds=(2,),
+                              fields=("decisions", "assumptions", "constraints")),
+        ],
+    ),
+}
+
+
+def get_report_format(project_type: str) -> ReportFormat:
+    """프로젝트 타입의 리포트 양식 (알 수 없는 타입은 general)"""
+    return REPORT_FORMATS.get(project_type) or REPORT_FORMATS["general"]
+
+
+def section_outline(project_type: str) -> str:
+    """섹션 목차 텍스트 (섹션별 생성 시 다른 섹션과 겹치지 않게 전체 구성을 알려줌)"""
+    report_format = get_report_format(project_type)
+    return "\n".join(f"{i}. {section.title}" for i, section in enumerate(report_format.sections, 1))
+
+
+def format_guide(project_type: str) -> str:
+    """작성 양식 텍스트"""
+    report_format = get_report_format(project_type)
+    header = f"[작성 양식 - {report_format.title}]" if report_format.title else "[작성 양식]"
+    lines = [
+        f"    {i}. **{section.title}**: {section.description}" for i, section in enumerate(report_format.sections, 1)
+    ]
+    return "\n".join([header, *lines])
+
+
+# 컨텍스트: CaseFile + 라운드별 대화 원문(짧은 세션) 또는 라운드별 요약(긴 세션)
+REPORT_CONTEXT = """다음은 AI 에이전트들이 나눈 {source}입니다.
+
+[누적 메모 (CaseFile)]
+{case_file_summary}
+
+[{rounds_label}]
+{rounds_text}"""
+
+# map: 긴 메시지 하나 요약
+MESSAGE_SUMMARY_PROMPT = """
+다음은 토론 참여자({role})의 발언입니다.
+최종 보고서 작성에 필요한 주장, 근거, 수치, 결정, 리스크를 빠짐없이 남기고
+나머지는 덜어내어 {max_chars}자 이내로 요약해주세요. 요약문만 출력하세요.
+
+[발언]
+{content}
+"""
+
+# map: 라운드 하나 요약
+ROUND_SUMMARY_PROMPT = """
+다음은 AI 에이전트 토론의 {round_label} 내용입니다.
+이 라운드에서 나온 핵심 주장(발언자별), 합의/결정사항, 반론과 미해결 쟁점, 리스크, 구체적인 수치와 일정을
+{max_chars}자 이내로 정리해주세요. 요약문만 출력하세요.
+
+[{round_label} 내용]
+{conversation_text}
+"""
+
+# 리포트 전체를 한 번에 생성
+REPORT_PROMPT = """
+{context}
+
+이 내용을 바탕으로 최종 결론 보고서를 작성해주세요.
+
+{format_guide}
+
+분량은 공백 포함 {char_limit}자 정도로 구체적이고 상세하게 서술해주세요.
+각 섹션에 충분한 내용을 담아 실질적으로 활용 가능한 보고서를 작성해주세요.
+"""
+
+# 섹션 하나 생성 (섹션별 병렬 생성)
+SECTION_PROMPT = """
+{context}
+
+이 내용을 바탕으로 최종 결론 보고서를 섹션별로 나누어 작성하고 있습니다.
+
+[보고서 목차]
+{outline}
+
+이번에 작성할 섹션: {index}. {title} - {description}
+
+다른 섹션은 따로 작성되므로 이 섹션에 해당하는 내용만 작성하세요.
+섹션 제목은 쓰지 말고 본문만 출력하세요.
+분량은 공백 포함 {char_limit}자 정도로 구체적이고 실질적으로 활용 가능하게 서술해주세요.
+"""
+
+
+def format_version(project_type: str) -> str:
+    """리포트 양식 버전 (양식 + 프롬프트 + REPORT_FORMAT_REVISION의 해시)"""
+    source = repr((
+        REPORT_FORMAT_REVISION, get_report_format(project_type),
+        REPORT_CONTEXT, REPORT_PROMPT, SECTION_PROMPT,
+        MESSAGE_SUMMARY_PROMPT, ROUND_SUMMARY_PROMPT,
+    ))
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
@@ -0,0 +1 @@
+"""Rendering package - 리포트 Markdown → HTML/PDF (프로세스 풀 작업자가 가볍게 임포트하도록 의존성 없음)"""
@@ -0,0 +1,152 @@
+"""
+리포트 Markdown 렌더링 (HTML / PDF)
+
+일괄 내보내기(api/export.py)가 프로세스 풀에서 호출하므로 이 모듈은 앱 설정/저장소를 임포트하지 않습니다.
+
+- HTML: markdown 패키지가 있으면 사용, 없으면 리포트에 쓰이는 문법(제목, 목록, 강조, 코드, 구분선)만 변환
+- PDF: weasyprint 패키지가 있을 때만 (HTML을 PDF로 변환)
+"""
+import html
+import re
+from typing import Callable, Dict, List
+
+try:
+    import markdown as markdown_lib
+except ImportError:
+    markdown_lib = None
+
+try:
+    import weasyprint
+except ImportError:
+    weasyprint = None
+
+_HEADING = re.compile(r"(#{1,6})\s+(.*)")
+_LIST_ITEM = re.compile(r"([-*+]|\d+[.)])\s+(.*)")
+_RULE = re.compile(r"(-{3,}|\*{3,}|_{3,})")
+_INLINE = [
+    (re.compile(r"`([^`]+)`"), r"<code>\1</code>"),
+    (re.compile(r"\*\*(.+?)\*\*"), r"<strong>\1</strong>"),
+    (re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])"), r"<em>\1</em>"),
+]
+
+_DOCUMENT = """<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: "Noto Sans KR", "Apple SD Gothic Neo", sans-serif; max-width: 820px; margin: 2rem auto;
+       padding: 0 1rem; line-height: 1.7; color: #1f2328; }}
+h1, h2, h3 {{ line-height: 1.3; }}
+h2 {{ border-bottom: 1px solid #d0d7de; padding-bottom: .3rem; }}
+code {{ background: #f6f8fa; padding: .1rem .3rem; border-radius: 4px; }}
+pre code {{ display: block; padding: .8rem; overflow-x: auto; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def _inline(text: str) -> str:
+    text = html.escape(text, quote=False)
+    for pattern, replacement in _INLINE:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def _basic_markdown(text: str) -> str:
+    """markdown 패키지가 없을 때 쓰는 최소 변환기"""
+    out: List[str] = []
+    paragraph: List[str] = []
+    code: List[str] = []
+    list_tag = None
+    in_code = False
+
+    def flush_paragraph():
+        if paragraph:
+            out.append(f"<p>{'<br>'.join(_inline(line) for line in paragraph)}</p>")
+            paragraph.clear()
+
+    def close_list():
+        nonlocal list_tag
+        if list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            if in_code:
+                out.append(f"<pre><code>{html.escape(chr(10).join(code), quote=False)}</code></pre>")
+                code.clear()
+            else:
+                flush_paragraph()
+                close_list()
+            in_code = not in_code
+            continue
+        if in_code:
+            code.append(line)
+            continue
+        if not stripped:
+            flush_paragraph()
+            close_list()
+            continue
+
+        heading = _HEADING.fullmatch(stripped)
+        if heading:
+            flush_paragraph()
+            close_list()
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+            continue
+        if _RULE.fullmatch(stripped):
+            flush_paragraph()
+            close_list()
+            out.append("<hr>")
+            continue
+        item = _LIST_ITEM.fullmatch(stripped)
+        if item:
+            flush_paragraph()
+            tag = "ol" if item.group(1)[0].isdigit() else "ul"
+            if list_tag != tag:
+                close_list()
+                out.append(f"<{tag}>")
+                list_tag = tag
+            out.append(f"<li>{_inline(item.group(2))}</li>")
+            continue
+        close_list()
+        paragraph.append(stripped)
+
+    if in_code:
+        out.append(f"<pre><code>{html.escape(chr(10).join(code), quote=False)}</code></pre>")
+    flush_paragraph()
+    close_list()
+    return "\n".join(out)
+
+
+def render_html(markdown_text: str, title: str = "") -> str:
+    """리포트 Markdown → HTML 문서"""
+    if markdown_lib:
+        body = markdown_lib.markdown(markdown_text or "", extensions=["extra", "sane_lists"])
+    else:
+        body = _basic_markdown(markdown_text or "")
+    return _DOCUMENT.format(title=html.escape(title or "리포트"), body=body)
+
+
+def render_pdf(markdown_text: str, title: str = "") -> bytes:
+    """리포트 Markdown → PDF (weasyprint 필요)"""
+    if not weasyprint:
+        raise RuntimeError("PDF rendering requires the weasyprint package")
+    return weasyprint.HTML(string=render_html(markdown_text, title)).write_pdf()
+
+
+# 형식(= 파일 확장자) → 렌더러
+RENDERERS: Dict[str, Callable] = {"html": render_html, "pdf": render_pdf}
+
+
+def available_formats() -> List[str]:
+    """이 환경에서 렌더링 가능한 형식"""
+    return ["html", "pdf"] if weasyprint else ["html"]
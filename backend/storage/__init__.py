@@ -1,2 +1,73 @@
 """Storage package"""
 from .memory_store import MemoryStore, memory_store
+from .base import StorageBackend
+
+_storage: StorageBackend = None
+_search_index = None
+_vector_index = None
+
+
+def get_search_index():
+    """검색 색인 싱글톤 (memory 백엔드면 색인도 메모리)"""
+    global _search_index
+    if _search_index is None:
+        from config import STORAGE_BACKEND, SEARCH_INDEX_PATH
+        from .search_index import SearchIndex
+        _search_index = SearchIndex(":memory:" if STORAGE_BACKEND == "memory" else SEARCH_INDEX_PATH)
+    return _search_index
+
+
+def get_vector_index():
+    """세션별 벡터 색인 싱글톤 (프로세스 메모리)"""
+    global _vector_index
+    if _vector_index is None:
+        from .vector_index import VectorIndex
+        _vector_index = VectorIndex()
+    return _vector_index
+
+
+def get_storage() -> StorageBackend:
+    """
+    설정(STORAGE_BACKEND)에 맞는 저장소 싱글톤 반환
+
+    - supabase: Supabase(PostgREST) 운영 저장소
+    - sqlite: SQLITE_PATH 파일 저장소 (WAL)
+    - memory: 프로세스 내 SQLite(:memory:) 저장소 (테스트/벤치마크용)
+
+    백엔드 모듈은 선택된 경우에만 임포트합니다 (sqlite 사용 시 supabase 패키지 불필요).
+    SEARCH_ENABLED이면 쓰기 시 전문 검색 색인(SearchIndexingStorage)을 갱신합니다.
+    VECTOR_INDEX_ENABLED이면 메모리에 올라온 세션의 벡터 색인(VectorIndexingStorage)도 갱신합니다.
+    아카이브된 세션의 메시지는 ArchivingStorage가 아카이브에서 읽어 줍니다.
+    L1_CACHE_ENABLED이면 세션/CaseFile L1 캐시(CachedStorage)를 앞에 둡니다.
+    """
+    global _storage
+    if _storage is None:
+        from config import STORAGE_BACKEND, SQLITE_PATH, L1_CACHE_ENABLED, SEARCH_ENABLED, VECTOR_INDEX_ENABLED
+
+        if STORAGE_BACKEND == "supabase":
+            from .supabase_client import SupabaseStorage
+            _storage = SupabaseStorage()
+        elif STORAGE_BACKEND == "sqlite":
+            from .sqlite_store import SQLiteStorage
+            _storage = SQLiteStorage(SQLITE_PATH)
+        elif STORAGE_BACKEND == "memory":
+            from .sqlite_store import SQLiteStorage
+            _storage = SQLiteStorage(":memory:")
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {STORAGE_BACKEND}")
+
+        from .archive import ArchivingStorage, transcript_archive
+        _storage = ArchivingStorage(_storage, transcript_archive)
+
+        if SEARCH_ENABLED:
+            from .search_index import SearchIndexingStorage
+            _storage = SearchIndexingStorage(_storage, get_search_index())
+
+        if VECTOR_INDEX_ENABLED:
+            from .vector_index import VectorIndexingStorage
+            _storage = VectorIndexingStorage(_storage, get_vector_index())
+
+        if L1_CACHE_ENABLED:
+            from .cache import CachedStorage, invalidation_bus
+            _storage = CachedStorage(_storage, invalidation_bus)
+    return _storage
@@ -0,0 +1,283 @@
+"""
+종료 세션 대화 기록 아카이브 (cold storage)
+
+finalized/completed 후 ARCHIVE_AFTER_DAYS가 지난 세션의 messages를 세션당
+압축 blob 하나로 옮기고 hot 테이블에서 삭제합니다. 테이블/인덱스 크기가
+진행 중인 세션 위주로 유지되어 세션별 조회가 느려지지 않습니다.
+
+- 압축: ARCHIVE_CODEC (기본 zstd, zlib도 가능). 읽을 때는 확장자로 codec을 정하고
+  지원하지 않거나 이 환경에서 풀 수 없는 codec이면 UnsupportedCodecError (설치된 패키지에 따라 바꾸지 않음)
+- 저장 위치: ARCHIVE_DIR (로컬 디렉터리 = 버킷 stand-in, 파일명이 곧 객체 키)
+- 조회: ArchivingStorage가 hot 테이블에 없는 세션을 아카이브에서 투명하게 읽음
+- manifest.json에 세션별 원본/압축 크기를 기록해 회수 공간을 보고
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from config import ARCHIVE_DIR, ARCHIVE_AFTER_DAYS, ARCHIVE_CODEC
+from storage.base import (
+    StorageBackend, StorageProxy, MESSAGE_ALL_COLUMNS, MESSAGE_DEFAULT_COLUMNS, decode_cursor,
+)
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# codec → 파일 확장자
+CODEC_EXTENSIONS = {"zstd": ".jsonl.zst", "zlib": ".jsonl.zz"}
+_MANIFEST = "manifest.json"
+
+
+class UnsupportedCodecError(ValueError):
+    """지원하지 않거나 이 환경에서 처리할 수 없는 아카이브 codec"""
+
+
+def _require_codec(codec: str):
+    if codec not in CODEC_EXTENSIONS:
+        raise UnsupportedCodecError(f"Unsupported archive codec: {codec}")
+    if codec == "zstd" and zstandard is None:
+        raise UnsupportedCodecError("Archive codec zstd requires the zstandard package")
+
+
+def _compress(raw: bytes, codec: str) -> bytes:
+    _require_codec(codec)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(raw)
+    return zlib.compress(raw, 9)
+
+
+def _decompress(blob: bytes, codec: str) -> bytes:
+    _require_codec(codec)
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return zlib.decompress(blob)
+
+
+class TranscriptArchive:
+    """세션별 압축 대화 기록 저장소"""
+
+    def __init__(self, directory: str = ARCHIVE_DIR, cache_size: int = 16, codec: str = ARCHIVE_CODEC):
+        self.directory = directory
+        self.codec = codec
+        self._lock = threading.Lock()
+        # 최근 읽은 기록 (아카이브는 불변이므로 무효화 불필요)
+        self._cache: "OrderedDict[str, List[dict]]" = OrderedDict()
+        self._cache_size = cache_size
+
+    def _path(self, session_id: str, ext: str) -> str:
+        return os.path.join(self.directory, f"{session_id}{ext}")
+
+    def _existing_path(self, session_id: str) -> Optional[Tuple[str, str]]:
+        """저장된 기록의 (경로, codec)"""
+        for codec, ext in CODEC_EXTENSIONS.items():
+            path = self._path(session_id, ext)
+            if os.path.exists(path):
+                return path, codec
+        return None
+
+    def has(self, session_id: str) -> bool:
+        return session_id in self._cache or self._existing_path(session_id) is not None
+
+    def write(self, session_id: str, messages: List[dict]) -> dict:
+        """
+        기록을 압축해 저장 (임시 파일 + fsync + rename으로 원자적 교체)
+
+        Returns: manifest 항목 (messages, raw_bytes, compressed_bytes, codec, archived_at)
+        """
+        raw = "\n".join(json.dumps(m, ensure_ascii=False, default=str) for m in messages).encode("utf-8")
+        blob = _compress(raw, self.codec)
+        os.makedirs(self.directory, exist_ok=True)
+
+        path = self._path(session_id, CODEC_EXTENSIONS[self.codec])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+        entry = {
+            "messages": len(messages),
+            "raw_bytes": len(raw),
+            "compressed_bytes": len(blob),
+            "codec": self.codec,
+            "archived_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            manifest = self._read_manifest()
+            manifest[session_id] = entry
+            self._write_manifest(manifest)
+        return entry
+
+    def read(self, session_id: str) -> Optional[List[dict]]:
+        """아카이브된 기록 (created_at, id 순). 없으면 None"""
+        with self._lock:
+            if session_id in self._cache:
+                self._cache.move_to_end(session_id)
+                return self._cache[session_id]
+
+        existing = self._existing_path(session_id)
+        if existing is None:
+            return None
+        path, codec = existing
+        with open(path, "rb") as f:
+            blob = f.read()
+        raw = _decompress(blob, codec)
+        messages = [json.loads(line) for line in raw.decode("utf-8").splitlines() if line]
+
+        with self._lock:
+            self._cache[session_id] = messages
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return messages
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, _MANIFEST), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_manifest(self, manifest: dict):
+        path = os.path.join(self.directory, _MANIFEST)
+        with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(f"{path}.tmp", path)
+
+    def stats(self) -> dict:
+        """아카이브 통계 (회수한 hot 저장 공간 = 원본 크기, 실제 사용 = 압축 크기)"""
+        with self._lock:
+            manifest = self._read_manifest()
+        raw_bytes = sum(e["raw_bytes"] for e in manifest.values())
+        compressed_bytes = sum(e["compressed_bytes"] for e in manifest.values())
+        return {
+            "sessions": len(manifest),
+            "messages": sum(e["messages"] for e in manifest.values()),
+            "raw_bytes": raw_bytes,
+            "compressed_bytes": compressed_bytes,
+            "reclaimed_bytes": raw_bytes - compressed_bytes,
+            "compression_ratio": round(raw_bytes / compressed_bytes, 2) if compressed_bytes else None,
+            "codec": self.codec,
+        }
+
+
+def _project(messages: List[dict], columns: Sequence[str]) -> List[dict]:
+    keys = list(dict.fromkeys(list(columns) + ["id", "created_at"]))
+    return [{k: m.get(k) for k in keys} for m in messages]
+
+
+class ArchivingStorage(StorageProxy):
+    """
+    아카이브 fallback 저장소
+
+    메시지 조회 결과가 hot 테이블에서 비어 있고 아카이브가 있으면 아카이브에서
+    같은 정렬/필터/projection으로 반환합니다.
+    """
+
+    def __init__(self, backend: StorageBackend, archive: TranscriptArchive):
+        super().__init__(backend)
+        self.archive = archive
+
+    async def _archived(self, session_id: str) -> Optional[List[dict]]:
+        if not self.archive.has(session_id):
+            return None
+        return await asyncio.to_thread(self.archive.read, session_id)
+
+    async def get_messages(self, session_id: str, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS) -> list:
+        rows = await self._backend.get_messages(session_id, columns)
+        if rows:
+            return rows
+        archived = await self._archived(session_id)
+        return _project(archived, columns) if archived else rows
+
+    async def get_recent_messages(
+        self, session_id: str, limit: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        rows = await self._backend.get_recent_messages(session_id, limit, columns)
+        if rows:
+            return rows
+        archived = await self._archived(session_id)
+        return _project(archived[-limit:], columns) if archived and limit > 0 else rows
+
+    async def get_messages_since(
+        self,
+        session_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        rows = await self._backend.get_messages_since(session_id, cursor, limit, columns)
+        if rows:
+            return rows
+        archived = await self._archived(session_id)
+        if not archived:
+            return rows
+        if cursor:
+            after = decode_cursor(cursor)
+            archived = [m for m in archived if (m["created_at"], m["id"]) > after]
+        return _project(archived[:limit], columns)
+
+    async def get_round_messages(
+        self, session_id: str, round_index: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        rows = await self._backend.get_round_messages(session_id, round_index, columns)
+        if rows:
+            return rows
+        archived = await self._archived(session_id)
+        if not archived:
+            return rows
+        return _project([m for m in archived if m.get("round_index") == round_index], columns)
+
+
+async def archive_finished_sessions(
+    storage: StorageBackend,
+    archive: TranscriptArchive,
+    older_than_days: int = ARCHIVE_AFTER_DAYS,
+    limit: int = 100
+) -> dict:
+    """
+    종료 후 older_than_days가 지난 세션을 아카이브로 이동
+
+    blob을 쓰고 다시 읽어 건수를 확인한 뒤에만 hot 테이블에서 삭제합니다.
+    세션 하나가 실패해도 나머지는 계속 진행합니다.
+    """
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=older_than_days)).isoformat()
+    sessions = await storage.list_archivable_sessions(cutoff, limit)
+
+    result = {"archived": 0, "failed": 0, "messages": 0, "raw_bytes": 0, "compressed_bytes": 0}
+    for session in sessions:
+        session_id = session["id"]
+        try:
+            messages = await storage.get_messages(session_id, MESSAGE_ALL_COLUMNS)
+            if messages:
+                entry = await asyncio.to_thread(archive.write, session_id, messages)
+                restored = await asyncio.to_thread(archive.read, session_id)
+                if restored is None or len(restored) != len(messages):
+                    raise RuntimeError("archive verification failed")
+                await storage.delete_messages(session_id)
+                result["messages"] += entry["messages"]
+                result["raw_bytes"] += entry["raw_bytes"]
+                result["compressed_bytes"] += entry["compressed_bytes"]
+            await storage.update_session(session_id, {"archived_at": datetime.now(timezone.utc).isoformat()})
+            result["archived"] += 1
+        except Exception as e:
+            result["failed"] += 1
+            logger.error(f"[Archive] Failed to archive session {session_id}: {e}", exc_info=True)
+
+    result["reclaimed_bytes"] = result["raw_bytes"] - result["compressed_bytes"]
+    logger.info(f"[Archive] {result}")
+    return result
+
+
+# 싱글톤 인스턴스
+transcript_archive = TranscriptArchive()
@@ -0,0 +1,303 @@
+"""
+저장소 인터페이스
+
+supabase / sqlite / memory 백엔드가 공통으로 구현하는 비동기 API.
+모든 행은 Supabase 테이블과 같은 키를 가진 dict로 주고받습니다.
+"""
+import base64
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from config import CASE_FILE_PATCH_MAX_RETRIES
+from storage.case_file_patch import CaseFilePatch
+
+logger = logging.getLogger(__name__)
+
+
+# 세션 목록(대시보드) projection
+SESSION_LIST_COLUMNS = (
+    "id", "status", "category", "topic", "round_index", "phase",
+    "case_type", "project_type", "created_at",
+)
+
+# 메시지 조회 기본 projection (content_json 등 무거운 컬럼 제외)
+MESSAGE_DEFAULT_COLUMNS = ("id", "role", "content_text", "round_index", "phase", "created_at")
+
+# 메시지 전체 컬럼 (아카이브 등 원본 보존용)
+MESSAGE_ALL_COLUMNS = (
+    "id", "role", "content_text", "content_json", "reasoning_summary",
+    "round_index", "phase", "event_id", "status", "created_at",
+)
+
+
+class VersionConflictError(Exception):
+    """CaseFile version이 기대값과 달라 조건부 쓰기가 반영되지 않음"""
+
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """(created_at, id) keyset 커서를 불투명 문자열로 인코딩"""
+    raw = f"{created_at}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """
+    encode_cursor의 역변환. 형식이 잘못되면 ValueError
+
+    디코딩한 값은 PostgREST 필터 문자열에 그대로 들어가므로(supabase_client)
+    created_at은 ISO 8601 시각, id는 UUID인지 확인합니다.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.split("|", 1)
+        datetime.fromisoformat(created_at)
+        row_id = str(uuid.UUID(row_id))
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return created_at, row_id
+
+
+def session_cursor(session: dict) -> str:
+    """세션 행의 keyset 커서 (list_sessions의 cursor 인자로 사용)"""
+    return encode_cursor(session["created_at"], session["id"])
+
+
+def message_cursor(message: dict) -> str:
+    """메시지 행의 keyset 커서 (get_messages_since의 cursor 인자로 사용)"""
+    return encode_cursor(message["created_at"], message["id"])
+
+
+class StorageBackend(ABC):
+    """세션/메시지/CaseFile/최종 리포트 저장소"""
+
+    # Session
+    @abstractmethod
+    async def create_session(self, user_id: str, category: str, topic: str) -> dict:
+        """새 세션 생성"""
+
+    @abstractmethod
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        """세션 조회"""
+
+    @abstractmethod
+    async def list_sessions(
+        self,
+        user_id: str = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        project_type: Optional[str] = None,
+        columns: Sequence[str] = SESSION_LIST_COLUMNS
+    ) -> list:
+        """
+        세션 목록 조회 (created_at, id 내림차순 keyset 페이지네이션)
+
+        cursor는 이전 페이지 마지막 행의 session_cursor 값입니다.
+        """
+
+    @abstractmethod
+    async def update_session(self, session_id: str, updates: dict) -> Optional[dict]:
+        """세션 업데이트"""
+
+    @abstractmethod
+    async def list_archivable_sessions(self, finished_before: str, limit: int = 100) -> list:
+        """finished_before 이전에 종료(finalized/completed)되고 아직 아카이브되지 않은 세션 (id, updated_at)"""
+
+    # Message
+    @abstractmethod
+    async def save_message(self, session_id: str, message_data: dict) -> Optional[dict]:
+        """메시지 저장"""
+
+    @abstractmethod
+    async def save_messages(self, session_id: str, messages: List[dict]) -> list:
+        """메시지 다건 저장 (insert 1회)"""
+
+    @abstractmethod
+    async def update_message(self, session_id: str, message_id: str, updates: dict) -> Optional[dict]:
+        """메시지 부분 갱신 (스트리밍 중인 초안의 본문/상태 반영). 갱신된 행 반환"""
+
+    @abstractmethod
+    async def list_stale_drafts(self, started_before: str, limit: int = 100) -> list:
+        """started_before 이전에 시작되어 아직 status='streaming'인 메시지 (id, session_id, content_text, event_id)"""
+
+    @abstractmethod
+    async def delete_messages(self, session_id: str) -> int:
+        """세션의 메시지를 hot 테이블에서 삭제하고 삭제 건수 반환 (아카이브 후 사용)"""
+
+    @abstractmethod
+    async def get_messages(self, session_id: str, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS) -> list:
+        """세션 전체 메시지 조회 (created_at 오름차순) - 리포트 생성 등 전체 이력이 필요할 때만 사용"""
+
+    @abstractmethod
+    async def get_recent_messages(
+        self, session_id: str, limit: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        """마지막 N개 메시지 (오래된 것부터 정렬해서 반환)"""
+
+    @abstractmethod
+    async def get_messages_since(
+        self,
+        session_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        """cursor(message_cursor) 이후 메시지를 limit개까지 (cursor=None이면 처음부터)"""
+
+    @abstractmethod
+    async def get_round_messages(
+        self, session_id: str, round_index: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        """특정 라운드의 메시지"""
+
+    # CaseFile
+    @abstractmethod
+    async def save_case_file(self, session_id: str, case_file_data: dict) -> Optional[dict]:
+        """CaseFile 저장/업데이트 (전달한 필드만 갱신)"""
+
+    @abstractmethod
+    async def get_case_file(self, session_id: str) -> Optional[dict]:
+        """CaseFile 조회"""
+
+    @abstractmethod
+    async def save_case_file_if_version(
+        self, session_id: str, fields: dict, expected_version: Optional[int]
+    ) -> Optional[dict]:
+        """
+        CaseFile 조건부 쓰기 (compare-and-set)
+
+        현재 version이 expected_version일 때만 fields를 반영하고 version을 올립니다.
+        expected_version=None은 "CaseFile이 아직 없음"을 뜻합니다.
+        조건이 맞지 않으면 None을 반환합니다.
+        """
+
+    async def patch_case_file(self, session_id: str, patch: CaseFilePatch) -> Optional[dict]:
+        """
+        CaseFile 패치 적용 (optimistic concurrency + 충돌 시 재시도)
+
+        현재 문서를 읽어 패치가 바꾸는 필드만 계산한 뒤 version 조건부로 씁니다.
+        다른 쓰기와 충돌하면 새 문서로 다시 계산해 최대 CASE_FILE_PATCH_MAX_RETRIES회
+        재시도하고, 그래도 실패하면 VersionConflictError를 던집니다.
+        """
+        if patch.is_empty():
+            return await self.get_case_file(session_id)
+
+        for attempt in range(CASE_FILE_PATCH_MAX_RETRIES):
+            current = await self.get_case_file(session_id)
+            expected_version = current.get("version", 0) if current else None
+            result = await self.save_case_file_if_version(
+                session_id, patch.apply(current), expected_version
+            )
+            if result is not None:
+                return result
+            logger.info(
+                f"[CaseFile] Version conflict on {session_id} "
+                f"(attempt {attempt + 1}, fields={patch.fields()})"
+            )
+        raise VersionConflictError(
+            f"CaseFile patch for {session_id} failed after {CASE_FILE_PATCH_MAX_RETRIES} attempts"
+        )
+
+    # FinalReport
+    @abstractmethod
+    async def save_final_report(self, session_id: str, report_json: dict, report_md: str = None) -> Optional[dict]:
+        """최종 리포트 저장 (upsert)"""
+
+    @abstractmethod
+    async def get_final_report(self, session_id: str) -> Optional[dict]:
+        """최종 리포트 조회 (없으면 None)"""
+
+
+class StorageProxy(StorageBackend):
+    """
+    다른 저장소를 감싸는 래퍼의 기본 클래스
+
+    모든 호출을 내부 backend로 그대로 위임합니다. 캐시/색인 등 래퍼는
+    필요한 메서드만 오버라이드합니다.
+    """
+
+    def __init__(self, backend: StorageBackend):
+        self._backend = backend
+
+    async def create_session(self, user_id: str, category: str, topic: str) -> dict:
+        return await self._backend.create_session(user_id, category, topic)
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        return await self._backend.get_session(session_id)
+
+    async def list_sessions(
+        self,
+        user_id: str = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        project_type: Optional[str] = None,
+        columns: Sequence[str] = SESSION_LIST_COLUMNS
+    ) -> list:
+        return await self._backend.list_sessions(user_id, limit, cursor, status, project_type, columns)
+
+    async def update_session(self, session_id: str, updates: dict) -> Optional[dict]:
+        return await self._backend.update_session(session_id, updates)
+
+    async def list_archivable_sessions(self, finished_before: str, limit: int = 100) -> list:
+        return await self._backend.list_archivable_sessions(finished_before, limit)
+
+    async def save_message(self, session_id: str, message_data: dict) -> Optional[dict]:
+        return await self._backend.save_message(session_id, message_data)
+
+    async def save_messages(self, session_id: str, messages: List[dict]) -> list:
+        return await self._backend.save_messages(session_id, messages)
+
+    async def update_message(self, session_id: str, message_id: str, updates: dict) -> Optional[dict]:
+        return await self._backend.update_message(session_id, message_id, updates)
+
+    async def list_stale_drafts(self, started_before: str, limit: int = 100) -> list:
+        return await self._backend.list_stale_drafts(started_before, limit)
+
+    async def delete_messages(self, session_id: str) -> int:
+        return await self._backend.delete_messages(session_id)
+
+    async def get_messages(self, session_id: str, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS) -> list:
+        return await self._backend.get_messages(session_id, columns)
+
+    async def get_recent_messages(
+        self, session_id: str, limit: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        return await self._backend.get_recent_messages(session_id, limit, columns)
+
+    async def get_messages_since(
+        self,
+        session_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        return await self._backend.get_messages_since(session_id, cursor, limit, columns)
+
+    async def get_round_messages(
+        self, session_id: str, round_index: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        return await self._backend.get_round_messages(session_id, round_index, columns)
+
+    async def save_case_file(self, session_id: str, case_file_data: dict) -> Optional[dict]:
+        return await self._backend.save_case_file(session_id, case_file_data)
+
+    async def get_case_file(self, session_id: str) -> Optional[dict]:
+        return await self._backend.get_case_file(session_id)
+
+    async def save_case_file_if_version(
+        self, session_id: str, fields: dict, expected_version: Optional[int]
+    ) -> Optional[dict]:
+        return await self._backend.save_case_file_if_version(session_id, fields, expected_version)
+
+    async def patch_case_file(self, session_id: str, patch: CaseFilePatch) -> Optional[dict]:
+        return await self._backend.patch_case_file(session_id, patch)
+
+    async def save_final_report(self, session_id: str, report_json: dict, report_md: str = None) -> Optional[dict]:
+        return await self._backend.save_final_report(session_id, report_json, report_md)
+
+    async def get_final_report(self, session_id: str) -> Optional[dict]:
+        return await self._backend.get_final_report(session_id)
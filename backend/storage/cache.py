@@ -0,0 +1,336 @@
+"""
+L1 캐시 (프로세스 내 세션/CaseFile 캐시)
+
+UI가 폴링하는 GET /sessions/{id}와 phase마다 반복되는 세션/CaseFile 조회를
+저장소 왕복 없이 처리합니다.
+
+- 쓰기 시 write-through: 저장소 반영 결과 행으로 캐시 갱신
+- 용량 제한 LRU + TTL
+- 버전(updated_at) 비교로 늦게 도착한 오래된 행이 새 행을 덮어쓰지 못하게 함
+- 다른 워커의 쓰기는 InvalidationBus 메시지로 전달받아 오래된 항목을 제거
+  EVENT_BUS_BACKEND=sqlite면 SSE 이벤트 버스와 같은 SQLite 파일로 프로세스 간 전달 (SQLiteInvalidationBus)
+"""
+import asyncio
+import copy
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+from config import (
+    L1_CACHE_MAX_ENTRIES, L1_CACHE_TTL_SECONDS, EVENT_BUS_BACKEND, EVENT_BUS_SQLITE_PATH, EVENT_BUS_POLL_MS,
+    EVENT_BUS_RETENTION,
+)
+from storage.base import StorageBackend, StorageProxy
+from storage.case_file_patch import CaseFilePatch
+from storage.sqlite_file import LazySQLite
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """용량 제한 + TTL LRU 캐시. 값과 함께 버전을 저장합니다."""
+
+    def __init__(self, max_entries: int = L1_CACHE_MAX_ENTRIES, ttl_seconds: float = L1_CACHE_TTL_SECONDS):
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        # key -> (value, version, expires_at)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, Optional[str], float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, _, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Tuple[str, str], value: Any, version: Optional[str]):
+        existing = self._entries.get(key)
+        if existing is not None and _is_newer(existing[1], version):
+            # 이미 더 새로운 버전이 캐시되어 있음 (응답 순서 역전)
+            return
+        self._entries[key] = (value, version, time.monotonic() + self._ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Tuple[str, str], version: Optional[str] = None):
+        """
+        항목 제거
+
+        version이 주어지면 캐시된 항목이 그보다 오래된 경우에만 제거합니다.
+        """
+        existing = self._entries.get(key)
+        if existing is None:
+            return
+        if version is not None and not _is_newer(version, existing[1]):
+            return
+        del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+def _is_newer(a: Optional[str], b: Optional[str]) -> bool:
+    """버전 a가 b보다 새로운지 (updated_at ISO 문자열 비교, 모르면 False)"""
+    if a is None or b is None:
+        return False
+    return a > b
+
+
+class InvalidationBus:
+    """
+    캐시 무효화 pub/sub (프로세스 내)
+
+    같은 프로세스 안의 CachedStorage 인스턴스끼리 무효화 메시지를 주고받습니다.
+    다른 프로세스로는 전달되지 않으므로 워커가 여러 개면 SQLiteInvalidationBus를 사용합니다.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[dict], None]] = []
+
+    def subscribe(self, callback: Callable[[dict], None]):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[dict], None]):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    async def publish(self, message: dict):
+        self._dispatch(message)
+
+    def _dispatch(self, message: dict):
+        for callback in list(self._subscribers):
+            try:
+                callback(message)
+            except Exception as e:
+                logger.error(f"[InvalidationBus] Subscriber error: {e}")
+
+    async def start(self):
+        """백그라운드 수신 시작 (앱 startup)"""
+
+    async def stop(self):
+        """백그라운드 수신 종료 (앱 shutdown)"""
+
+
+class SQLiteInvalidationBus(InvalidationBus):
+    """
+    SQLite 공유 파일 기반 cross-process 무효화 버스 (SQLiteEventBus와 같은 방식)
+
+    - publish: 로컬 구독자에게 즉시 전달 + 행 insert
+    - 다른 프로세스의 메시지: poll 루프가 마지막으로 읽은 seq 이후 행을 읽어 전달
+    - 오래된 행은 최근 EVENT_BUS_RETENTION건만 남기고 정리
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS cache_invalidations (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        version TEXT,
+        origin TEXT NOT NULL
+    );
+    """
+
+    def __init__(self, path: str, poll_ms: int = EVENT_BUS_POLL_MS, retention: int = EVENT_BUS_RETENTION):
+        super().__init__()
+        self.path = path
+        self._poll_interval = poll_ms / 1000
+        self._retention = retention
+        self._origin = str(uuid.uuid4())
+        self._lock = threading.Lock()
+        self._db = LazySQLite(path, self.SCHEMA)
+        self._last_seq: Optional[int] = None  # 첫 poll 때 정함
+        self._poll_task: Optional[asyncio.Task] = None
+        self._polls = 0
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def _insert(self, message: dict):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO cache_invalidations (kind, key, version, origin) VALUES (?, ?, ?, ?)",
+                (message["kind"], message["key"], message.get("version"), self._origin),
+            )
+
+    async def publish(self, message: dict):
+        self._dispatch(message)
+        try:
+            await asyncio.to_thread(self._insert, message)
+        except sqlite3.Error as e:
+            # 다른 워커는 TTL(L1_CACHE_TTL_SECONDS)이 지나야 새 행을 봄
+            logger.error(f"[InvalidationBus] Publish failed: {e}")
+
+    def _fetch_new(self) -> list:
+        with self._lock:
+            if self._last_seq is None:
+                self._last_seq = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM cache_invalidations"
+                ).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT seq, kind, key, version, origin FROM cache_invalidations "
+                "WHERE seq > ? ORDER BY seq LIMIT 1000",
+                (self._last_seq,),
+            ).fetchall()
+            self._polls += 1
+            if self._polls % 200 == 0:
+                self._conn.execute("DELETE FROM cache_invalidations WHERE seq <= ?", (self._last_seq - self._retention,))
+        return rows
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                rows = await asyncio.to_thread(self._fetch_new)
+                for seq, kind, key, version, origin in rows:
+                    self._last_seq = seq
+                    if origin != self._origin:
+                        self._dispatch({"kind": kind, "key": key, "version": version, "origin": origin})
+                if len(rows) < 1000:
+                    await asyncio.sleep(self._poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[InvalidationBus] Poll failed: {e}", exc_info=True)
+                await asyncio.sleep(self._poll_interval)
+
+    async def start(self):
+        if self._poll_task is None or self._poll_task.done():
+            self._poll_task = asyncio.create_task(self._poll_loop())
+            logger.info(f"[InvalidationBus] SQLite bus polling {self.path} every {self._poll_interval * 1000:.0f}ms")
+
+    async def stop(self):
+        if self._poll_task:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+
+
+def create_invalidation_bus() -> InvalidationBus:
+    """설정(EVENT_BUS_BACKEND)에 맞는 무효화 버스 (sqlite면 SSE 이벤트 버스와 같은 파일)"""
+    if EVENT_BUS_BACKEND == "sqlite":
+        return SQLiteInvalidationBus(EVENT_BUS_SQLITE_PATH)
+    return InvalidationBus()
+
+
+class CachedStorage(StorageProxy):
+    """
+    세션/CaseFile L1 캐시를 얹은 저장소
+
+    캐시 대상이 아닌 호출은 StorageProxy가 그대로 위임합니다.
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        bus: Optional[InvalidationBus] = None,
+        max_entries: int = L1_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = L1_CACHE_TTL_SECONDS
+    ):
+        super().__init__(backend)
+        self._cache = LRUCache(max_entries, ttl_seconds)
+        self._node_id = str(uuid.uuid4())
+        self._bus = bus
+        if bus:
+            bus.subscribe(self._on_invalidation)
+
+    # === 무효화 ===
+
+    def _on_invalidation(self, message: dict):
+        if message.get("origin") == self._node_id:
+            return
+        self._cache.invalidate((message["kind"], message["key"]), message.get("version"))
+
+    async def _publish(self, kind: str, key: str, version: Optional[str]):
+        if self._bus:
+            await self._bus.publish({"kind": kind, "key": key, "version": version, "origin": self._node_id})
+
+    async def _store(self, kind: str, key: str, row: Optional[dict]):
+        """쓰기 결과 행으로 캐시 갱신 + 다른 워커에 무효화 전파"""
+        if row:
+            version = row.get("updated_at")
+            self._cache.put((kind, key), copy.deepcopy(row), version)
+        else:
+            version = None
+            self._cache.invalidate((kind, key))
+        await self._publish(kind, key, version)
+
+    def invalidate_session(self, session_id: str):
+        """세션 관련 캐시 항목 제거 (외부 경로로 DB가 바뀐 경우)"""
+        self._cache.invalidate(("session", session_id))
+        self._cache.invalidate(("case_file", session_id))
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+    # === Session ===
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        cached = self._cache.get(("session", session_id))
+        if cached is not None:
+            return copy.deepcopy(cached)
+        session = await self._backend.get_session(session_id)
+        if session:
+            self._cache.put(("session", session_id), copy.deepcopy(session), session.get("updated_at"))
+        return session
+
+    async def update_session(self, session_id: str, updates: dict) -> Optional[dict]:
+        session = await self._backend.update_session(session_id, updates)
+        await self._store("session", session_id, session)
+        return session
+
+    # === CaseFile ===
+
+    async def get_case_file(self, session_id: str) -> Optional[dict]:
+        cached = self._cache.get(("case_file", session_id))
+        if cached is not None:
+            return copy.deepcopy(cached)
+        case_file = await self._backend.get_case_file(session_id)
+        if case_file:
+            self._cache.put(("case_file", session_id), copy.deepcopy(case_file), case_file.get("updated_at"))
+        return case_file
+
+    async def save_case_file(self, session_id: str, case_file_data: dict) -> Optional[dict]:
+        case_file = await self._backend.save_case_file(session_id, case_file_data)
+        await self._store("case_file", session_id, case_file)
+        return case_file
+
+    async def save_case_file_if_version(
+        self, session_id: str, fields: dict, expected_version: Optional[int]
+    ) -> Optional[dict]:
+        case_file = await self._backend.save_case_file_if_version(session_id, fields, expected_version)
+        if case_file:
+            await self._store("case_file", session_id, case_file)
+        return case_file
+
+    async def patch_case_file(self, session_id: str, patch: CaseFilePatch) -> Optional[dict]:
+        # 재시도 루프는 캐시가 아닌 저장소의 최신 문서를 기준으로 돌아야 함
+        case_file = await self._backend.patch_case_file(session_id, patch)
+        await self._store("case_file", session_id, case_file)
+        return case_file
+
+
+# 싱글톤 무효화 버스
+invalidation_bus = create_invalidation_bus()
@@ -0,0 +1,88 @@
+"""
+CaseFile 필드 단위 패치
+
+CaseFile 전체 문서를 읽어 Python에서 고친 뒤 통째로 upsert하던 방식 대신,
+변경 의도를 연산 목록으로 표현합니다.
+
+- set(field, value): 필드 값 교체
+- append(field, values, unique, limit): 리스트 필드 끝에 추가 (unique=True면 중복 제외,
+  limit이 있으면 최근 limit개만 유지). field는 "round_digests.2.claims"처럼 dict 필드 안의
+  리스트를 가리킬 수 있음 (중간 dict는 없으면 만듦)
+
+패치는 현재 문서에 적용(apply)했을 때 바뀌는 필드만 계산하므로, 저장소에는
+해당 필드만 전송되고 version 비교(optimistic concurrency)와 함께 반영됩니다.
+"""
+import copy
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+class CaseFilePatch:
+    """CaseFile 필드 패치 (연산은 추가된 순서대로 적용)"""
+
+    def __init__(self, ops: Optional[List[Tuple]] = None):
+        self.ops: List[Tuple] = list(ops or [])
+
+    @classmethod
+    def from_fields(cls, fields: dict) -> "CaseFilePatch":
+        """{필드: 값} dict를 set 연산 패치로 변환"""
+        patch = cls()
+        for field, value in fields.items():
+            patch.set(field, value)
+        return patch
+
+    def set(self, field: str, value: Any) -> "CaseFilePatch":
+        self.ops.append(("set", field, copy.deepcopy(value)))
+        return self
+
+    def append(
+        self, field: str, values: Iterable[Any], unique: bool = False, limit: Optional[int] = None
+    ) -> "CaseFilePatch":
+        self.ops.append(("append", field, list(values), unique, limit))
+        return self
+
+    def extend(self, other: "CaseFilePatch") -> "CaseFilePatch":
+        """other의 연산을 뒤에 이어 붙임 (두 패치를 순서대로 적용한 것과 같음)"""
+        self.ops.extend(other.ops)
+        return self
+
+    def is_empty(self) -> bool:
+        return not self.ops
+
+    def fields(self) -> List[str]:
+        return list(dict.fromkeys(op[1].split(".")[0] for op in self.ops))
+
+    def apply(self, case_file: Optional[dict]) -> Dict[str, Any]:
+        """
+        현재 CaseFile에 패치를 적용했을 때의 변경 필드 값
+
+        case_file은 수정하지 않으며, 패치가 건드린 필드만 반환합니다.
+        """
+        base = case_file or {}
+        changed: Dict[str, Any] = {}
+        for op in self.ops:
+            kind, field = op[0], op[1]
+            if kind == "set":
+                changed[field] = copy.deepcopy(op[2])
+            elif kind == "append":
+                top, *path = field.split(".")
+                if top not in changed:
+                    changed[top] = copy.deepcopy(base.get(top) or ({} if path else []))
+                parent, key = changed, top
+                for part in path:
+                    node = parent.get(key)
+                    if not isinstance(node, dict):
+                        node = parent[key] = {}
+                    parent, key = node, part
+                current = parent[key] = list(parent.get(key) or [])
+                for value in op[2]:
+                    if op[3] and value in current:
+                        continue
+                    current.append(value)
+                if op[4] is not None:
+                    del current[:max(len(current) - op[4], 0)]
+            else:
+                raise ValueError(f"Unknown case file patch op: {kind}")
+        return changed
+
+    def __repr__(self) -> str:
+        return f"CaseFilePatch({self.ops!r})"
@@ -0,0 +1,194 @@
+"""
+스트리밍 메시지 초안 저장 (Draft Writer)
+
+메시지를 스트림이 끝난 뒤에야 저장하던 문제를 해결합니다.
+긴 phase(A3_R3_FINAL 등) 도중 새로고침한 클라이언트는 아무것도 볼 수 없었고,
+워커가 죽으면 생성 중이던 본문이 통째로 사라졌습니다.
+
+- 생성 중인 메시지를 status='streaming' 행으로 저장하고 DRAFT_FLUSH_INTERVAL_MS마다 본문 갱신
+- 행의 event_id는 content_text에 반영된 마지막 MESSAGE_STREAM_CHUNK 이벤트 id
+  → 재접속 클라이언트는 초안을 읽고 Last-Event-ID=event_id로 이후 chunk만 받음
+- 첫 저장 전에 끝난 짧은 메시지는 지금처럼 WriteBatcher로 한 번만 insert
+- 완료 시 최종 본문과 status='complete'로 갱신
+- 이 프로세스에서 생성 중인 초안은 active()로 저장 간격보다 최신 본문을 조회 (세션 피드 스냅샷)
+- 워커 장애/재시작으로 남은 초안(시작 후 DRAFT_ORPHAN_SECONDS가 지나도 streaming이고 이 프로세스에서
+  생성 중이 아닌 행)은 sweep_orphans()가 중단 표시를 붙여 complete로 바꿈 (SessionLifecycleManager가 주기 호출)
+
+초안 쓰기 실패는 로그만 남기고 스트리밍을 막지 않습니다 (완료 쓰기는 예외 전파).
+"""
+import asyncio
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from config import DRAFT_FLUSH_INTERVAL_MS, DRAFT_ORPHAN_SECONDS
+from storage import get_storage
+from storage.write_batcher import WriteBatcher, write_batcher
+
+logger = logging.getLogger(__name__)
+
+# 중단된 초안 본문 끝에 붙이는 표시
+INTERRUPTED_MARK = "\n\n[생성 중단]"
+
+
+def _orphan_cutoff() -> str:
+    return (datetime.now(timezone.utc) - timedelta(seconds=DRAFT_ORPHAN_SECONDS)).isoformat()
+
+
+def is_orphaned_draft(message: dict) -> bool:
+    """시작 후 DRAFT_ORPHAN_SECONDS가 지나도 streaming인 초안 (created_at 포함 행)"""
+    return message.get("status") == "streaming" and (message.get("created_at") or "") < _orphan_cutoff()
+
+
+class MessageDraft:
+    """생성 중인 메시지 하나"""
+
+    def __init__(self, writer: "DraftWriter", session_id: str, fields: dict):
+        self._writer = writer
+        self.session_id = session_id
+        self.message_id = fields.get("id") or str(uuid.uuid4())
+        # 순서 보존: 생성 시작 시각을 created_at으로 사용
+        self._fields = {
+            **fields,
+            "id": self.message_id,
+            "created_at": fields.get("created_at") or datetime.now(timezone.utc).isoformat(),
+        }
+        self._text = ""
+        self._event_id: Optional[int] = None
+        self._written: Optional[tuple] = None  # 마지막으로 저장한 (text, event_id)
+        self._inserted = False
+        self._last_write = time.monotonic()
+        self.started = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def update(self, text: str, event_id: Optional[int] = None):
+        """누적 본문 갱신 (저장은 간격마다 한 번)"""
+        self._text = text
+        self._event_id = event_id
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._write_later())
+
+    async def _write_later(self):
+        delay = self._last_write + self._writer.interval - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            await self._write_draft()
+        except Exception as e:
+            logger.error(f"[DraftWriter] Draft write failed for {self.message_id}: {e}")
+
+    async def _write_draft(self):
+        snapshot = (self._text, self._event_id)
+        if snapshot == self._written:
+            return
+        self._last_write = time.monotonic()
+        backend = self._writer.backend
+        if self._inserted:
+            await backend.update_message(self.session_id, self.message_id, {
+                "content_text": snapshot[0], "event_id": snapshot[1],
+            })
+        else:
+            await backend.save_message(self.session_id, {
+                **self._fields, "content_text": snapshot[0], "event_id": snapshot[1], "status": "streaming",
+            })
+            self._inserted = True
+        self._written = snapshot
+
+    def snapshot(self) -> dict:
+        """현재까지의 초안 (메시지 행 형태)"""
+        return {
+            **self._fields, "content_text": self._text, "event_id": self._event_id, "status": "streaming",
+        }
+
+    async def finish(self, text: str, event_id: Optional[int] = None):
+        """최종 본문 저장 (예약된 초안 쓰기는 취소)"""
+        self._writer._release(self)
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+        if self._inserted:
+            await self._writer.backend.update_message(self.session_id, self.message_id, {
+                "content_text": text, "event_id": event_id, "status": "complete",
+            })
+        else:
+            await self._writer.batcher.save_message(self.session_id, {
+                **self._fields, "content_text": text, "event_id": event_id,
+            })
+
+
+class DraftWriter:
+    """
+    메시지 초안 생성기
+
+    backend는 StorageBackend 구현체, batcher는 완료 메시지를 묶어 쓸 WriteBatcher입니다.
+    """
+
+    def __init__(self, backend, batcher: WriteBatcher, interval_ms: int = DRAFT_FLUSH_INTERVAL_MS):
+        self.backend = backend
+        self.batcher = batcher
+        self.interval = interval_ms / 1000
+        self._active: Dict[str, MessageDraft] = {}
+
+    def start(self, session_id: str, fields: dict) -> MessageDraft:
+        """
+        메시지 생성 시작
+
+        fields: role, round_index, phase 등 content_text 외 컬럼
+        """
+        draft = MessageDraft(self, session_id, fields)
+        self._active[session_id] = draft
+        return draft
+
+    def _release(self, draft: MessageDraft):
+        if self._active.get(draft.session_id) is draft:
+            del self._active[draft.session_id]
+
+    def active(self, session_id: str) -> Optional[dict]:
+        """이 프로세스에서 생성 중인 세션의 초안 (없으면 None)"""
+        draft = self._active.get(session_id)
+        return draft.snapshot() if draft else None
+
+    def is_busy(self, session_id: str) -> bool:
+        """생성 중인 초안이 있는지 (DRAFT_ORPHAN_SECONDS가 지난 초안은 중단된 것으로 봄)"""
+        draft = self._active.get(session_id)
+        return draft is not None and time.monotonic() - draft.started < DRAFT_ORPHAN_SECONDS
+
+    def forget_session(self, session_id: str):
+        """세션의 초안 제거 (예약된 초안 쓰기는 취소, 저장된 행은 sweep_orphans가 정리)"""
+        draft = self._active.pop(session_id, None)
+        if draft and draft._task and not draft._task.done():
+            draft._task.cancel()
+
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용)"""
+        return {"active": self._active}
+
+    async def sweep_orphans(self, limit: int = 100) -> int:
+        """
+        중단된 초안 정리 (본문 끝에 INTERRUPTED_MARK를 붙이고 status='complete')
+
+        다른 프로세스에서 생성 중인 초안은 알 수 없으므로 시작 후 DRAFT_ORPHAN_SECONDS가 지난 행만 봅니다.
+        Returns: 정리한 초안 수
+        """
+        active = {draft.message_id for draft in self._active.values()}
+        swept = 0
+        for row in await self.backend.list_stale_drafts(_orphan_cutoff(), limit):
+            if row["id"] in active:
+                continue
+            await self.backend.update_message(row["session_id"], row["id"], {
+                "content_text": (row.get("content_text") or "") + INTERRUPTED_MARK, "status": "complete",
+            })
+            swept += 1
+        if swept:
+            logger.warning(f"[DraftWriter] Completed {swept} interrupted drafts")
+        return swept
+
+
+# 싱글톤 인스턴스
+draft_writer = DraftWriter(get_storage(), write_batcher)
@@ -0,0 +1,397 @@
+"""
+전문 검색 색인 (세션 주제 / 메시지 / 최종 리포트)
+
+"예전에 X를 다룬 회의가 어디였지?"를 찾기 위한 로컬 역색인입니다.
+
+- SQLite FTS5 + 한국어 bigram 토크나이저
+  (한글 연속 구간은 2글자 단위, 그 외 영숫자는 단어 단위 토큰)
+- save_message / save_final_report / create_session 시 SearchIndexingStorage가 증분 색인
+- 사용자/문서 종류 필터는 FTS 안의 tags 컬럼 토큰으로 처리 (조인 없이 좁힘)
+- bm25 점수순 + offset 페이지네이션. 흔한 검색어로 후보가 매우 많으면 최근 후보부터
+  SEARCH_RANK_WINDOW건 단위 구간 안에서 점수를 매겨 지연을 일정하게 유지
+  (한 구간을 다 넘기면 다음 페이지는 더 오래된 구간으로 이어짐 → 오래된 결과도 페이지로 도달)
+- 색인 갱신은 스레드에서 실행 (이벤트 루프를 막지 않음). 리포트는 status='complete'일 때만 색인
+- 원본 저장소와 별도 파일(SEARCH_INDEX_PATH)이라 supabase 백엔드에서도 동일하게 동작
+  (파일은 첫 색인/검색 때 엶, storage/sqlite_file.py)
+"""
+import asyncio
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+from typing import Iterable, List, Optional
+
+from config import SEARCH_RANK_WINDOW
+from storage.base import StorageBackend, StorageProxy, session_cursor
+from storage.sqlite_file import LazySQLite
+
+logger = logging.getLogger(__name__)
+
+# 한글 음절 구간 / 그 외 단어(영문, 숫자 등)
+_TOKEN_RE = re.compile(r"[가-힣]+|[^\W_가-힣]+")
+_HANGUL_RE = re.compile(r"[가-힣]+")
+
+SNIPPET_RADIUS = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT,
+    topic TEXT,
+    project_type TEXT,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_search_sessions_user ON search_sessions(user_id);
+
+CREATE TABLE IF NOT EXISTS search_docs (
+    rowid INTEGER PRIMARY KEY,
+    doc_key TEXT NOT NULL UNIQUE,
+    doc_type TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    ref_id TEXT,
+    role TEXT,
+    round_index INTEGER,
+    body TEXT NOT NULL,
+    created_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_search_docs_session ON search_docs(session_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    tokens,
+    tags,
+    tokenize = 'unicode61 remove_diacritics 0'
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """색인/질의 공통 토크나이저 (한글은 bigram, 한 글자 구간은 그대로)"""
+    tokens = []
+    for run in _TOKEN_RE.findall((text or "").lower()):
+        if _HANGUL_RE.fullmatch(run) and len(run) > 1:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    검색어를 FTS5 MATCH 식으로 변환
+
+    공백으로 나뉜 검색어는 AND, 한 검색어의 bigram들은 인접해야 하는 phrase로
+    묶어 부분 문자열 검색과 같은 의미가 됩니다. 한 글자 한글은 접두사 검색.
+    """
+    clauses = []
+    for term in query.split():
+        for run in _TOKEN_RE.findall(term.lower()):
+            phrase = '"' + " ".join(tokenize(run)) + '"'
+            clauses.append(f"{phrase}*" if len(run) == 1 else phrase)
+    return " AND ".join(clauses) if clauses else None
+
+
+def _user_tag(user_id: str) -> str:
+    return "user" + hashlib.md5(user_id.encode("utf-8")).hexdigest()
+
+
+def _doc_tags(doc_type: str, user_id: Optional[str]) -> str:
+    """필터용 tags 컬럼 값 (문서 종류 + 소유 사용자)"""
+    tags = [f"type{doc_type}"]
+    if user_id:
+        tags.append(_user_tag(user_id))
+    return " ".join(tags)
+
+
+def _report_text(report_json: dict, report_md: Optional[str]) -> str:
+    """리포트 본문 (report_md 우선, 없으면 JSON의 문자열 값)"""
+    if report_md:
+        return report_md
+
+    def walk(value) -> Iterable[str]:
+        if isinstance(value, str):
+            yield value
+        elif isinstance(value, dict):
+            for v in value.values():
+                yield from walk(v)
+        elif isinstance(value, list):
+            for v in value:
+                yield from walk(v)
+
+    return "\n".join(walk(report_json or {}))
+
+
+def is_complete_report(report_json: Optional[dict]) -> bool:
+    """완료된 리포트인지 (status가 없는 이전 리포트는 완료로 봄)"""
+    return (report_json or {}).get("status", "complete") == "complete"
+
+
+def _snippet(body: str, query: str) -> str:
+    """첫 번째 검색어 위치 주변 발췌"""
+    lowered = body.lower()
+    positions = [lowered.find(term.lower()) for term in query.split()]
+    positions = [p for p in positions if p >= 0]
+    start = max(min(positions) - SNIPPET_RADIUS, 0) if positions else 0
+    end = start + SNIPPET_RADIUS * 2 + max((len(t) for t in query.split()), default=0)
+    snippet = body[start:end].replace("\n", " ")
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(body) else "")
+
+
+class SearchIndex:
+    """SQLite FTS5 역색인"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = LazySQLite(path, SCHEMA, cached_statements=64, row_factory=sqlite3.Row)
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # === 색인 ===
+
+    def _upsert_doc(self, doc: dict):
+        """문서 하나 색인 (같은 doc_key는 교체). 호출자가 락/트랜잭션 보유"""
+        row = self._conn.execute(
+            "SELECT rowid FROM search_docs WHERE doc_key = ?", (doc["doc_key"],)
+        ).fetchone()
+        if row:
+            self._conn.execute("DELETE FROM search_fts WHERE rowid = ?", (row["rowid"],))
+            self._conn.execute("DELETE FROM search_docs WHERE rowid = ?", (row["rowid"],))
+        cursor = self._conn.execute(
+            "INSERT INTO search_docs (doc_key, doc_type, session_id, ref_id, role, round_index, body, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (doc["doc_key"], doc["doc_type"], doc["session_id"], doc.get("ref_id"),
+             doc.get("role"), doc.get("round_index"), doc["body"], doc.get("created_at")),
+        )
+        owner = self._conn.execute(
+            "SELECT user_id FROM search_sessions WHERE session_id = ?", (doc["session_id"],)
+        ).fetchone()
+        self._conn.execute(
+            "INSERT INTO search_fts (rowid, tokens, tags) VALUES (?, ?, ?)",
+            (cursor.lastrowid, " ".join(tokenize(doc["body"])),
+             _doc_tags(doc["doc_type"], owner["user_id"] if owner else None)),
+        )
+
+    def _write(self, docs: List[dict], session: Optional[dict] = None):
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                if session:
+                    self._conn.execute(
+                        "INSERT INTO search_sessions (session_id, user_id, topic, project_type, created_at) "
+                        "VALUES (?, ?, ?, ?, ?) ON CONFLICT(session_id) DO UPDATE SET "
+                        "user_id = excluded.user_id, topic = excluded.topic, "
+                        "project_type = excluded.project_type",
+                        (session["id"], session.get("user_id"), session.get("topic"),
+                         session.get("project_type"), session.get("created_at")),
+                    )
+                for doc in docs:
+                    self._upsert_doc(doc)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def index_session(self, session: dict):
+        """세션 주제 색인"""
+        self._write([{
+            "doc_key": f"topic:{session['id']}",
+            "doc_type": "topic",
+            "session_id": session["id"],
+            "body": session.get("topic") or "",
+            "created_at": session.get("created_at"),
+        }], session=session)
+
+    def index_messages(self, session_id: str, messages: List[dict]):
+        """메시지 색인 (저장소가 반환한 행)"""
+        docs = [{
+            "doc_key": f"message:{message['id']}",
+            "doc_type": "message",
+            "session_id": session_id,
+            "ref_id": message["id"],
+            "role": message.get("role"),
+            "round_index": message.get("round_index"),
+            "body": message.get("content_text") or "",
+            "created_at": message.get("created_at"),
+        } for message in messages if message and message.get("id")]
+        if docs:
+            self._write(docs)
+
+    def index_report(self, session_id: str, report_json: dict, report_md: Optional[str] = None,
+                     created_at: Optional[str] = None):
+        """최종 리포트 색인 (세션당 하나, 재생성 시 교체)"""
+        self._write([{
+            "doc_key": f"report:{session_id}",
+            "doc_type": "report",
+            "session_id": session_id,
+            "body": _report_text(report_json, report_md),
+            "created_at": created_at,
+        }])
+
+    # === 검색 ===
+
+    def search(
+        self,
+        query: str,
+        user_id: Optional[str] = None,
+        doc_type: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[dict]:
+        """
+        bm25 점수순 검색
+
+        후보는 최근 것부터 window건씩 구간으로 나누고 구간 안에서 점수순으로 정렬합니다.
+        offset이 한 구간을 넘으면 다음(더 오래된) 구간으로 이어지므로 모든 후보에 페이지로 도달합니다.
+        Returns: [{doc_type, session_id, topic, ref_id, role, round_index, snippet, created_at, score}]
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        match = f"tokens : ({match})"
+        if user_id:
+            match += f" AND tags : {_user_tag(user_id)}"
+        if doc_type:
+            match += f" AND tags : type{doc_type}"
+
+        window = SEARCH_RANK_WINDOW
+        rows = []
+        position = offset
+        with self._lock:
+            while len(rows) < limit:
+                band, skip = divmod(position, window)
+                # 구간의 첫/마지막 후보 rowid (FTS5는 rowid 역순 순회가 빠름)
+                upper = self._nth_candidate(match, band * window)
+                if upper is None:
+                    break
+                lower = self._nth_candidate(match, (band + 1) * window - 1)
+                rows.extend(self._conn.execute(
+                    "SELECT d.doc_type, d.session_id, d.ref_id, d.role, d.round_index, d.body, d.created_at, "
+                    "s.topic, hits.score "
+                    "FROM (SELECT rowid, bm25(search_fts, 1.0, 0.0) AS score FROM search_fts "
+                    "      WHERE search_fts MATCH ? AND rowid BETWEEN ? AND ? "
+                    "      ORDER BY score, rowid DESC LIMIT ? OFFSET ?) AS hits "
+                    "JOIN search_docs d ON d.rowid = hits.rowid "
+                    "LEFT JOIN search_sessions s ON s.session_id = d.session_id "
+                    "ORDER BY hits.score, hits.rowid DESC",
+                    (match, lower or 0, upper, limit - len(rows), skip),
+                ).fetchall())
+                position = (band + 1) * window
+
+        results = []
+        for row in rows:
+            result = dict(row)
+            result["snippet"] = _snippet(result.pop("body"), query)
+            # bm25는 낮을수록 관련도가 높음 → 높을수록 좋은 점수로 변환
+            result["score"] = round(-result["score"], 4)
+            results.append(result)
+        return results
+
+    def _nth_candidate(self, match: str, n: int) -> Optional[int]:
+        """최근 순 n번째(0부터) 후보의 rowid (없으면 None). 호출자가 락 보유"""
+        row = self._conn.execute(
+            "SELECT rowid FROM search_fts WHERE search_fts MATCH ? ORDER BY rowid DESC LIMIT 1 OFFSET ?",
+            (match, n),
+        ).fetchone()
+        return row[0] if row else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT doc_type, COUNT(*) AS n FROM search_docs GROUP BY doc_type"
+            ).fetchall()
+        return {row["doc_type"]: row["n"] for row in rows}
+
+    async def backfill(self, storage: StorageBackend, page_size: int = 100) -> dict:
+        """기존 세션/메시지/리포트 전체 색인 (처음 켤 때 1회)"""
+        counts = {"sessions": 0, "messages": 0, "reports": 0}
+        cursor = None
+        while True:
+            sessions = await storage.list_sessions(
+                limit=page_size, cursor=cursor,
+                columns=("id", "user_id", "topic", "project_type", "created_at"),
+            )
+            for session in sessions:
+                await asyncio.to_thread(self.index_session, session)
+                messages = await storage.get_messages(
+                    session["id"], ("id", "role", "content_text", "round_index", "created_at")
+                )
+                await asyncio.to_thread(self.index_messages, session["id"], messages)
+                report = await storage.get_final_report(session["id"])
+                if report and is_complete_report(report.get("report_json")):
+                    await asyncio.to_thread(
+                        self.index_report, session["id"], report.get("report_json"), report.get("report_md"),
+                        report.get("created_at"),
+                    )
+                    counts["reports"] += 1
+                counts["sessions"] += 1
+                counts["messages"] += len(messages)
+            if len(sessions) < page_size:
+                break
+            cursor = session_cursor(sessions[-1])
+        logger.info(f"[SearchIndex] Backfill done: {counts}")
+        return counts
+
+
+class SearchIndexingStorage(StorageProxy):
+    """
+    쓰기 시 검색 색인을 함께 갱신하는 저장소
+
+    색인은 스레드에서 실행하고, 실패는 로그만 남기고 원래 쓰기 결과를 그대로 반환합니다.
+    """
+
+    def __init__(self, backend: StorageBackend, index: SearchIndex):
+        super().__init__(backend)
+        self.index = index
+
+    async def _safe(self, fn, *args):
+        try:
+            await asyncio.to_thread(fn, *args)
+        except Exception as e:
+            logger.error(f"[SearchIndex] Indexing failed: {e}", exc_info=True)
+
+    async def create_session(self, user_id: str, category: str, topic: str) -> dict:
+        session = await self._backend.create_session(user_id, category, topic)
+        if session:
+            await self._safe(self.index.index_session, session)
+        return session
+
+    async def update_session(self, session_id: str, updates: dict) -> Optional[dict]:
+        session = await self._backend.update_session(session_id, updates)
+        if session and ("topic" in updates or "project_type" in updates):
+            await self._safe(self.index.index_session, session)
+        return session
+
+    async def save_message(self, session_id: str, message_data: dict) -> Optional[dict]:
+        message = await self._backend.save_message(session_id, message_data)
+        # 스트리밍 중인 초안은 완료 시점(update_message)에 색인
+        if message and message.get("status") != "streaming":
+            await self._safe(self.index.index_messages, session_id, [message])
+        return message
+
+    async def update_message(self, session_id: str, message_id: str, updates: dict) -> Optional[dict]:
+        message = await self._backend.update_message(session_id, message_id, updates)
+        if message and updates.get("status") == "complete":
+            await self._safe(self.index.index_messages, session_id, [message])
+        return message
+
+    async def save_messages(self, session_id: str, messages: List[dict]) -> list:
+        saved = await self._backend.save_messages(session_id, messages)
+        await self._safe(self.index.index_messages, session_id, saved)
+        return saved
+
+    async def save_final_report(self, session_id: str, report_json: dict, report_md: str = None) -> Optional[dict]:
+        report = await self._backend.save_final_report(session_id, report_json, report_md)
+        # 생성 중(streaming)이거나 실패한 부분 리포트는 색인하지 않음 (완료 시 한 번)
+        if is_complete_report(report_json):
+            await self._safe(
+                self.index.index_report, session_id, report_json, report_md,
+                report.get("created_at") if report else None,
+            )
+        return report
@@ -0,0 +1,58 @@
+"""
+로컬 SQLite 부가 파일 연결 (검색 색인, 이벤트 로그/버스, 캐시 무효화 버스)
+
+임포트 시점에는 파일을 만들지 않고 첫 사용 때 엽니다.
+쓸 수 없는 위치(서버리스의 작업 디렉터리 등)여도 앱 임포트는 실패하지 않고,
+그 기능을 실제로 쓸 때 해당 호출만 오류가 납니다.
+
+- WAL + synchronous=NORMAL + busy_timeout (여러 워커가 같은 파일을 공유해도 됨)
+- 상위 디렉터리가 없으면 만듦 (DATA_DIR)
+"""
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+class LazySQLite:
+    """첫 get() 때 여는 SQLite 연결 (스레드 간 공유, 호출자가 쓰기 락 관리)"""
+
+    def __init__(self, path: str, schema: str, cached_statements: int = 128, row_factory=None):
+        self.path = path
+        self._schema = schema
+        self._cached_statements = cached_statements
+        self._row_factory = row_factory
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open_lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self._conn is not None
+
+    def get(self) -> sqlite3.Connection:
+        if self._conn is None:
+            with self._open_lock:
+                if self._conn is None:
+                    self._conn = self._open()
+        return self._conn
+
+    def _open(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if self.path != ":memory:" and directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None, cached_statements=self._cached_statements
+        )
+        if self._row_factory is not None:
+            conn.row_factory = self._row_factory
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.executescript(self._schema)
+        return conn
+
+    def close(self):
+        with self._open_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,492 @@
+"""
+SQLite 저장소 (셀프 호스팅 / 배치 실행 / 벤치마크용)
+
+Supabase 없이도 같은 StorageBackend 인터페이스로 동작합니다.
+- WAL 모드 + synchronous=NORMAL (읽기와 쓰기가 서로 막지 않음)
+- 상수 SQL + 파라미터 바인딩 (sqlite3 statement cache로 prepared statement 재사용)
+- messages(session_id, created_at) 인덱스
+- CaseFile은 JSON 문서 컬럼 하나로 저장 (필드 추가 시 마이그레이션 불필요)
+- 모든 쿼리는 저장소 전용 스레드에서 실행 (잠긴 쓰기의 busy_timeout 대기가 이벤트 루프를 막지 않음)
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Sequence, TypeVar
+
+from storage.base import (
+    StorageBackend, MESSAGE_DEFAULT_COLUMNS, SESSION_LIST_COLUMNS, decode_cursor,
+)
+from storage.case_file_patch import CaseFilePatch
+
+
+SESSION_COLUMNS = (
+    "id", "user_id", "category", "topic", "status", "round_index", "phase",
+    "ended_reason", "project_type", "case_type", "jurisdiction", "facts_stipulated",
+    "archived_at", "created_at", "updated_at",
+)
+
+MESSAGE_COLUMNS = (
+    "id", "session_id", "role", "content_text", "content_json", "reasoning_summary",
+    "round_index", "phase", "event_id", "status", "created_at",
+)
+
+# JSON으로 직렬화해서 저장하는 컬럼
+_MESSAGE_JSON_COLUMNS = ("content_json", "reasoning_summary")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    category TEXT,
+    topic TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    round_index INTEGER NOT NULL DEFAULT 0,
+    phase TEXT NOT NULL DEFAULT 'idle',
+    ended_reason TEXT,
+    project_type TEXT DEFAULT 'general',
+    case_type TEXT,
+    jurisdiction TEXT,
+    facts_stipulated INTEGER DEFAULT 0,
+    archived_at TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_user_created ON sessions(user_id, created_at DESC, id DESC);
+
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    role TEXT NOT NULL,
+    content_text TEXT NOT NULL,
+    content_json TEXT,
+    reasoning_summary TEXT,
+    round_index INTEGER NOT NULL,
+    phase TEXT NOT NULL,
+    event_id INTEGER,
+    status TEXT NOT NULL DEFAULT 'complete',
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_messages_session_created ON messages(session_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_messages_session_round ON messages(session_id, round_index, created_at);
+
+CREATE TABLE IF NOT EXISTS case_files (
+    session_id TEXT PRIMARY KEY REFERENCES sessions(id) ON DELETE CASCADE,
+    data TEXT NOT NULL DEFAULT '{}',
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS final_reports (
+    session_id TEXT PRIMARY KEY REFERENCES sessions(id) ON DELETE CASCADE,
+    report_json TEXT NOT NULL,
+    report_md TEXT,
+    created_at TEXT NOT NULL
+);
+"""
+
+_INSERT_SESSION = (
+    "INSERT INTO sessions (id, user_id, category, topic, created_at, updated_at) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+_SELECT_SESSION = "SELECT * FROM sessions WHERE id = ?"
+_INSERT_MESSAGE = (
+    f"INSERT INTO messages ({', '.join(MESSAGE_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in MESSAGE_COLUMNS)})"
+)
+_SELECT_MESSAGE = "SELECT * FROM messages WHERE id = ?"
+_SELECT_CASE_FILE = "SELECT data, version, updated_at FROM case_files WHERE session_id = ?"
+_UPSERT_CASE_FILE = (
+    "INSERT INTO case_files (session_id, data, updated_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(session_id) DO UPDATE SET data = excluded.data, "
+    "version = case_files.version + 1, updated_at = excluded.updated_at"
+)
+_UPSERT_FINAL_REPORT = (
+    "INSERT INTO final_reports (session_id, report_json, report_md, created_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(session_id) DO UPDATE SET report_json = excluded.report_json, report_md = excluded.report_md"
+)
+_SELECT_FINAL_REPORT = "SELECT * FROM final_reports WHERE session_id = ?"
+
+
+def _message_select(columns: Sequence[str]) -> str:
+    """projection 검증 + keyset 페이지네이션에 필요한 id/created_at 포함"""
+    unknown = set(columns) - set(MESSAGE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown message columns: {sorted(unknown)}")
+    required = [c for c in ("id", "created_at") if c not in columns]
+    return ", ".join(list(columns) + required)
+
+
+T = TypeVar("T")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    SQLite 저장소
+
+    연결 하나를 락으로 보호해 공유하고, 쿼리는 전용 스레드 하나(_run)에서 순서대로 실행합니다.
+    다른 프로세스가 쓰기 락을 잡고 있어 busy_timeout만큼 기다려도 SSE 스트림/요청 처리는 계속됩니다.
+    path=":memory:"이면 프로세스 내 메모리 저장소로 동작합니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-store")
+        self._conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit, 트랜잭션은 명시적으로 BEGIN
+            cached_statements=256,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(SCHEMA)
+        self._migrate()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+    def _migrate(self):
+        """이전 버전 DB 파일에 추가된 컬럼 보강"""
+        added = {
+            ("case_files", "version"): "INTEGER NOT NULL DEFAULT 0",
+            ("sessions", "archived_at"): "TEXT",
+            ("messages", "status"): "TEXT NOT NULL DEFAULT 'complete'",
+        }
+        for (table, column), definition in added.items():
+            columns = {row["name"] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        # 중단된 초안 조회 (status 컬럼이 보강된 뒤 생성)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_messages_streaming ON messages(created_at) WHERE status = 'streaming'"
+        )
+
+    # === 내부 헬퍼 ===
+
+    async def _run(self, fn: Callable[..., T], *args) -> T:
+        """fn(*args)를 저장소 전용 스레드에서 락을 잡고 실행"""
+        def locked():
+            with self._lock:
+                return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, locked)
+
+    async def _fetchone(self, sql: str, params: tuple) -> Optional[sqlite3.Row]:
+        return await self._run(lambda: self._conn.execute(sql, params).fetchone())
+
+    async def _fetchall(self, sql: str, params: tuple) -> List[sqlite3.Row]:
+        return await self._run(lambda: self._conn.execute(sql, params).fetchall())
+
+    async def _execute_then_fetch(self, sql: str, params: tuple, select: str, key: tuple) -> Optional[sqlite3.Row]:
+        """쓰기 하나 + 같은 락 안에서 결과 행 재조회"""
+        def run():
+            self._conn.execute(sql, params)
+            return self._conn.execute(select, key).fetchone()
+        return await self._run(run)
+
+    @staticmethod
+    def _session_row(row: Optional[sqlite3.Row]) -> Optional[dict]:
+        if row is None:
+            return None
+        session = dict(row)
+        if "facts_stipulated" in session:
+            session["facts_stipulated"] = bool(session["facts_stipulated"])
+        return session
+
+    @staticmethod
+    def _message_row(row: sqlite3.Row) -> dict:
+        message = dict(row)
+        for column in _MESSAGE_JSON_COLUMNS:
+            if message.get(column) is not None:
+                message[column] = json.loads(message[column])
+        return message
+
+    @staticmethod
+    def _message_row_from_params(params: tuple) -> dict:
+        message = dict(zip(MESSAGE_COLUMNS, params))
+        for column in _MESSAGE_JSON_COLUMNS:
+            if message.get(column) is not None:
+                message[column] = json.loads(message[column])
+        return message
+
+    @staticmethod
+    def _message_params(session_id: str, message_data: dict) -> tuple:
+        unknown = set(message_data) - set(MESSAGE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown message columns: {sorted(unknown)}")
+
+        message = {
+            **message_data,
+            "session_id": session_id,
+            "id": message_data.get("id") or str(uuid.uuid4()),
+            "status": message_data.get("status") or "complete",
+            "created_at": message_data.get("created_at") or _now(),
+        }
+        for column in _MESSAGE_JSON_COLUMNS:
+            if message.get(column) is not None:
+                message[column] = json.dumps(message[column], ensure_ascii=False)
+        return tuple(message.get(column) for column in MESSAGE_COLUMNS)
+
+    # === Session ===
+
+    async def create_session(self, user_id: str, category: str, topic: str) -> dict:
+        session_id = str(uuid.uuid4())
+        now = _now()
+        row = await self._execute_then_fetch(
+            _INSERT_SESSION, (session_id, user_id, category, topic, now, now), _SELECT_SESSION, (session_id,)
+        )
+        return self._session_row(row)
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        return self._session_row(await self._fetchone(_SELECT_SESSION, (session_id,)))
+
+    async def list_sessions(
+        self,
+        user_id: str = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        project_type: Optional[str] = None,
+        columns: Sequence[str] = SESSION_LIST_COLUMNS
+    ) -> list:
+        unknown = set(columns) - set(SESSION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown session columns: {sorted(unknown)}")
+        select = list(columns) + [c for c in ("id", "created_at") if c not in columns]
+
+        conditions, params = [], []
+        for column, value in (("user_id", user_id), ("status", status), ("project_type", project_type)):
+            if value:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if cursor:
+            created_at, session_id = decode_cursor(cursor)
+            conditions.append("(created_at, id) < (?, ?)")
+            params.extend([created_at, session_id])
+
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        sql = (
+            f"SELECT {', '.join(select)} FROM sessions {where}"
+            "ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        rows = await self._fetchall(sql, tuple(params) + (limit,))
+        return [self._session_row(row) for row in rows]
+
+    async def update_session(self, session_id: str, updates: dict) -> Optional[dict]:
+        unknown = set(updates) - set(SESSION_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown session columns: {sorted(unknown)}")
+
+        fields = {**updates, "updated_at": _now()}
+        fields.pop("id", None)
+        # 컬럼 순서를 고정해 같은 키 조합이면 같은 SQL 문(= 캐시된 statement)을 사용
+        columns = [column for column in SESSION_COLUMNS if column in fields]
+        sql = f"UPDATE sessions SET {', '.join(f'{c} = ?' for c in columns)} WHERE id = ?"
+        params = tuple(fields[c] for c in columns) + (session_id,)
+        row = await self._execute_then_fetch(sql, params, _SELECT_SESSION, (session_id,))
+        return self._session_row(row)
+
+    async def list_archivable_sessions(self, finished_before: str, limit: int = 100) -> list:
+        rows = await self._fetchall(
+            "SELECT id, updated_at FROM sessions "
+            "WHERE status IN ('finalized', 'completed') AND archived_at IS NULL AND updated_at < ? "
+            "ORDER BY updated_at LIMIT ?",
+            (finished_before, limit),
+        )
+        return [dict(row) for row in rows]
+
+    # === Message ===
+
+    async def delete_messages(self, session_id: str) -> int:
+        return await self._run(
+            lambda: self._conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,)).rowcount
+        )
+
+    async def save_message(self, session_id: str, message_data: dict) -> Optional[dict]:
+        params = self._message_params(session_id, message_data)
+        row = await self._execute_then_fetch(_INSERT_MESSAGE, params, _SELECT_MESSAGE, (params[0],))
+        return self._message_row(row)
+
+    async def update_message(self, session_id: str, message_id: str, updates: dict) -> Optional[dict]:
+        unknown = set(updates) - set(MESSAGE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown message columns: {sorted(unknown)}")
+        values = dict(updates)
+        for column in _MESSAGE_JSON_COLUMNS:
+            if values.get(column) is not None:
+                values[column] = json.dumps(values[column], ensure_ascii=False)
+        assignments = ", ".join(f"{column} = ?" for column in values)
+        row = await self._execute_then_fetch(
+            f"UPDATE messages SET {assignments} WHERE id = ? AND session_id = ?",
+            (*values.values(), message_id, session_id),
+            _SELECT_MESSAGE, (message_id,),
+        )
+        return self._message_row(row) if row else None
+
+    async def list_stale_drafts(self, started_before: str, limit: int = 100) -> list:
+        rows = await self._fetchall(
+            "SELECT id, session_id, content_text, event_id FROM messages "
+            "WHERE status = 'streaming' AND created_at < ? ORDER BY created_at LIMIT ?",
+            (started_before, limit),
+        )
+        return [dict(row) for row in rows]
+
+    async def save_messages(self, session_id: str, messages: List[dict]) -> list:
+        if not messages:
+            return []
+        params = [self._message_params(session_id, message) for message in messages]
+
+        def run():
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(_INSERT_MESSAGE, params)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        await self._run(run)
+        return [self._message_row_from_params(p) for p in params]
+
+    async def get_messages(self, session_id: str, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS) -> list:
+        sql = (
+            f"SELECT {_message_select(columns)} FROM messages "
+            "WHERE session_id = ? ORDER BY created_at, id"
+        )
+        return [self._message_row(row) for row in await self._fetchall(sql, (session_id,))]
+
+    async def get_recent_messages(
+        self, session_id: str, limit: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        sql = (
+            f"SELECT {_message_select(columns)} FROM messages "
+            "WHERE session_id = ? ORDER BY created_at DESC, id DESC LIMIT ?"
+        )
+        rows = await self._fetchall(sql, (session_id, limit))
+        return [self._message_row(row) for row in reversed(rows)]
+
+    async def get_messages_since(
+        self,
+        session_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        if cursor:
+            created_at, message_id = decode_cursor(cursor)
+            sql = (
+                f"SELECT {_message_select(columns)} FROM messages "
+                "WHERE session_id = ? AND (created_at, id) > (?, ?) "
+                "ORDER BY created_at, id LIMIT ?"
+            )
+            params = (session_id, created_at, message_id, limit)
+        else:
+            sql = (
+                f"SELECT {_message_select(columns)} FROM messages "
+                "WHERE session_id = ? ORDER BY created_at, id LIMIT ?"
+            )
+            params = (session_id, limit)
+        return [self._message_row(row) for row in await self._fetchall(sql, params)]
+
+    async def get_round_messages(
+        self, session_id: str, round_index: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        sql = (
+            f"SELECT {_message_select(columns)} FROM messages "
+            "WHERE session_id = ? AND round_index = ? ORDER BY created_at, id"
+        )
+        return [self._message_row(row) for row in await self._fetchall(sql, (session_id, round_index))]
+
+    # === CaseFile ===
+
+    @staticmethod
+    def _case_file_row(session_id: str, row: Optional[sqlite3.Row]) -> Optional[dict]:
+        if row is None:
+            return None
+        return {
+            **json.loads(row["data"]),
+            "session_id": session_id,
+            "version": row["version"],
+            "updated_at": row["updated_at"],
+        }
+
+    def _write_case_file(self, session_id: str, update) -> Optional[dict]:
+        """
+        읽기-계산-쓰기를 한 트랜잭션(BEGIN IMMEDIATE)으로 실행 (_run으로 호출)
+
+        update(current)는 반영할 필드 dict를 반환하고, None을 반환하면 쓰지 않습니다.
+        """
+        now = _now()
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = self._case_file_row(
+                session_id, self._conn.execute(_SELECT_CASE_FILE, (session_id,)).fetchone()
+            )
+            fields = update(current)
+            if fields is None:
+                self._conn.execute("ROLLBACK")
+                return None
+            data = {
+                k: v for k, v in (current or {}).items()
+                if k not in ("session_id", "version", "updated_at")
+            }
+            data.update({
+                k: v for k, v in fields.items()
+                if k not in ("session_id", "version", "updated_at")
+            })
+            self._conn.execute(
+                _UPSERT_CASE_FILE, (session_id, json.dumps(data, ensure_ascii=False), now)
+            )
+            self._conn.execute("COMMIT")
+        except Exception:
+            self._conn.execute("ROLLBACK")
+            raise
+        version = current["version"] + 1 if current else 0
+        return {**data, "session_id": session_id, "version": version, "updated_at": now}
+
+    async def save_case_file(self, session_id: str, case_file_data: dict) -> Optional[dict]:
+        # Supabase upsert의 부분 컬럼 갱신과 동일한 의미
+        return await self._run(self._write_case_file, session_id, lambda current: case_file_data)
+
+    async def save_case_file_if_version(
+        self, session_id: str, fields: dict, expected_version: Optional[int]
+    ) -> Optional[dict]:
+        def update(current):
+            current_version = current["version"] if current else None
+            return fields if current_version == expected_version else None
+        return await self._run(self._write_case_file, session_id, update)
+
+    async def patch_case_file(self, session_id: str, patch: CaseFilePatch) -> Optional[dict]:
+        # 쓰기 락 안에서 적용하므로 충돌/재시도가 없음
+        return await self._run(self._write_case_file, session_id, patch.apply)
+
+    async def get_case_file(self, session_id: str) -> Optional[dict]:
+        return self._case_file_row(session_id, await self._fetchone(_SELECT_CASE_FILE, (session_id,)))
+
+    # === FinalReport ===
+
+    async def save_final_report(self, session_id: str, report_json: dict, report_md: str = None) -> Optional[dict]:
+        params = (session_id, json.dumps(report_json, ensure_ascii=False), report_md, _now())
+        await self._run(lambda: self._conn.execute(_UPSERT_FINAL_REPORT, params))
+        return await self.get_final_report(session_id)
+
+    async def get_final_report(self, session_id: str) -> Optional[dict]:
+        row = await self._fetchone(_SELECT_FINAL_REPORT, (session_id,))
+        if row is None:
+            return None
+        report = dict(row)
+        report["report_json"] = json.loads(report["report_json"])
+        return report
@@ -4,9 +4,15 @@ Supabase 클라이언트 (백엔드용)
 Service Role Key를 사용하여 RLS를 우회하고 관리자 작업 수행
 """
 import os
+from typing import Optional, Sequence
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+
+from storage.base import (
+    StorageBackend, MESSAGE_DEFAULT_COLUMNS, SESSION_LIST_COLUMNS, decode_cursor,
+)
+
 load_dotenv()
 
 SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL")
@@ -15,6 +21,12 @@ SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY")
 _client: Client = None
 
 
+def _select_list(columns: Sequence[str]) -> str:
+    """keyset 페이지네이션에 필요한 id/created_at을 포함한 select 목록"""
+    required = [c for c in ("id", "created_at") if c not in columns]
+    return ",".join(list(columns) + required)
+
+
 def get_supabase_client() -> Client:
     """Supabase 클라이언트 싱글톤"""
     global _client
@@ -25,85 +37,226 @@ def get_supabase_client() -> Client:
     return _client
 
 
-# 헬퍼 함수들
-async def create_session(user_id: str, category: str, topic: str) -> dict:
-    """새 세션 생성"""
-    client = get_supabase_client()
-    result = client.table("sessions").insert({
-        "user_id": user_id,
-        "category": category,
-        "topic": topic,
-    }).execute()
-    return result.data[0] if result.data else None
-
-
-async def get_session(session_id: str) -> dict:
-    """세션 조회"""
-    client = get_supabase_client()
-    result = client.table("sessions").select("*").eq("id", session_id).single().execute()
-    return result.data
-
-
-async def list_sessions(user_id: str = None) -> list:
-    """세션 목록 조회"""
-    client = get_supabase_client()
-    query = client.table("sessions").select("*").order("created_at", desc=True)
-    if user_id:
-        query = query.eq("user_id", user_id)
-    result = query.execute()
-    return result.data or []
-
-
-async def update_session(session_id: str, updates: dict) -> dict:
-    """세션 업데이트"""
-    client = get_supabase_client()
-    result = client.table("sessions").update(updates).eq("id", session_id).execute()
-    return result.data[0] if result.data else None
-
-
-async def save_message(session_id: str, message_data: dict) -> dict:
-    """메시지 저장"""
-    client = get_supabase_client()
-    message_data["session_id"] = session_id
-    result = client.table("messages").insert(message_data).execute()
-    return result.data[0] if result.data else None
-
-
-async def get_messages(session_id: str) -> list:
-    """세션 메시지 조회"""
-    client = get_supabase_client()
-    result = client.table("messages").select("*").eq("session_id", session_id).order("created_at").execute()
-    return result.data or []
-
-
-async def save_case_file(session_id: str, case_file_data: dict) -> dict:
-    """CaseFile 저장/업데이트"""
-    client = get_supabase_client()
-    case_file_data["session_id"] = session_id
-    result = client.table("case_files").upsert(case_file_data).execute()
-    return result.data[0] if result.data else None
-
-
-async def get_case_file(session_id: str) -> dict:
-    """CaseFile 조회"""
-    client = get_supabase_client()
-    result = client.table("case_files").select("*").eq("session_id", session_id).single().execute()
-    return result.data
-
-
-async def save_final_report(session_id: str, report_json: dict, report_md: str = None) -> dict:
-    """최종 리포트 저장 (upsert - 이미 존재하면 업데이트)"""
-    client = get_supabase_client()
-    result = client.table("final_reports").upsert({
-        "session_id": session_id,
-        "report_json": report_json,
-        "report_md": report_md,
-    }).execute()
-    return result.data[0] if result.data else None
-
-
-async def get_final_report(session_id: str) -> dict:
-    """최종 리포트 조회 (없으면 None 반환)"""
-    client = get_supabase_client()
-    result = client.table("final_reports").select("*").eq("session_id", session_id).execute()
-    return result.data[0] if result.data else None
+class SupabaseStorage(StorageBackend):
+    """Supabase(PostgREST) 저장소"""
+
+    async def create_session(self, user_id: str, category: str, topic: str) -> dict:
+        """새 세션 생성"""
+        client = get_supabase_client()
+        result = client.table("sessions").insert({
+            "user_id": user_id,
+            "category": category,
+            "topic": topic,
+        }).execute()
+        return result.data[0] if result.data else None
+
+    async def get_session(self, session_id: str) -> dict:
+        """세션 조회"""
+        client = get_supabase_client()
+        result = client.table("sessions").select("*").eq("id", session_id).single().execute()
+        return result.data
+
+    async def list_sessions(
+        self,
+        user_id: str = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[str] = None,
+        project_type: Optional[str] = None,
+        columns: Sequence[str] = SESSION_LIST_COLUMNS
+    ) -> list:
+        """세션 목록 조회 ((user_id, created_at desc, id desc) 인덱스 keyset 페이지네이션)"""
+        client = get_supabase_client()
+        query = client.table("sessions").select(_select_list(columns))
+        if user_id:
+            query = query.eq("user_id", user_id)
+        if status:
+            query = query.eq("status", status)
+        if project_type:
+            query = query.eq("project_type", project_type)
+        if cursor:
+            created_at, session_id = decode_cursor(cursor)
+            query = query.or_(
+                f'created_at.lt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.lt.{session_id})'
+            )
+        result = query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute()
+        return result.data or []
+
+    async def update_session(self, session_id: str, updates: dict) -> dict:
+        """세션 업데이트"""
+        client = get_supabase_client()
+        result = client.table("sessions").update(updates).eq("id", session_id).execute()
+        return result.data[0] if result.data else None
+
+    async def list_archivable_sessions(self, finished_before: str, limit: int = 100) -> list:
+        """아카이브 대상 세션 (종료 후 finished_before 경과, 미아카이브)"""
+        client = get_supabase_client()
+        result = (
+            client.table("sessions").select("id,updated_at")
+            .in_("status", ["finalized", "completed"])
+            .is_("archived_at", "null")
+            .lt("updated_at", finished_before)
+            .order("updated_at")
+            .limit(limit)
+            .execute()
+        )
+        return result.data or []
+
+    async def save_message(self, session_id: str, message_data: dict) -> dict:
+        """메시지 저장"""
+        client = get_supabase_client()
+        message_data["session_id"] = session_id
+        result = client.table("messages").insert(message_data).execute()
+        return result.data[0] if result.data else None
+
+    async def save_messages(self, session_id: str, messages: list) -> list:
+        """메시지 다건 저장 (insert 1회)"""
+        if not messages:
+            return []
+        client = get_supabase_client()
+        rows = [{**message, "session_id": session_id} for message in messages]
+        result = client.table("messages").insert(rows).execute()
+        return result.data or []
+
+    async def update_message(self, session_id: str, message_id: str, updates: dict) -> Optional[dict]:
+        """메시지 부분 갱신 (스트리밍 초안)"""
+        client = get_supabase_client()
+        result = (
+            client.table("messages").update(updates)
+            .eq("id", message_id).eq("session_id", session_id)
+            .execute()
+        )
+        return result.data[0] if result.data else None
+
+    async def list_stale_drafts(self, started_before: str, limit: int = 100) -> list:
+        """중단된 초안 (started_before 이전에 시작, 아직 streaming)"""
+        client = get_supabase_client()
+        result = (
+            client.table("messages").select("id,session_id,content_text,event_id")
+            .eq("status", "streaming")
+            .lt("created_at", started_before)
+            .order("created_at")
+            .limit(limit)
+            .execute()
+        )
+        return result.data or []
+
+    async def delete_messages(self, session_id: str) -> int:
+        """세션 메시지 삭제 (아카이브 후)"""
+        client = get_supabase_client()
+        result = client.table("messages").delete().eq("session_id", session_id).execute()
+        return len(result.data or [])
+
+    async def get_messages(self, session_id: str, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS) -> list:
+        """세션 메시지 조회"""
+        client = get_supabase_client()
+        result = (
+            client.table("messages").select(_select_list(columns))
+            .eq("session_id", session_id)
+            .order("created_at").order("id")
+            .execute()
+        )
+        return result.data or []
+
+    async def get_recent_messages(
+        self, session_id: str, limit: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        """마지막 N개 메시지 ((session_id, created_at, id) 인덱스 역방향 스캔)"""
+        client = get_supabase_client()
+        result = (
+            client.table("messages").select(_select_list(columns))
+            .eq("session_id", session_id)
+            .order("created_at", desc=True).order("id", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return list(reversed(result.data or []))
+
+    async def get_messages_since(
+        self,
+        session_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        """cursor 이후 메시지 (keyset 페이지네이션)"""
+        client = get_supabase_client()
+        query = client.table("messages").select(_select_list(columns)).eq("session_id", session_id)
+        if cursor:
+            created_at, message_id = decode_cursor(cursor)
+            query = query.or_(
+                f'created_at.gt."{created_at}",'
+                f'and(created_at.eq."{created_at}",id.gt.{message_id})'
+            )
+        result = query.order("created_at").order("id").limit(limit).execute()
+        return result.data or []
+
+    async def get_round_messages(
+        self, session_id: str, round_index: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        """특정 라운드의 메시지"""
+        client = get_supabase_client()
+        result = (
+            client.table("messages").select(_select_list(columns))
+            .eq("session_id", session_id)
+            .eq("round_index", round_index)
+            .order("created_at").order("id")
+            .execute()
+        )
+        return result.data or []
+
+    async def save_case_file(self, session_id: str, case_file_data: dict) -> dict:
+        """CaseFile 저장/업데이트"""
+        client = get_supabase_client()
+        case_file_data["session_id"] = session_id
+        result = client.table("case_files").upsert(case_file_data).execute()
+        return result.data[0] if result.data else None
+
+    async def get_case_file(self, session_id: str) -> dict:
+        """CaseFile 조회"""
+        client = get_supabase_client()
+        result = client.table("case_files").select("*").eq("session_id", session_id).single().execute()
+        return result.data
+
+    async def save_case_file_if_version(
+        self, session_id: str, fields: dict, expected_version: Optional[int]
+    ) -> Optional[dict]:
+        """
+        CaseFile 조건부 쓰기
+
+        변경 필드만 전송하고, version 조건이 맞지 않으면 갱신 행이 0개라 None을 반환합니다.
+        (version 증가는 bump_case_files_version 트리거가 담당)
+        """
+        client = get_supabase_client()
+        fields = {k: v for k, v in fields.items() if k not in ("session_id", "version", "updated_at")}
+        if expected_version is None:
+            # 아직 없는 CaseFile: 동시에 생성된 행이 있으면 무시되고 빈 결과
+            result = client.table("case_files").upsert(
+                {**fields, "session_id": session_id}, ignore_duplicates=True
+            ).execute()
+        else:
+            result = (
+                client.table("case_files").update(fields)
+                .eq("session_id", session_id)
+                .eq("version", expected_version)
+                .execute()
+            )
+        return result.data[0] if result.data else None
+
+    async def save_final_report(self, session_id: str, report_json: dict, report_md: str = None) -> dict:
+        """최종 리포트 저장 (upsert - 이미 존재하면 업데이트)"""
+        client = get_supabase_client()
+        result = client.table("final_reports").upsert({
+            "session_id": session_id,
+            "report_json": report_json,
+            "report_md": report_md,
+        }).execute()
+        return result.data[0] if result.data else None
+
+    async def get_final_report(self, session_id: str) -> dict:
+        """최종 리포트 조회 (없으면 None 반환)"""
+        client = get_supabase_client()
+        result = client.table("final_reports").select("*").eq("session_id", session_id).execute()
+        return result.data[0] if result.data else None
+
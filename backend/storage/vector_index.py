@@ -0,0 +1,344 @@
+"""
+세션별 벡터 색인 (관련 발언 / CaseFile 사실 검색)
+
+에이전트는 messages=[]로 호출되므로 이전 논의는 컨텍스트 블록으로만 전달됩니다.
+직전 발언 몇 개를 통째로 넣는 대신, 이번 phase와 관련된 이전 발언 조각과 사실을 찾아 넣기 위한 색인입니다.
+
+- 임베딩은 교체 가능 (EMBEDDERS / VECTOR_EMBEDDER). 기본 hashing은 네트워크 없이
+  한글 bigram + 단어 토큰(search_index.tokenize)을 해싱한 희소 벡터 (L2 정규화)
+- 메시지는 VECTOR_CHUNK_CHARS 단위 조각으로, CaseFile은 목록 필드의 항목 하나씩 색인
+- save_message / update_message(완료) / CaseFile 쓰기 시 VectorIndexingStorage가 증분 갱신
+- 색인은 프로세스 메모리에 세션 단위로 두고(LRU VECTOR_MAX_SESSIONS) 처음 검색할 때 저장소에서 구성
+- numpy가 있으면 조각 행렬 × 질의 벡터로 한 번에 코사인 점수 계산, 없으면 희소 내적
+"""
+import logging
+import math
+import re
+import zlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+from config import VECTOR_DIM, VECTOR_CHUNK_CHARS, VECTOR_MAX_SESSIONS, VECTOR_MIN_SCORE, VECTOR_EMBEDDER
+from models.case_file import CaseFile
+from storage.base import StorageBackend, StorageProxy
+from storage.case_file_patch import CaseFilePatch
+from storage.search_index import tokenize
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# 색인하는 CaseFile 필드 (문자열 목록 + 사건 개요)
+FACT_FIELDS = (
+    "facts", "confirmed_facts", "disputed_facts", "missing_facts_questions", "case_overview", "parties",
+    "goals", "constraints", "decisions", "decisions_so_far", "open_issues", "assumptions",
+    "next_experiments", "scope_in", "scope_out", "risks_so_far",
+)
+
+VECTOR_MESSAGE_COLUMNS = ("id", "role", "content_text", "round_index", "status")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+SparseVector = Dict[int, float]
+
+
+class HashingEmbedder:
+    """
+    로컬 해싱 임베딩 (네트워크/모델 불필요)
+
+    토큰마다 crc32로 차원과 부호를 정하고 1 + log(tf) 가중치를 더한 뒤 L2 정규화합니다.
+    """
+    name = "hashing"
+
+    def __init__(self, dim: int = VECTOR_DIM):
+        self.dim = dim
+
+    def embed(self, text: str) -> SparseVector:
+        counts: Dict[str, int] = {}
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+        vector: SparseVector = {}
+        for token, tf in counts.items():
+            h = zlib.crc32(token.encode("utf-8"))
+            index = h % self.dim
+            sign = 1.0 if (h // self.dim) & 1 else -1.0
+            vector[index] = vector.get(index, 0.0) + sign * (1.0 + math.log(tf))
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {i: w / norm for i, w in vector.items() if w} if norm else {}
+
+
+# 임베딩 이름 → 생성자 (dim을 받아 embed(text) -> {차원: 값}을 가진 객체를 반환)
+EMBEDDERS: Dict[str, Callable[[int], object]] = {"hashing": HashingEmbedder}
+
+
+def chunk_text(text: str, max_chars: int = VECTOR_CHUNK_CHARS) -> List[str]:
+    """문장/줄 경계로 max_chars 이하 조각으로 나눔 (긴 문장은 글자 단위로 자름)"""
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return [text] if text else []
+    chunks: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        while len(sentence) > max_chars:
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:max_chars])
+            sentence = sentence[max_chars:]
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = ""
+        current = f"{current} {sentence}" if current else sentence
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _fact_label(field: str) -> str:
+    info = CaseFile.model_fields.get(field)
+    return (info.description if info else None) or field
+
+
+class _SessionVectors:
+    """세션 하나의 색인 (문서 + 벡터, numpy가 있으면 행렬을 증분으로 유지)"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.keys: List[str] = []
+        self.docs: List[dict] = []
+        self.vectors: List[SparseVector] = []
+        self.positions: Dict[str, int] = {}
+        self._matrix = None  # numpy: (capacity, dim) float32, 앞 len(keys)행만 유효
+
+    def _dense(self, vector: SparseVector):
+        row = np.zeros(self.dim, dtype=np.float32)
+        if vector:
+            row[list(vector)] = list(vector.values())
+        return row
+
+    def upsert(self, key: str, doc: dict, vector: SparseVector):
+        position = self.positions.get(key)
+        if position is not None:
+            self.docs[position] = doc
+            self.vectors[position] = vector
+            if self._matrix is not None:
+                self._matrix[position] = self._dense(vector)
+            return
+        self.positions[key] = len(self.keys)
+        self.keys.append(key)
+        self.docs.append(doc)
+        self.vectors.append(vector)
+        if self._matrix is not None:
+            if len(self.keys) > len(self._matrix):
+                grown = np.zeros((len(self._matrix) * 2, self.dim), dtype=np.float32)
+                grown[:len(self._matrix)] = self._matrix
+                self._matrix = grown
+            self._matrix[len(self.keys) - 1] = self._dense(vector)
+
+    def remove_prefix(self, prefix: str):
+        """키가 prefix로 시작하는 문서 제거 (행렬은 다음 검색 때 다시 구성)"""
+        if not any(key.startswith(prefix) for key in self.keys):
+            return
+        kept = [i for i, key in enumerate(self.keys) if not key.startswith(prefix)]
+        self.keys = [self.keys[i] for i in kept]
+        self.docs = [self.docs[i] for i in kept]
+        self.vectors = [self.vectors[i] for i in kept]
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self._matrix = None
+
+    def scores(self, query: SparseVector) -> List[float]:
+        """문서별 코사인 점수 (벡터가 정규화돼 있어 내적)"""
+        if np is not None:
+            if self._matrix is None:
+                self._matrix = np.zeros((max(16, len(self.keys)), self.dim), dtype=np.float32)
+                for i, vector in enumerate(self.vectors):
+                    self._matrix[i] = self._dense(vector)
+            return (self._matrix[:len(self.keys)] @ self._dense(query)).tolist()
+        return [
+            sum(query.get(i, 0.0) * w for i, w in vector.items())
+            if len(vector) <= len(query) else sum(vector.get(i, 0.0) * w for i, w in query.items())
+            for vector in self.vectors
+        ]
+
+
+class VectorIndex:
+    """세션별 벡터 색인 (프로세스 메모리, LRU)"""
+
+    def __init__(self, embedder=None, max_sessions: int = VECTOR_MAX_SESSIONS):
+        self.embedder = embedder or EMBEDDERS[VECTOR_EMBEDDER](VECTOR_DIM)
+        self._max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _SessionVectors]" = OrderedDict()
+
+    def loaded(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def drop(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def is_busy(self, session_id: str) -> bool:
+        return False
+
+    def forget_session(self, session_id: str):
+        """세션 색인을 메모리에서 내림 (다음 검색 때 저장소에서 다시 구성)"""
+        self.drop(session_id)
+
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용)"""
+        return {"sessions": self._sessions}
+
+    def stats(self) -> dict:
+        return {
+            "embedder": self.embedder.name,
+            "numpy": np is not None,
+            "sessions": len(self._sessions),
+            "docs": sum(len(s.keys) for s in self._sessions.values()),
+        }
+
+    # === 색인 (이미 올라와 있는 세션만 증분 갱신, 없으면 첫 검색 때 구성) ===
+
+    def index_messages(self, session_id: str, messages: Sequence[dict]):
+        vectors = self._sessions.get(session_id)
+        if vectors is None:
+            return
+        for message in messages:
+            if not message or not message.get("id") or message.get("status") == "streaming":
+                continue
+            prefix = f"message:{message['id']}:"
+            vectors.remove_prefix(prefix)
+            for i, chunk in enumerate(chunk_text(message.get("content_text") or "")):
+                vectors.upsert(f"{prefix}{i}", {
+                    "kind": "message",
+                    "ref_id": message["id"],
+                    "role": message.get("role"),
+                    "round_index": message.get("round_index"),
+                    "text": chunk,
+                }, self.embedder.embed(chunk))
+
+    def index_case_file(self, session_id: str, case_file: Optional[dict]):
+        vectors = self._sessions.get(session_id)
+        if vectors is None or not case_file:
+            return
+        vectors.remove_prefix("fact:")
+        for field in FACT_FIELDS:
+            value = case_file.get(field)
+            items = [value] if isinstance(value, str) else value if isinstance(value, list) else []
+            for i, item in enumerate(items):
+                if not isinstance(item, str) or not item.strip():
+                    continue
+                vectors.upsert(f"fact:{field}:{i}", {
+                    "kind": "fact", "field": field, "label": _fact_label(field), "text": item.strip(),
+                }, self.embedder.embed(item))
+
+    async def _load(self, storage: StorageBackend, session_id: str) -> _SessionVectors:
+        vectors = self._sessions.get(session_id)
+        if vectors is not None:
+            self._sessions.move_to_end(session_id)
+            return vectors
+        # 먼저 등록해 두어 조회 중 들어온 쓰기도 증분 반영 (같은 키는 교체되므로 중복 없음)
+        vectors = self._sessions[session_id] = _SessionVectors(self.embedder.dim)
+        while len(self._sessions) > self._max_sessions:
+            self._sessions.popitem(last=False)
+        try:
+            messages = await storage.get_messages(session_id, VECTOR_MESSAGE_COLUMNS)
+            case_file = await storage.get_case_file(session_id)
+        except Exception:
+            self._sessions.pop(session_id, None)
+            raise
+        self.index_messages(session_id, messages)
+        self.index_case_file(session_id, case_file)
+        logger.debug(f"[VectorIndex] Loaded {session_id}: {len(vectors.keys)} docs")
+        return vectors
+
+    # === 검색 ===
+
+    async def search(
+        self,
+        storage: StorageBackend,
+        session_id: str,
+        query: str,
+        k: int,
+        exclude_refs: Sequence[str] = (),
+        min_score: float = VECTOR_MIN_SCORE,
+    ) -> List[dict]:
+        """
+        질의와 관련된 메시지 조각/사실 top-k (점수 내림차순)
+
+        Returns: [{kind: "message" | "fact", text, score, ref_id, role, round_index | field, label}]
+        exclude_refs의 메시지(이미 컨텍스트에 넣은 직전 발언 등)는 제외합니다.
+        """
+        vectors = await self._load(storage, session_id)
+        query_vector = self.embedder.embed(query)
+        if not query_vector or not vectors.keys:
+            return []
+        excluded = set(exclude_refs)
+        scored = sorted(
+            (
+                (score, i) for i, score in enumerate(vectors.scores(query_vector))
+                if score >= min_score and vectors.docs[i].get("ref_id") not in excluded
+            ),
+            reverse=True,
+        )
+        return [{**vectors.docs[i], "score": round(score, 4)} for score, i in scored[:k]]
+
+
+class VectorIndexingStorage(StorageProxy):
+    """
+    쓰기 시 벡터 색인을 함께 갱신하는 저장소
+
+    색인 실패는 로그만 남기고 원래 쓰기 결과를 그대로 반환합니다.
+    """
+
+    def __init__(self, backend: StorageBackend, index: VectorIndex):
+        super().__init__(backend)
+        self.index = index
+
+    def _safe(self, fn, *args):
+        try:
+            fn(*args)
+        except Exception as e:
+            logger.error(f"[VectorIndex] Indexing failed: {e}", exc_info=True)
+
+    async def save_message(self, session_id: str, message_data: dict) -> Optional[dict]:
+        message = await self._backend.save_message(session_id, message_data)
+        if message:
+            self._safe(self.index.index_messages, session_id, [message])
+        return message
+
+    async def save_messages(self, session_id: str, messages: List[dict]) -> list:
+        saved = await self._backend.save_messages(session_id, messages)
+        self._safe(self.index.index_messages, session_id, saved)
+        return saved
+
+    async def update_message(self, session_id: str, message_id: str, updates: dict) -> Optional[dict]:
+        message = await self._backend.update_message(session_id, message_id, updates)
+        if message and "content_text" in updates:
+            self._safe(self.index.index_messages, session_id, [message])
+        return message
+
+    async def delete_messages(self, session_id: str) -> int:
+        deleted = await self._backend.delete_messages(session_id)
+        self.index.drop(session_id)
+        return deleted
+
+    async def save_case_file(self, session_id: str, case_file_data: dict) -> Optional[dict]:
+        case_file = await self._backend.save_case_file(session_id, case_file_data)
+        self._safe(self.index.index_case_file, session_id, case_file)
+        return case_file
+
+    async def save_case_file_if_version(
+        self, session_id: str, fields: dict, expected_version: Optional[int]
+    ) -> Optional[dict]:
+        case_file = await self._backend.save_case_file_if_version(session_id, fields, expected_version)
+        self._safe(self.index.index_case_file, session_id, case_file)
+        return case_file
+
+    async def patch_case_file(self, session_id: str, patch: CaseFilePatch) -> Optional[dict]:
+        case_file = await self._backend.patch_case_file(session_id, patch)
+        self._safe(self.index.index_case_file, session_id, case_file)
+        return case_file
@@ -0,0 +1,212 @@
+"""
+쓰기 배처 (Write Batcher)
+
+phase 하나가 끝날 때마다 update_session / save_message / save_case_file이
+각각 PostgREST 왕복을 일으키던 문제를 해결합니다.
+
+- 세션별로 짧은 윈도우(WRITE_BATCH_WINDOW_MS) 동안 쓰기를 모아 한 번에 반영
+- messages: 다건 insert 1회
+- sessions: 연속된 update를 하나로 병합 (phase 등은 마지막 값 우선)
+- case_files: 필드 단위 패치(CaseFilePatch)를 이어 붙여 조건부 쓰기 1회
+- 조회 시 미반영 쓰기를 덮어써서 반환 (read-your-writes)
+
+ROUND_END / SESSION_END 발송 전에는 반드시 flush()로 반영을 보장합니다.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from config import WRITE_BATCH_WINDOW_MS, WRITE_BATCH_MAX_MESSAGES
+from storage import get_storage
+from storage.base import MESSAGE_DEFAULT_COLUMNS
+from storage.case_file_patch import CaseFilePatch
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingWrites:
+    """세션 하나의 미반영 쓰기 묶음"""
+
+    def __init__(self):
+        self.messages: List[dict] = []
+        self.session_updates: Dict[str, Any] = {}
+        self.case_file_patch = CaseFilePatch()
+
+    def is_empty(self) -> bool:
+        return not (self.messages or self.session_updates or not self.case_file_patch.is_empty())
+
+    def merge_back(self, newer: "_PendingWrites"):
+        """반영 실패한 묶음(self) 뒤에 그 사이 들어온 쓰기(newer)를 이어 붙임"""
+        self.messages.extend(newer.messages)
+        self.session_updates.update(newer.session_updates)
+        self.case_file_patch.extend(newer.case_file_patch)
+
+
+class WriteBatcher:
+    """
+    세션별 쓰기 병합기
+
+    backend는 StorageBackend 구현체입니다.
+    """
+
+    def __init__(
+        self,
+        backend,
+        window_ms: int = WRITE_BATCH_WINDOW_MS,
+        max_messages: int = WRITE_BATCH_MAX_MESSAGES
+    ):
+        self._backend = backend
+        self._window = window_ms / 1000
+        self._max_messages = max_messages
+        self._pending: Dict[str, _PendingWrites] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._flush_locks: Dict[str, asyncio.Lock] = {}
+
+    def _get_pending(self, session_id: str) -> _PendingWrites:
+        if session_id not in self._pending:
+            self._pending[session_id] = _PendingWrites()
+        return self._pending[session_id]
+
+    def _schedule_flush(self, session_id: str):
+        """윈도우 경과 후 flush 예약 (이미 예약되어 있으면 유지)"""
+        task = self._flush_tasks.get(session_id)
+        if task and not task.done():
+            return
+        self._flush_tasks[session_id] = asyncio.create_task(self._delayed_flush(session_id))
+
+    async def _delayed_flush(self, session_id: str):
+        await asyncio.sleep(self._window)
+        # 자기 자신을 취소하지 않도록 예약 정보를 먼저 제거
+        self._flush_tasks.pop(session_id, None)
+        try:
+            await self.flush(session_id)
+        except Exception as e:
+            logger.error(f"[WriteBatcher] Background flush failed for {session_id}: {e}", exc_info=True)
+
+    # === 쓰기 ===
+
+    async def save_message(self, session_id: str, message_data: dict):
+        """메시지 insert 예약 (다건 insert로 묶임)"""
+        message = dict(message_data)
+        message["session_id"] = session_id
+        # 같은 insert 문 안에서는 DB NOW()가 동일하므로 순서 보존용 시각을 직접 기록
+        message.setdefault("created_at", datetime.now(timezone.utc).isoformat())
+
+        pending = self._get_pending(session_id)
+        pending.messages.append(message)
+
+        if len(pending.messages) >= self._max_messages:
+            await self.flush(session_id)
+        else:
+            self._schedule_flush(session_id)
+
+    async def update_session(self, session_id: str, updates: dict):
+        """세션 update 예약 (같은 키는 마지막 값만 반영)"""
+        self._get_pending(session_id).session_updates.update(updates)
+        self._schedule_flush(session_id)
+
+    async def save_case_file(self, session_id: str, fields: dict):
+        """CaseFile 필드 값 교체 예약"""
+        await self.patch_case_file(session_id, CaseFilePatch.from_fields(fields))
+
+    async def patch_case_file(self, session_id: str, patch: CaseFilePatch):
+        """CaseFile 패치 예약 (예약된 순서대로 적용)"""
+        self._get_pending(session_id).case_file_patch.extend(patch)
+        self._schedule_flush(session_id)
+
+    # === 조회 (미반영 쓰기 덮어쓰기) ===
+
+    async def get_session(self, session_id: str) -> Optional[dict]:
+        session = await self._backend.get_session(session_id)
+        pending = self._pending.get(session_id)
+        if session and pending and pending.session_updates:
+            session = {**session, **pending.session_updates}
+        return session
+
+    async def get_case_file(self, session_id: str) -> Optional[dict]:
+        case_file = await self._backend.get_case_file(session_id)
+        pending = self._pending.get(session_id)
+        if case_file and pending and not pending.case_file_patch.is_empty():
+            case_file = {**case_file, **pending.case_file_patch.apply(case_file)}
+        return case_file
+
+    # 메시지는 순서가 중요하므로 덮어쓰기 대신 먼저 반영
+    async def get_messages(self, session_id: str, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS) -> list:
+        await self.flush(session_id)
+        return await self._backend.get_messages(session_id, columns)
+
+    async def get_recent_messages(
+        self, session_id: str, limit: int, columns: Sequence[str] = MESSAGE_DEFAULT_COLUMNS
+    ) -> list:
+        await self.flush(session_id)
+        return await self._backend.get_recent_messages(session_id, limit, columns)
+
+    # === 반영 ===
+
+    async def flush(self, session_id: str):
+        """
+        세션의 미반영 쓰기를 즉시 반영합니다.
+
+        실패 시 미반영 쓰기를 되돌려 놓고 예외를 다시 던집니다.
+        """
+        task = self._flush_tasks.pop(session_id, None)
+        if task and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+
+        if session_id not in self._flush_locks:
+            self._flush_locks[session_id] = asyncio.Lock()
+
+        async with self._flush_locks[session_id]:
+            pending = self._pending.pop(session_id, None)
+            if not pending or pending.is_empty():
+                return
+
+            try:
+                if pending.messages:
+                    await self._backend.save_messages(session_id, pending.messages)
+                    pending.messages = []
+                if not pending.case_file_patch.is_empty():
+                    await self._backend.patch_case_file(session_id, pending.case_file_patch)
+                    pending.case_file_patch = CaseFilePatch()
+                if pending.session_updates:
+                    await self._backend.update_session(session_id, pending.session_updates)
+                    pending.session_updates = {}
+            except Exception:
+                newer = self._pending.pop(session_id, None)
+                if newer:
+                    pending.merge_back(newer)
+                self._pending[session_id] = pending
+                raise
+
+    async def flush_all(self):
+        """모든 세션의 미반영 쓰기 반영 (종료 시)"""
+        for session_id in list(self._pending.keys()):
+            await self.flush(session_id)
+
+    def has_pending(self, session_id: str) -> bool:
+        pending = self._pending.get(session_id)
+        return bool(pending and not pending.is_empty())
+
+    def forget_session(self, session_id: str) -> bool:
+        """
+        미반영 쓰기가 없는 세션의 락/예약 정보 제거
+
+        Returns: 제거했으면 True (미반영 쓰기나 진행 중인 flush가 있으면 False)
+        """
+        lock = self._flush_locks.get(session_id)
+        task = self._flush_tasks.get(session_id)
+        if self.has_pending(session_id) or (lock and lock.locked()) or (task and not task.done()):
+            return False
+        self._pending.pop(session_id, None)
+        self._flush_tasks.pop(session_id, None)
+        self._flush_locks.pop(session_id, None)
+        return True
+
+    def per_session_state(self) -> Dict[str, dict]:
+        """세션별 상태 컨테이너 (게이지용)"""
+        return {"pending": self._pending, "flush_tasks": self._flush_tasks, "flush_locks": self._flush_locks}
+
+
+# 싱글톤 인스턴스
+write_batcher = WriteBatcher(get_storage())
@@ -0,0 +1,29 @@
+"""
+백엔드 테스트 공통 설정
+
+config는 임포트 시점에 환경 변수를 읽으므로 앱 모듈을 임포트하기 전에 정합니다.
+외부 서비스 없이 돌도록 memory 저장소를 쓰고, 이벤트 로그는 끄고,
+로컬 SQLite 부가 파일(검색 색인 등)은 임시 디렉터리에 둡니다.
+
+실행: cd backend && python -m pytest -q
+"""
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("STORAGE_BACKEND", "memory")
+os.environ.setdefault("EVENT_LOG_ENABLED", "false")
+os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="orchestrator-test-"))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from storage.sqlite_store import SQLiteStorage  # noqa: E402
+
+
+@pytest.fixture
+def storage():
+    """테스트마다 새 인메모리 SQLite 저장소"""
+    backend = SQLiteStorage(":memory:")
+    yield backend
+    backend.close()
@@ -0,0 +1,86 @@
+"""CaseFile 패치와 version 조건부 쓰기 재시도 (storage/case_file_patch.py, storage/base.py)"""
+import asyncio
+
+import pytest
+
+from config import CASE_FILE_PATCH_MAX_RETRIES
+from storage.base import StorageBackend, VersionConflictError
+from storage.case_file_patch import CaseFilePatch
+
+
+def _session(storage) -> str:
+    async def run():
+        session = await storage.create_session("u1", "general", "topic")
+        await storage.save_case_file(session["id"], {"decisions": ["first"]})
+        return session["id"]
+    return asyncio.run(run())
+
+
+def _interfere(storage, monkeypatch, times: int):
+    """조건부 쓰기 직전에 다른 워커의 쓰기를 times번 끼워 넣음 → 시도 횟수 기록"""
+    original = storage.save_case_file_if_version
+    attempts = []
+
+    async def racing(session_id, fields, expected_version):
+        attempts.append(expected_version)
+        if len(attempts) <= times:
+            await storage.patch_case_file(session_id, CaseFilePatch().append("decisions", [f"other {len(attempts)}"]))
+        return await original(session_id, fields, expected_version)
+
+    monkeypatch.setattr(storage, "save_case_file_if_version", racing)
+    return attempts
+
+
+def test_apply_only_returns_touched_fields():
+    patch = CaseFilePatch().set("goals", ["g"]).append("decisions", ["a", "b"], unique=True)
+    changed = patch.apply({"decisions": ["a"], "facts": ["f"]})
+    assert changed == {"goals": ["g"], "decisions": ["a", "b"]}
+    assert patch.fields() == ["goals", "decisions"]
+
+
+def test_stale_version_is_rejected(storage):
+    session_id = _session(storage)
+
+    async def run():
+        current = await storage.get_case_file(session_id)
+        await storage.save_case_file(session_id, {"goals": ["newer"]})
+        return await storage.save_case_file_if_version(session_id, {"goals": ["stale"]}, current["version"])
+
+    assert asyncio.run(run()) is None
+    assert asyncio.run(storage.get_case_file(session_id))["goals"] == ["newer"]
+
+
+def test_conflict_retries_on_latest_document(storage, monkeypatch):
+    session_id = _session(storage)
+    attempts = _interfere(storage, monkeypatch, times=1)
+
+    # SQLiteStorage는 쓰기 락 안에서 적용하므로, Supabase가 쓰는 기본 CAS 재시도 경로를 직접 호출
+    result = asyncio.run(StorageBackend.patch_case_file(storage, session_id, CaseFilePatch().append("decisions", ["mine"])))
+
+    assert len(attempts) == 2
+    assert attempts[1] == attempts[0] + 1
+    assert result["decisions"] == ["first", "other 1", "mine"]
+
+
+def test_conflict_gives_up_after_max_retries(storage, monkeypatch):
+    session_id = _session(storage)
+    attempts = _interfere(storage, monkeypatch, times=CASE_FILE_PATCH_MAX_RETRIES)
+
+    with pytest.raises(VersionConflictError):
+        asyncio.run(StorageBackend.patch_case_file(storage, session_id, CaseFilePatch().append("decisions", ["mine"])))
+
+    assert len(attempts) == CASE_FILE_PATCH_MAX_RETRIES
+    assert "mine" not in asyncio.run(storage.get_case_file(session_id))["decisions"]
+
+
+def test_concurrent_patches_are_not_lost(storage):
+    session_id = _session(storage)
+
+    async def run():
+        await asyncio.gather(*(
+            storage.patch_case_file(session_id, CaseFilePatch().append("facts", [f"fact {i}"]))
+            for i in range(20)
+        ))
+        return await storage.get_case_file(session_id)
+
+    assert sorted(asyncio.run(run())["facts"]) == sorted(f"fact {i}" for i in range(20))
@@ -0,0 +1,52 @@
+"""keyset 커서 인코딩/검증 (storage/base.py)"""
+import asyncio
+import base64
+import uuid
+
+import pytest
+
+from storage.base import decode_cursor, encode_cursor, session_cursor
+
+
+def _raw(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+def test_round_trip():
+    row_id = str(uuid.uuid4())
+    assert decode_cursor(encode_cursor("2026-01-02T03:04:05.123456+00:00", row_id)) == (
+        "2026-01-02T03:04:05.123456+00:00", row_id,
+    )
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    _raw("2026-01-02T03:04:05+00:00"),  # 구분자 없음
+    _raw(f"yesterday|{uuid.uuid4()}"),  # 시각이 아님
+    _raw("2026-01-02T03:04:05+00:00|not-a-uuid"),
+    # PostgREST 필터에 그대로 들어가면 조건을 바꿀 수 있는 값
+    _raw("2026-01-02T03:04:05+00:00|x),or(user_id.neq.nobody"),
+    _raw(f"2026-01-02,id.gt.0|{uuid.uuid4()}"),
+])
+def test_rejects_malformed(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_list_sessions_pages_with_cursor(storage):
+    async def run():
+        for i in range(5):
+            await storage.create_session("u1", "general", f"topic {i}")
+        first = await storage.list_sessions("u1", limit=3)
+        rest = await storage.list_sessions("u1", limit=3, cursor=session_cursor(first[-1]))
+        return first, rest
+
+    first, rest = asyncio.run(run())
+    assert len(first) == 3 and len(rest) == 2
+    assert not {s["id"] for s in first} & {s["id"] for s in rest}
+
+
+def test_list_sessions_rejects_malformed_cursor(storage):
+    with pytest.raises(ValueError):
+        asyncio.run(storage.list_sessions("u1", cursor=_raw("2026-01-02|bad")))
@@ -0,0 +1,110 @@
+"""Last-Event-ID 재전송과 이벤트 로그 압축 (api/event_log.py, api/events.py)"""
+import asyncio
+
+from api.event_bus import InMemoryEventBus, SQLiteEventBus
+from api.event_log import EventLog
+from api.events import EventType, SSEEventManager
+
+
+def _manager(path, bus=None) -> SSEEventManager:
+    return SSEEventManager(bus or InMemoryEventBus(block_size=10), EventLog(str(path)))
+
+
+async def _replay(manager: SSEEventManager, last_event_id: int) -> list:
+    subscriber = manager.subscribe("s")
+    try:
+        return [event async for event in manager.follow("s", subscriber, last_event_id) if event is not None]
+    finally:
+        manager.unsubscribe("s", subscriber)
+
+
+def test_pending_appends_are_readable_before_flush(tmp_path):
+    log = EventLog(str(tmp_path / "log.db"))
+    log.append("s", {"id": 1, "type": "message_stream_chunk", "data": {"text": "a"}, "timestamp": "t"})
+
+    assert log.has_pending()
+    assert [e["id"] for e in log.read_since("s", 0)] == [1]
+    assert log.latest_event_id("s") == 1
+
+    assert log.flush() == 1
+    assert not log.has_pending()
+    assert [e["id"] for e in log.read_since("s", 0)] == [1]
+
+
+def test_duplicate_event_is_not_overwritten(tmp_path):
+    log = EventLog(str(tmp_path / "log.db"))
+    event = {"id": 1, "type": "message_stream_chunk", "data": {"text": "a"}, "timestamp": "t"}
+    log.append("s", event)
+    log.flush()
+    log.append("s", {**event, "data": {"text": "b"}})
+    log.append("s", {**event, "id": 2})
+
+    assert log.flush() == 1
+    assert [e["data"]["text"] for e in log.read_since("s", 0)] == ["a", "a"]
+
+
+def test_resume_after_restart(tmp_path):
+    path = tmp_path / "log.db"
+
+    async def run():
+        before = _manager(path)
+        seen = [await before.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": str(i)}) for i in range(3)]
+        await before.stop()
+
+        # 재시작한 워커: 링 버퍼는 비었고, id는 로그에 기록된 id 다음 블록에서 시작
+        after = _manager(path)
+        missed = await after.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": "3"})
+        end = await after.emit("s", EventType.SESSION_END, {})
+        replayed = await _replay(after, seen[1].id)
+        await after.stop()
+        return seen, missed, end, replayed
+
+    seen, missed, end, replayed = asyncio.run(run())
+
+    assert missed.id > seen[-1].id
+    assert [e.id for e in replayed] == [seen[2].id, missed.id, end.id]
+    assert replayed[0].data == {"text": "2"}
+
+
+def test_sqlite_bus_ids_are_monotonic_across_workers(tmp_path):
+    async def run():
+        workers = [_manager(tmp_path / "log.db", SQLiteEventBus(str(tmp_path / "bus.db"))) for _ in range(2)]
+        ids = []
+        for i in range(6):
+            event = await workers[i % 2].emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": str(i)})
+            ids.append(event.id)
+        for worker in workers:
+            await worker.stop()
+        # 어느 워커에 다시 연결해도 다른 워커가 발행한 이벤트까지 재전송
+        return ids, [e.id for e in await workers[0].get_missed_events("s", ids[1])]
+
+    ids, replayed = asyncio.run(run())
+
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert replayed == ids[2:]
+
+
+def test_compaction_merges_chunks_without_losing_text(tmp_path):
+    async def run():
+        manager = _manager(tmp_path / "log.db")
+        start = await manager.emit("s", EventType.MESSAGE_STREAM_START, {"role": "agent1"})
+        chunks = [await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": t}) for t in ("가", "나", "다")]
+        await manager.emit("s", EventType.MESSAGE_STREAM_END, {})
+        await manager.emit("s", EventType.SESSION_END, {})
+        await manager._compact_log("s")
+        full = await _replay(manager, 0)
+        mid = await _replay(manager, chunks[0].id)
+        await manager.stop()
+        return start, chunks, full, mid
+
+    start, chunks, full, mid = asyncio.run(run())
+
+    assert [e.type for e in full] == [
+        EventType.MESSAGE_STREAM_START, EventType.MESSAGE_STREAM_CHUNK,
+        EventType.MESSAGE_STREAM_END, EventType.SESSION_END,
+    ]
+    assert full[0].id == start.id
+    # 병합된 chunk는 마지막 chunk의 id로 전체 텍스트를 담음
+    assert full[1].id == chunks[-1].id and full[1].data == {"text": "가나다"}
+    # 병합 구간 중간에서 재개하면 텍스트가 중복될 수는 있어도 빠지지 않음
+    assert mid[0].data["text"].endswith("나다")
@@ -0,0 +1,88 @@
+"""저장된 리포트 재사용 판단 (orchestrator/report_pipeline.content_key, api/report_jobs.ensure)"""
+import asyncio
+
+import pytest
+
+import prompts.report
+from api.event_bus import InMemoryEventBus
+from api.events import SSEEventManager
+from api.report_jobs import ReportJobManager
+from orchestrator.report_pipeline import ReportPipeline, content_key
+from storage.write_batcher import WriteBatcher
+
+
+class FakeClient:
+    """모델 호출 없이 고정 본문을 돌려주는 클라이언트 (호출 수 기록)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def stream_text(self, prompt, max_output_tokens=None):
+        self.calls += 1
+        for part in ("요약 ", "본문"):
+            yield part
+
+    async def generate_text(self, prompt, *args, **kwargs):
+        self.calls += 1
+        return "요약"
+
+
+@pytest.fixture
+def jobs(storage):
+    client = FakeClient()
+    manager = ReportJobManager(ReportPipeline(client), SSEEventManager(InMemoryEventBus()), storage, WriteBatcher(storage))
+    return manager, client
+
+
+def _message(text: str, **fields) -> dict:
+    return {"role": "agent1", "round_index": 1, "phase": "A1_R1_PLAN", "content_text": text, **fields}
+
+
+def test_content_key_ignores_streaming_drafts():
+    done = {"id": "m1", "status": "complete", "event_id": 3}
+    draft = {"id": "m2", "status": "streaming", "event_id": 9}
+
+    assert content_key([done, draft]) == content_key([done])
+    assert content_key([done]) != content_key([{**done, "event_id": 4}])
+    assert content_key([done], {"updated_at": "a"}) != content_key([done], {"updated_at": "b"})
+
+
+def test_ensure_decisions(storage, jobs, monkeypatch):
+    manager, client = jobs
+
+    async def run():
+        session_id = (await storage.create_session("u1", "general", "주제"))["id"]
+        states = [(await manager.ensure(session_id, "general"))[0]]
+
+        await storage.save_message(session_id, _message("첫 발언"))
+        state, _, job = await manager.ensure(session_id, "general")
+        states.append(state)
+        await job.task
+        calls = client.calls
+
+        # 입력도 양식도 그대로 → 저장된 리포트, 모델 호출 없음
+        state, report, job = await manager.ensure(session_id, "general")
+        states.append(state)
+        assert job is None and report["report_json"]["status"] == "complete"
+        assert client.calls == calls
+
+        # 생성 중인 초안은 리포트 입력이 아님
+        await storage.save_message(session_id, _message("생성 중", status="streaming"))
+        states.append((await manager.ensure(session_id, "general"))[0])
+
+        # 양식만 바뀜 → 저장된 리포트를 주고 백그라운드 재생성
+        monkeypatch.setattr(prompts.report, "REPORT_FORMAT_REVISION", prompts.report.REPORT_FORMAT_REVISION + 1)
+        state, report, job = await manager.ensure(session_id, "general")
+        states.append(state)
+        assert report is not None and job.revalidate
+        await job.task
+        states.append((await manager.ensure(session_id, "general"))[0])
+
+        # 새 메시지 → 새로 생성
+        await storage.save_message(session_id, _message("두 번째 발언"))
+        state, _, job = await manager.ensure(session_id, "general")
+        states.append(state)
+        await job.task
+        return states
+
+    assert asyncio.run(run()) == ["empty", "miss", "fresh", "fresh", "stale", "fresh", "miss"]
@@ -0,0 +1,104 @@
+"""느린 구독자 RESYNC 전달 (api/events.py, api/ws_codec.py)"""
+import asyncio
+import json
+
+from api.event_bus import InMemoryEventBus
+from api.events import EventType, SSEEventManager
+from api.ws_codec import FrameCodec
+
+
+def _manager(queue_size: int = 2) -> SSEEventManager:
+    manager = SSEEventManager(InMemoryEventBus())
+    manager._subscriber_queue_size = queue_size
+    return manager
+
+
+async def _collect(manager: SSEEventManager, subscriber, last_event_id=None) -> list:
+    return [event async for event in manager.follow("s", subscriber, last_event_id) if event is not None]
+
+
+def test_overflow_is_replaced_by_one_resync():
+    async def run():
+        manager = _manager()
+        subscriber = manager.subscribe("s")
+        for i in range(5):
+            await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": str(i)})
+        end = await manager.emit("s", EventType.SESSION_END, {})
+        return await _collect(manager, subscriber), end
+
+    events, end = asyncio.run(run())
+
+    assert [e.type for e in events] == [EventType.RESYNC, EventType.SESSION_END]
+    resync = events[0]
+    assert resync.id is None
+    assert resync.data == {"reason": "slow_consumer", "dropped": 5, "snapshot_url": "/api/sessions/s/feed"}
+    assert events[1].id == end.id
+
+
+def test_resync_has_no_sse_id_line():
+    async def run():
+        manager = _manager(queue_size=1)
+        subscriber = manager.subscribe("s")
+        await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": "a"})
+        await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": "b"})
+        return subscriber.queue.get_nowait()
+
+    payload = asyncio.run(run()).to_sse_format()
+
+    # id 줄이 있으면 브라우저가 Last-Event-ID를 바꿔 재연결 시 버려진 이벤트를 다시 받지 못함
+    assert not payload.startswith(b"id:") and b"\nid:" not in payload
+    assert payload.startswith(b"event: resync\n")
+
+
+def test_resync_is_not_skipped_after_replay():
+    async def run():
+        manager = _manager(queue_size=3)
+        first = await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": "first"})
+        subscriber = manager.subscribe("s")
+        for i in range(4):
+            await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": str(i)})
+        # 재연결: 링 버퍼에서 재전송한 뒤 구독자 큐(RESYNC)를 따라감
+        collecting = asyncio.create_task(_collect(manager, subscriber, last_event_id=first.id))
+        await asyncio.sleep(0.01)
+        await manager.emit("s", EventType.SESSION_END, {})
+        return first, await collecting
+
+    first, events = asyncio.run(run())
+
+    # 재전송 뒤에도 id 없는 RESYNC는 "이미 보낸 이벤트"로 걸러지지 않음
+    assert [e.type for e in events] == [EventType.MESSAGE_STREAM_CHUNK] * 4 + [EventType.RESYNC, EventType.SESSION_END]
+    assert [e.id for e in events[:4]] == list(range(first.id + 1, first.id + 5))
+
+
+def test_delivery_resumes_after_resync():
+    async def run():
+        manager = _manager()
+        subscriber = manager.subscribe("s")
+        for i in range(3):
+            await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": str(i)})
+        assert subscriber.queue.get_nowait().type == EventType.RESYNC
+        later = await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": "later"})
+        return later, subscriber.queue.get_nowait()
+
+    later, delivered = asyncio.run(run())
+    assert delivered.id == later.id
+
+
+def test_ws_codec_sends_resync_as_aux_frame():
+    async def run():
+        manager = _manager(queue_size=1)
+        subscriber = manager.subscribe("s")
+        before = await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": "a"})
+        codec = FrameCodec(False)
+        first = codec.event(subscriber.queue.get_nowait())
+        for text in ("b", "c"):
+            await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": text})
+        resync = codec.event(subscriber.queue.get_nowait())
+        after = await manager.emit("s", EventType.MESSAGE_STREAM_CHUNK, {"text": "d"})
+        return before, after, first, resync, codec.event(subscriber.queue.get_nowait())
+
+    before, after, first, resync, next_frame = asyncio.run(run())
+
+    assert len(json.loads(resync)) == 2  # [type, data]: id_delta 없음
+    # RESYNC가 id 기준값을 바꾸지 않으므로 다음 이벤트의 delta는 마지막으로 보낸 이벤트 기준
+    assert json.loads(next_frame)[1] == after.id - before.id
@@ -0,0 +1,88 @@
+"""전문 검색 사용자 범위와 페이지 (storage/search_index.py, GET /api/search)"""
+import asyncio
+
+import pytest
+
+import storage.search_index as search_index
+from storage.search_index import SearchIndex, SearchIndexingStorage
+
+
+@pytest.fixture
+def index():
+    ix = SearchIndex(":memory:")
+    yield ix
+    ix.close()
+
+
+@pytest.fixture
+def indexed(storage, index):
+    return SearchIndexingStorage(storage, index)
+
+
+def _message(text: str) -> dict:
+    return {"role": "agent1", "round_index": 1, "phase": "A1_R1_PLAN", "content_text": text}
+
+
+def test_results_are_scoped_to_the_user(indexed, index):
+    async def run():
+        mine = await indexed.create_session("u1", "general", "계약 해지 분쟁")
+        theirs = await indexed.create_session("u2", "general", "계약 갱신 협상")
+        await indexed.save_message(mine["id"], _message("위약금 조항 검토"))
+        await indexed.save_message(theirs["id"], _message("위약금 감액 요청"))
+        return mine["id"], theirs["id"]
+
+    mine, theirs = asyncio.run(run())
+
+    assert {r["session_id"] for r in index.search("계약", "u1")} == {mine}
+    assert {r["session_id"] for r in index.search("위약금", "u2")} == {theirs}
+    assert index.search("위약금", "u3") == []
+
+
+def test_doc_type_filter(indexed, index):
+    async def run():
+        session = await indexed.create_session("u1", "general", "위약금 분쟁")
+        await indexed.save_message(session["id"], _message("위약금 조항 검토"))
+
+    asyncio.run(run())
+
+    assert [r["doc_type"] for r in index.search("위약금", "u1", doc_type="message")] == ["message"]
+    assert [r["doc_type"] for r in index.search("위약금", "u1", doc_type="topic")] == ["topic"]
+
+
+def test_only_complete_reports_are_indexed(indexed, index):
+    async def run():
+        session = await indexed.create_session("u1", "general", "주제")
+        await indexed.save_final_report(session["id"], {"content": "중간 리포트 초안", "status": "streaming"}, "중간 리포트 초안")
+        partial = index.search("초안", "u1", doc_type="report")
+        await indexed.save_final_report(session["id"], {"content": "최종 리포트 완성", "status": "complete"}, "최종 리포트 완성")
+        return partial
+
+    assert asyncio.run(run()) == []
+    assert len(index.search("완성", "u1", doc_type="report")) == 1
+
+
+def test_paging_reaches_candidates_past_the_rank_window(indexed, index, monkeypatch):
+    monkeypatch.setattr(search_index, "SEARCH_RANK_WINDOW", 3)
+
+    async def run():
+        session = await indexed.create_session("u1", "general", "주제")
+        for i in range(10):
+            await indexed.save_message(session["id"], _message(f"예산 항목 {i}"))
+
+    asyncio.run(run())
+
+    seen, offset = [], 0
+    while True:
+        page = index.search("예산", "u1", doc_type="message", limit=2, offset=offset)
+        if not page:
+            break
+        seen.extend(r["snippet"] for r in page)
+        offset += len(page)
+    assert sorted(seen) == sorted(f"예산 항목 {i}" for i in range(10))
+
+
+def test_endpoint_without_user_id_returns_nothing():
+    from api.routes import search_endpoint
+
+    result = asyncio.run(search_endpoint(q="계약", user_id=None, type=None, limit=20, offset=0))
+    assert result == {"results": [], "next_offset": None}
@@ -0,0 +1,70 @@
+'use client'
+
+export interface ReportJob {
+    job_id: string
+    status: string
+    event_id: number
+    content: string
+    chunks: number
+}
+
+/**
+ * 최종 리포트 스트리밍 생성
+ *
+ * POST /report/generate로 작업을 시작(또는 실행 중인 작업에 합류)하고
+ * 세션 이벤트 스트림의 report_chunk를 이어 붙이며 onText를 호출합니다.
+ * report_end에서 최종 본문으로 resolve, 실패하면 reject 합니다.
+ * 저장된 리포트를 재사용한 응답(complete / stale - 백그라운드 재생성)은 바로 resolve 합니다.
+ */
+export async function generateReportStream(
+    sessionId: string,
+    onText: (text: string) => void
+): Promise<string> {
+    const res = await fetch(`/api/sessions/${sessionId}/report/generate`, { method: 'POST' })
+    if (!res.ok) {
+        throw new Error(`Report generation failed: ${res.status}`)
+    }
+    const job: ReportJob = await res.json()
+    if (job.status === 'complete' || job.status === 'stale') {
+        onText(job.content)
+        return job.content
+    }
+
+    let content = job.content
+    let nextSeq = job.chunks
+    if (content) onText(content)
+
+    return new Promise((resolve, reject) => {
+        // 작업 시작 시점 이후 이벤트부터 재전송받아 chunk를 놓치지 않음
+        const eventSource = new EventSource(
+            `/api/sessions/${sessionId}/events?lastEventId=${job.event_id}`
+        )
+
+        eventSource.addEventListener('report_chunk', (event) => {
+            const data = JSON.parse((event as MessageEvent).data)
+            // 다른 작업이거나 응답 본문에 이미 포함된 chunk는 건너뜀
+            if (data.job_id !== job.job_id || data.seq < nextSeq) return
+            content += data.text
+            nextSeq = data.seq + 1
+            onText(content)
+        })
+
+        eventSource.addEventListener('report_end', (event) => {
+            const data = JSON.parse((event as MessageEvent).data)
+            if (data.job_id !== job.job_id) return
+            eventSource.close()
+            if (data.status === 'complete') {
+                resolve(content)
+            } else {
+                reject(new Error(data.error || 'Report generation failed'))
+            }
+        })
+
+        eventSource.onerror = () => {
+            // EventSource가 Last-Event-ID로 자동 재접속 (닫힌 경우만 실패 처리)
+            if (eventSource.readyState === EventSource.CLOSED) {
+                reject(new Error('Event stream closed'))
+            }
+        }
+    })
+}
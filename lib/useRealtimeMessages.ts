@@ -10,6 +10,20 @@ export interface Message {
     roundIndex: number
     phase: string
     isStreaming?: boolean
+    eventId?: number | null  // 본문에 반영된 마지막 SSE 이벤트 id (초안 이후 이벤트만 이어 받을 때 사용)
+}
+
+// DB 행 → Message (status='streaming'이면 생성 중인 초안)
+function toMessage(row: any): Message {
+    return {
+        id: row.id,
+        role: row.role,
+        content: row.content_text, // DB 컬럼명: content_text
+        roundIndex: row.round_index,
+        phase: row.phase,
+        isStreaming: row.status === 'streaming',
+        eventId: row.event_id
+    }
 }
 
 export function useRealtimeMessages(sessionId: string | null) {
@@ -36,14 +50,7 @@ export function useRealtimeMessages(sessionId: string | null) {
                 if (error) throw error
 
                 if (data) {
-                    setMessages(data.map(msg => ({
-                        id: msg.id,
-                        role: msg.role,
-                        content: msg.content_text, // DB 컬럼명: content_text
-                        roundIndex: msg.round_index,
-                        phase: msg.phase,
-                        isStreaming: false
-                    })))
+                    setMessages(data.map(toMessage))
                 }
             } catch (error) {
                 console.error('Failed to fetch messages:', error)
@@ -71,17 +78,26 @@ export function useRealtimeMessages(sessionId: string | null) {
                         // 중복 방지
                         if (prev.some(msg => msg.id === newMsg.id)) return prev
 
-                        return [...prev, {
-                            id: newMsg.id,
-                            role: newMsg.role,
-                            content: newMsg.content_text,
-                            roundIndex: newMsg.round_index,
-                            phase: newMsg.phase,
-                            isStreaming: false
-                        }]
+                        return [...prev, toMessage(newMsg)]
                     })
                 }
             )
+            .on(
+                'postgres_changes',
+                {
+                    event: 'UPDATE',
+                    schema: 'public',
+                    table: 'messages',
+                    filter: `session_id=eq.${sessionId}`
+                },
+                (payload) => {
+                    // 스트리밍 초안 본문 갱신 / 완료
+                    const updated = toMessage(payload.new)
+                    setMessages(prev => prev.some(msg => msg.id === updated.id)
+                        ? prev.map(msg => msg.id === updated.id ? updated : msg)
+                        : [...prev, updated])
+                }
+            )
             .subscribe((status: string) => {
                 if (status === 'SUBSCRIBED') {
                     setIsConnected(true)
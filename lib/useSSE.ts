@@ -8,10 +8,11 @@ export interface SSEEvent {
     data: any
 }
 
-export function useSSE(sessionId: string | null) {
+// resumeFromEventId: 생성 중인 초안의 eventId를 넘기면 그 이후 chunk만 재전송받음
+export function useSSE(sessionId: string | null, resumeFromEventId: number | null = null) {
     const [isConnected, setIsConnected] = useState(false)
     const [lastEvent, setLastEvent] = useState<SSEEvent | null>(null)
-    const lastEventIdRef = useRef<number | null>(null)
+    const lastEventIdRef = useRef<number | null>(resumeFromEventId)
     const eventSourceRef = useRef<EventSource | null>(null)
 
     const connect = useCallback(() => {
@@ -23,7 +24,7 @@ export function useSSE(sessionId: string | null) {
         }
 
         // Last-Event-ID 지원
-        let url = `/api/sessions/${sessionId}/stream`
+        let url = `/api/sessions/${sessionId}/events`
         if (lastEventIdRef.current) {
             url += `?lastEventId=${lastEventIdRef.current}`
         }
@@ -0,0 +1,131 @@
+'use client'
+
+import { useEffect, useState } from 'react'
+import { Message } from '@/lib/useRealtimeMessages'
+import { GateData } from '@/lib/useSessionEvents'
+
+export interface SessionState {
+    id: string
+    status: string
+    category: string
+    topic: string
+    round_index: number
+    phase: string
+    case_type?: string
+    project_type?: 'general' | 'legal' | 'dev_project'
+}
+
+// DB 행 → Message (status='streaming'이면 생성 중인 초안)
+function toMessage(row: any): Message {
+    return {
+        id: row.id,
+        role: row.role,
+        content: row.content_text,
+        roundIndex: row.round_index,
+        phase: row.phase,
+        isStreaming: row.status === 'streaming',
+        eventId: row.event_id
+    }
+}
+
+// message_id 기준 멱등 반영 (스냅샷에 이미 들어간 메시지가 델타로 다시 올 수 있음)
+function upsert(prev: Message[], message: Message): Message[] {
+    return prev.some(msg => msg.id === message.id)
+        ? prev.map(msg => msg.id === message.id ? message : msg)
+        : [...prev, message]
+}
+
+/**
+ * 세션 피드 훅
+ *
+ * GET /api/sessions/{id}/feed 하나로 세션 상태, 메시지, 스트리밍 초안, 게이트 데이터를 받습니다.
+ * (세션 폴링 + Supabase realtime + SSE 이벤트를 대체)
+ * 재접속 시 EventSource가 Last-Event-ID를 보내므로 서버는 놓친 이벤트만 이어서 보냅니다.
+ */
+export function useSessionFeed(sessionId: string | null) {
+    const [session, setSession] = useState<SessionState | null>(null)
+    const [messages, setMessages] = useState<Message[]>([])
+    const [gateData, setGateData] = useState<GateData | null>(null)
+    const [isLoading, setIsLoading] = useState(true)
+    const [isConnected, setIsConnected] = useState(false)
+
+    useEffect(() => {
+        if (!sessionId) return
+
+        const eventSource = new EventSource(`/api/sessions/${sessionId}/feed`)
+        // 생성 중인 메시지 id (chunk에는 message_id가 없음)
+        let streamingId: string | null = null
+
+        const on = (type: string, handler: (data: any) => void) => {
+            eventSource.addEventListener(type, (event) => {
+                // 연결 오류로 발생한 error 이벤트에는 data가 없음
+                if (!(event as MessageEvent).data) return
+                try {
+                    handler(JSON.parse((event as MessageEvent).data))
+                } catch (e) {
+                    console.error(`[Feed] Failed to handle ${type}:`, e)
+                }
+            })
+        }
+
+        eventSource.onopen = () => setIsConnected(true)
+        eventSource.onerror = () => setIsConnected(false)  // EventSource가 자동 재접속
+
+        on('snapshot', (data) => {
+            const snapshot = [...data.messages, ...(data.draft ? [data.draft] : [])].map(toMessage)
+            streamingId = data.draft ? data.draft.id : null
+            setSession(data.session)
+            setMessages(snapshot)
+            setIsLoading(false)
+        })
+
+        on('session_state', (data) => setSession(data))
+
+        on('message_created', (data) => setMessages(prev => upsert(prev, toMessage(data.message))))
+
+        on('message_stream_start', (data) => {
+            streamingId = data.message_id
+            setMessages(prev => upsert(prev, {
+                id: data.message_id,
+                role: data.role,
+                content: '',
+                roundIndex: data.round_index,
+                phase: data.phase,
+                isStreaming: true
+            }))
+        })
+
+        on('message_stream_chunk', (data) => {
+            const id = streamingId
+            if (!id) return
+            setMessages(prev => prev.map(msg => msg.id === id ? { ...msg, content: msg.content + data.text } : msg))
+        })
+
+        on('message_stream_end', (data) => {
+            const id = data.message_id || streamingId
+            streamingId = null
+            setMessages(prev => prev.map(msg => msg.id === id ? { ...msg, isStreaming: false } : msg))
+        })
+
+        on('round_end', (data) => {
+            if (data.phase === 'USER_GATE' || data.phase === 'END_GATE') {
+                setGateData(data)
+            }
+        })
+
+        on('round_start', () => setGateData(null))
+
+        on('error', (data) => {
+            console.error('[Feed] Server error:', data)
+            eventSource.close()
+            setIsLoading(false)
+        })
+
+        return () => {
+            eventSource.close()
+            setIsConnected(false)
+        }
+    }, [sessionId])
+
+    return { session, messages, gateData, isLoading, isConnected }
+}
@@ -0,0 +1,15 @@
+-- =====================================================
+-- v3.4 메시지 조회 인덱스 (tail / keyset 페이지네이션 / 라운드별 조회)
+-- =====================================================
+
+-- 최근 N개(역방향 스캔) 및 (created_at, id) 커서 이후 조회
+CREATE INDEX IF NOT EXISTS idx_messages_session_created_id
+ON messages(session_id, created_at, id);
+
+-- 라운드별 조회
+CREATE INDEX IF NOT EXISTS idx_messages_session_round
+ON messages(session_id, round_index, created_at);
+
+-- 위 복합 인덱스로 대체되는 단일 컬럼 인덱스 정리
+DROP INDEX IF EXISTS idx_messages_session_id;
+DROP INDEX IF EXISTS idx_messages_created_at;
@@ -0,0 +1,10 @@
+-- =====================================================
+-- v3.5 세션 목록 keyset 페이지네이션 인덱스
+-- =====================================================
+
+-- GET /api/sessions?user_id=...&cursor=... 의 (created_at, id) 내림차순 조회
+CREATE INDEX IF NOT EXISTS idx_sessions_user_created_id
+ON sessions(user_id, created_at DESC, id DESC);
+
+-- 위 복합 인덱스로 대체
+DROP INDEX IF EXISTS idx_sessions_user_id;
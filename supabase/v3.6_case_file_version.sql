@@ -0,0 +1,20 @@
+-- =====================================================
+-- v3.6 CaseFile 버전 컬럼 (optimistic concurrency)
+-- =====================================================
+
+ALTER TABLE case_files ADD COLUMN IF NOT EXISTS version INTEGER NOT NULL DEFAULT 0;
+
+-- 모든 UPDATE에서 version 증가 (조건부 업데이트 .eq("version", n)의 기준값)
+CREATE OR REPLACE FUNCTION bump_case_file_version()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.version = OLD.version + 1;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS bump_case_files_version ON case_files;
+CREATE TRIGGER bump_case_files_version
+    BEFORE UPDATE ON case_files
+    FOR EACH ROW
+    EXECUTE FUNCTION bump_case_file_version();
@@ -0,0 +1,11 @@
+-- =====================================================
+-- v3.7 종료 세션 대화 기록 아카이브
+-- =====================================================
+
+-- 메시지를 cold storage로 옮긴 시각 (NULL = hot 테이블에 있음)
+ALTER TABLE sessions ADD COLUMN IF NOT EXISTS archived_at TIMESTAMP WITH TIME ZONE;
+
+-- 아카이브 대상 조회 (종료 + 미아카이브, 오래된 순)
+CREATE INDEX IF NOT EXISTS idx_sessions_archivable
+ON sessions(updated_at)
+WHERE archived_at IS NULL AND status IN ('finalized', 'completed');
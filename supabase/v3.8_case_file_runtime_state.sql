@@ -0,0 +1,7 @@
+-- =====================================================
+-- v3.8 유휴 세션 hibernate 상태
+-- =====================================================
+
+-- 워커가 유휴 세션의 프로세스 내 상태(입력 버퍼, 취소 여부 등)를 정리하기 전에 옮겨 두는 곳
+-- (NULL = 옮겨 둔 상태 없음, 다음 요청 때 복원 후 다시 NULL)
+ALTER TABLE case_files ADD COLUMN IF NOT EXISTS runtime_state JSONB;
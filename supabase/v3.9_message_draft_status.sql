@@ -0,0 +1,16 @@
+-- =====================================================
+-- v3.9 스트리밍 중인 메시지 초안
+-- =====================================================
+
+-- streaming: 생성 중인 초안 (content_text는 event_id 이벤트까지의 누적 본문)
+-- complete: 생성 완료
+ALTER TABLE messages ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'complete';
+
+ALTER TABLE messages DROP CONSTRAINT IF EXISTS messages_status_check;
+ALTER TABLE messages ADD CONSTRAINT messages_status_check CHECK (status IN ('streaming', 'complete'));
+
+-- 중단된 초안 조회 (DraftWriter.sweep_orphans: status='streaming' AND created_at < 기준 시각)
+DROP INDEX IF EXISTS idx_messages_streaming;
+CREATE INDEX idx_messages_streaming
+ON messages(created_at)
+WHERE status = 'streaming';
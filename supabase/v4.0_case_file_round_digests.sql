@@ -0,0 +1,7 @@
+-- =====================================================
+-- v4.0 라운드 요약 (rolling round digest)
+-- =====================================================
+
+-- phase가 끝날 때마다 백그라운드로 발언을 압축해 라운드별로 누적
+-- {"1": {"claims": [...], "decisions": [...], "risks": [...], "open_issues": [...], "phases": [...]}, ...}
+ALTER TABLE case_files ADD COLUMN IF NOT EXISTS round_digests JSONB DEFAULT '{}';